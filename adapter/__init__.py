@@ -9,20 +9,50 @@ from flask import Flask, request, Response, json
 import environs
 import deep_lynx
 import threading
+import concurrent.futures
 
 # Repository Modules
 from .moose_adapter import main
-from .deep_lynx_query import query_deep_lynx
+from .deep_lynx_query import query_deep_lynx, query_deep_lynx_batch, select_query_columns
+from .ring_buffer import RingBuffer
+from .segment_log import SegmentLog
+from .worker_pool import WorkerPool
+from .idempotency_cache import IdempotencyCache
+from .scheduler import Scheduler
+from .trigger_policy import get_trigger_policy
+from .change_detection import ChangeDetector
+from .result_cache import ResultCache
+from .warm_start import CheckpointStore
+from .moose_process import UsageRecorder
+from .delta_upload import DeltaUploader
+from .run_executor import RunExecutor
+from .deep_lynx_client import create_api_client
+from .token_manager import TokenManager
+from .startup_cache import StartupCache
+from .metatype_cache import MetatypeRegistry
 import utils
 import settings
 
 # Global variables
 api_client = None
+token_manager = None
+metatype_registry = None
 lock_ = threading.Lock()
+queue_buffer = None
+queue_log = None
 threads = list()
-number_of_events = 1
+event_pool = None
+event_cache = None
 env = environs.Env()
-new_data = False
+scheduler = None
+change_detector = ChangeDetector()
+startup_cache = StartupCache()
+result_cache = None
+mesh_cache = None
+checkpoint_store = None
+resource_usage = None
+delta_uploader = None
+run_executor = None
 
 # configure logging. to overwrite the log file for each run, add option: filemode='w'
 logging.basicConfig(filename='MOOSEAdapter.log',
@@ -46,7 +76,20 @@ print('Application started. Logging to file MOOSEAdapter.log')
 def create_app():
     """ This file and aplication is the entry point for the `flask run` command """
     global env
-    global new_data
+    global api_client
+    global startup_cache
+    global metatype_registry
+    global queue_buffer
+    global queue_log
+    global event_pool
+    global event_cache
+    global scheduler
+    global result_cache
+    global mesh_cache
+    global checkpoint_store
+    global resource_usage
+    global delta_uploader
+    global run_executor
     #import pdb; pdb.set_trace()
     app = Flask(os.getenv('FLASK_APP'), instance_relative_config=True)
 
@@ -63,17 +106,86 @@ def create_app():
     env.path("MOOSE_OPT_PATH")
     env.path("CONFIG_FILE_NAME")
     env.path("RUN_FILE_NAME")
+    env.path("QUEUE_FILE_NAME")
+    env.int("QUEUE_LENGTH")
+    env.path("QUERY_FILE_NAME")
+    env.path("IMPORT_FILE_NAME")
     env.int("IMPORT_FILE_WAIT_SECONDS")
     env.int("REGISTER_WAIT_SECONDS")
 
     # Purpose to run flask once (not twice)
     # Purpose to run flask once (not twice)
     if os.environ.get("WERKZEUG_RUN_MAIN") == "true":
-        # Instantiate deep_lynx
+        # Instantiate deep_lynx, the api client is shared by every thread
+        startup_cache = StartupCache(os.getenv("DEEP_LYNX_CACHE_FILE_NAME") or None)
         container_id, data_source_id, api_client = deep_lynx_init()
         os.environ["CONTAINER_ID"] = container_id
         os.environ["DATA_SOURCE_ID"] = data_source_id
 
+        # Create the cache of the schemas of metatypes that payloads are validated against
+        metatype_registry = MetatypeRegistry(api_client, container_id,
+                                             float(os.getenv("METATYPE_CACHE_TTL_SECONDS", 3600)))
+
+        # Create the in-memory queue, restored from the durable queue log
+        queue_log = SegmentLog(os.getenv("QUEUE_SEGMENT_DIR", "data/queue/segments"),
+                               int(os.getenv("QUEUE_LENGTH")),
+                               segment_rows=int(os.getenv("QUEUE_SEGMENT_ROWS", os.getenv("QUEUE_LENGTH"))),
+                               fsync_batch=int(os.getenv("QUEUE_FSYNC_BATCH", 16)),
+                               fsync_seconds=float(os.getenv("QUEUE_FSYNC_SECONDS", 1)))
+        # The restored rows keep only the columns of QUERY_SCHEMA_FILE_NAME, like the rows of new files
+        queue_buffer = RingBuffer(int(os.getenv("QUEUE_LENGTH")))
+        queue_buffer.append(select_query_columns(queue_log.recover()))
+        # Seed an empty queue log from the last queue checkpoint if one exists
+        if len(queue_buffer) == 0:
+            checkpoint = RingBuffer.from_csv(os.getenv("QUEUE_FILE_NAME"), int(os.getenv("QUEUE_LENGTH")))
+            queue_buffer.append(select_query_columns(checkpoint.to_dataframe()))
+            queue_log.append(queue_buffer.to_dataframe())
+
+        # Create the scheduler that wakes the MOOSE thread according to RUN_TRIGGER_POLICY
+        scheduler = Scheduler(lock_, lambda: queue_buffer.is_full(), get_trigger_policy())
+
+        # Create the cache of MOOSE results, if enabled
+        if os.getenv("RESULT_CACHE_DIR"):
+            result_cache = ResultCache(os.getenv("RESULT_CACHE_DIR"),
+                                       int(os.getenv("RESULT_CACHE_MAX_BYTES", 1024 * 1024 * 1024)))
+
+        # Create the cache of generated meshes, if enabled
+        if os.getenv("MESH_CACHE_DIR"):
+            mesh_cache = ResultCache(os.getenv("MESH_CACHE_DIR"),
+                                     int(os.getenv("MESH_CACHE_MAX_BYTES", 1024 * 1024 * 1024)))
+
+        # Create the store of checkpoints that warm-start MOOSE runs, if enabled
+        if os.getenv("WARM_START_DIR"):
+            checkpoint_store = CheckpointStore(os.getenv("WARM_START_DIR"),
+                                               int(os.getenv("WARM_START_MAX_CHECKPOINTS", 10)))
+
+        # Create the recorder of the resource usage of MOOSE runs
+        resource_usage = UsageRecorder(os.getenv("RUN_USAGE_FILE_NAME"))
+
+        # Create the uploader of the results that changed since the last upload, if enabled
+        if os.getenv("DELTA_UPLOAD_DIR"):
+            delta_uploader = DeltaUploader(os.getenv("DELTA_UPLOAD_DIR"),
+                                           atol=float(os.getenv("DELTA_UPLOAD_ATOL", 0)),
+                                           rtol=float(os.getenv("DELTA_UPLOAD_RTOL", 0)),
+                                           key_columns=json.loads(os.getenv("DELTA_UPLOAD_KEY_COLUMNS") or "[]"))
+
+        # Create the executor that runs MOOSE jobs concurrently
+        run_executor = RunExecutor(os.getenv("RUN_WORK_DIR", "data/runs"),
+                                   max_runs=int(os.getenv("MOOSE_MAX_RUNS", 0)) or None,
+                                   mpi_ranks=int(os.getenv("MOOSE_MPI_RANKS", 1)),
+                                   keep_work_directories=env.bool("RUN_KEEP_WORK_DIRS", False))
+
+        # Create the worker pool that retrieves files from Deep Lynx
+        event_pool = WorkerPool(int(os.getenv("EVENT_WORKERS", 4)),
+                                int(os.getenv("EVENT_QUEUE_DEPTH", 100)),
+                                name="event_worker")
+        event_pool.start()
+
+        # Create the cache of recently seen file ids that drops duplicate event deliveries
+        event_cache = IdempotencyCache(int(os.getenv("EVENT_CACHE_SIZE", 10000)),
+                                       float(os.getenv("EVENT_CACHE_TTL_SECONDS", 86400)),
+                                       file_name=os.getenv("EVENT_CACHE_FILE_NAME") or None)
+
         # Register for events to listen for
         register_for_event(api_client)
 
@@ -83,47 +195,138 @@ def create_app():
         moose_thread = threading.Thread(target=main, daemon=True, name="moose_thread")
         print("Created moose_thread")
         threads.append(moose_thread)
-        # Start the thread’s activity
-        new_data = True
+        # Start the thread’s activity, running MOOSE on the recovered queue if it meets the run trigger
+        with lock_:
+            scheduler.notify(len(queue_buffer))
         moose_thread.start()
 
     @app.route('/moose', methods=['POST'])
     def events():
-        global number_of_events
-        global lock_
-        global new_data
         if 'application/json' not in request.content_type:
             logging.warning('Received /events request with unsupported content type')
             return Response('Unsupported Content Type. Please use application/json', status=400)
 
         # Data from graph has been received
         data = request.get_json()
-        try:
-            file_id = data["query"]["fileID"]
-            logging.info('Received event with data: ' + json.dumps(data))
-        except KeyError:
+        file_ids = get_file_ids(data)
+        if not file_ids:
             # The incoming payload doesn't have what we need, but still return a 200
             return Response(response=json.dumps({'received': True}), status=200, mimetype='application/json')
+        logging.info('Received event with data: ' + json.dumps(data))
+
+        if event_pool is None or not event_pool.is_running():
+            logging.warning('Rejected event for file(s) %s: the worker pool is not running', ', '.join(file_ids))
+            return Response(response=json.dumps({'received': False}), status=503, mimetype='application/json')
+
+        # Drop file ids that were already received
+        new_file_ids = list()
+        for file_id in file_ids:
+            if event_cache.check_and_add(file_id):
+                logging.info('Dropped duplicate event for file %s', file_id)
+            else:
+                new_file_ids.append(file_id)
+        file_ids = new_file_ids
+        if not file_ids:
+            return Response(response=json.dumps({'received': True}), status=200, mimetype='application/json')
 
-        # Retrieves file from Deep Lynx
-        event_name = "event_thread_" + str(number_of_events)
-        # Thread object: activity that is run in a separate thread of control
-        event_thread = threading.Thread(target=query_deep_lynx, args=(file_id, ), name=event_name)
-        print("Created ", event_name)
-        threads.append(event_thread)
-        number_of_events += 1
-        # Start the thread’s activity
-        event_thread.start()
-        # Join: Wait until the thread terminates. This blocks the calling thread until the thread whose join() method is called terminates.
-        event_thread.join()
-        print(event_name, " is done")
+        # Retrieves file from Deep Lynx in the worker pool, responding before the retrieval is done
+        if not event_pool.submit(process_event, file_ids):
+            # Forget the file ids so a retried delivery is not dropped as a duplicate
+            for file_id in file_ids:
+                event_cache.discard(file_id)
+            logging.warning('Rejected event for file(s) %s: the worker pool is saturated', ', '.join(file_ids))
+            return Response(response=json.dumps({'received': False}),
+                            status=429,
+                            headers={'Retry-After': os.getenv("EVENT_RETRY_AFTER_SECONDS", "5")},
+                            mimetype='application/json')
+        return Response(response=json.dumps({'received': True}), status=202, mimetype='application/json')
+
+    @app.route('/moose/flush', methods=['POST'])
+    def flush():
+        if scheduler is None:
+            return Response(response=json.dumps({'flushed': False}), status=503, mimetype='application/json')
+        # Run MOOSE on the queue regardless of the trigger policy
         with lock_:
-            new_data = True
-        return Response(response=json.dumps({'received': True}), status=200, mimetype='application/json')
+            scheduler.flush()
+        return Response(response=json.dumps({'flushed': True}), status=202, mimetype='application/json')
+
+    @app.route('/moose/stats', methods=['GET'])
+    def stats():
+        stats = dict()
+        if event_cache is not None:
+            stats['event_cache'] = event_cache.stats()
+        if event_pool is not None:
+            stats['event_pool'] = {'pending': event_pool.pending()}
+        stats['runs'] = change_detector.stats()
+        if api_client is not None:
+            stats['api_client'] = api_client.stats()
+        if token_manager is not None:
+            stats['token_manager'] = token_manager.stats()
+        if metatype_registry is not None:
+            stats['metatype_registry'] = metatype_registry.stats()
+        if result_cache is not None:
+            stats['result_cache'] = result_cache.stats()
+        if mesh_cache is not None:
+            stats['mesh_cache'] = mesh_cache.stats()
+        if checkpoint_store is not None:
+            stats['warm_start'] = checkpoint_store.stats()
+        if run_executor is not None:
+            stats['run_executor'] = run_executor.stats()
+        if resource_usage is not None:
+            stats['resource_usage'] = resource_usage.stats()
+        if delta_uploader is not None:
+            stats['delta_upload'] = delta_uploader.stats()
+        return Response(response=json.dumps(stats), status=200, mimetype='application/json')
 
     return app
 
 
+def get_file_ids(data: dict or list):
+    """
+    Returns the file ids of an event payload. A payload is either a single event or a list of events, and the
+    fileID of an event is either a single id or a list of ids
+    Args
+        data (dictionary or list): the event payload
+    Return
+        file_ids (list): the file ids of the payload in the order received
+    """
+    events = data if isinstance(data, list) else [data]
+    file_ids = list()
+    for event in events:
+        try:
+            file_id = event["query"]["fileID"]
+        except (KeyError, TypeError):
+            continue
+        if isinstance(file_id, list):
+            file_ids.extend(str(item) for item in file_id)
+        else:
+            file_ids.append(str(file_id))
+    return file_ids
+
+
+def process_event(file_ids: list):
+    """
+    Retrieves files from Deep Lynx and adds their data to the queue, which notifies the MOOSE thread of new data.
+    The ids of files whose data was not queued are removed from the event cache, so a redelivery is not dropped
+    Args
+        file_ids (list): the ids of files stored in Deep Lynx
+    """
+    failed_file_ids = list(file_ids)
+    try:
+        if len(file_ids) == 1:
+            if query_deep_lynx(file_ids[0]):
+                failed_file_ids = list()
+        else:
+            failed_file_ids = query_deep_lynx_batch(file_ids)
+    finally:
+        if event_cache is not None:
+            for file_id in failed_file_ids:
+                event_cache.discard(file_id)
+        if failed_file_ids:
+            logging.warning('File(s) %s were not queued and will be processed if they are delivered again',
+                            ', '.join(failed_file_ids))
+
+
 def register_for_event(api_client: deep_lynx.ApiClient, iterations=30):
     """
     Register with Deep Lynx to receive data_ingested events on applicable data sources
@@ -132,67 +335,72 @@ def register_for_event(api_client: deep_lynx.ApiClient, iterations=30):
         api_client (deep_lynx.ApiClient): deep lynx api client
         iterations (integer): the number of interations to try registering for events
     """
-    registered = False
     # List of adapters to receive events from
-    data_ingested_adapters = json.loads(os.getenv("DATA_SOURCES"))
+    data_ingested_adapters = set(json.loads(os.getenv("DATA_SOURCES")))
+    destination = "http://" + os.getenv('FLASK_RUN_HOST') + ":" + os.getenv('FLASK_RUN_PORT') + "/moose"
+    datasource_api = deep_lynx.DataSourcesApi(api_client)
+    events_api = deep_lynx.EventsApi(api_client)
+    wait_seconds = 1.0
 
     # Register events for listening from other data sources
-    while registered == False and iterations > 0:
+    while iterations > 0:
         # Get a list of data sources and validate that no error occurred
-        datasource_api = deep_lynx.DataSourcesApi(api_client)
         data_sources = datasource_api.list_data_sources(os.getenv("CONTAINER_ID"))
 
         if data_sources.is_error == False and len(data_sources.value) > 0:
-            #data_sources = data_sources.to_dict()["value"]
-            for data_source in data_sources.value:
-                # If the data source is found, create a registered event
-                if data_source.name in data_ingested_adapters:
-
-                    events_api = deep_lynx.EventsApi(api_client)
-
-                    # verify that this event action does not already exist
-                    # by comparing to the established event action we would like to create
-
-                    event_action = deep_lynx.CreateEventActionRequest(
-                        data_source.container_id, data_source.id, "file_created", "send_data", None,
-                        "http://" + os.getenv('FLASK_RUN_HOST') + ":" + os.getenv('FLASK_RUN_PORT') + "/moose",
-                        os.getenv("DATA_SOURCE_ID"), True)
-
-                    actions = events_api.list_event_actions()
-                    for action in actions.value:
-
-                        # if destination, event_type, and data_source_id match, we know that this
-                        # event action already exists
-                        if action.destination == event_action.destination and action.event_type == event_action.event_type \
-                            and action.data_source_id == event_action.data_source_id:
-                            # this exact event action already exists, remove data source from list
-                            logging.info('Event action on ' + data_source.name + ' already exists')
-                            data_ingested_adapters.remove(data_source.name)
-
-                    # continue event action creation if the same was not already found
-                    if data_source.name in data_ingested_adapters:
-                        create_action_result = events_api.create_event_action(event_action)
+            # Index the existing event actions once by what identifies them
+            actions = events_api.list_event_actions()
+            existing_actions = {(action.destination, action.event_type, action.data_source_id)
+                                for action in actions.value}
 
+            event_actions = list()
+            for data_source in data_sources.value:
+                if data_source.name not in data_ingested_adapters:
+                    continue
+                event_action = deep_lynx.CreateEventActionRequest(data_source.container_id, data_source.id,
+                                                                  "file_created", "send_data", None, destination,
+                                                                  os.getenv("DATA_SOURCE_ID"), True)
+                if (event_action.destination, event_action.event_type, event_action.data_source_id) in existing_actions:
+                    # this exact event action already exists, remove data source from list
+                    logging.info('Event action on ' + data_source.name + ' already exists')
+                    data_ingested_adapters.discard(data_source.name)
+                else:
+                    event_actions.append((data_source.name, event_action))
+
+            # Create the missing event actions concurrently
+            if event_actions:
+                max_workers = min(len(event_actions), int(os.getenv("REGISTER_WORKERS", 8)))
+                with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers,
+                                                           thread_name_prefix='register') as executor:
+                    futures = [(name, executor.submit(events_api.create_event_action, event_action))
+                               for name, event_action in event_actions]
+                    for name, future in futures:
+                        try:
+                            create_action_result = future.result()
+                        except Exception as error:
+                            logging.warning('Error creating event action on ' + name + ': ' + str(error))
+                            continue
                         if create_action_result.is_error:
-                            logging.warning('Error creating event action: ' + create_action_result.error)
+                            logging.warning('Error creating event action: ' + str(create_action_result.error))
                         else:
-                            logging.info('Successful creation of event action on ' + data_source.name + ' datasource')
-                            data_ingested_adapters.remove(data_source.name)
-
-                    # If all events are registered
-                    if len(data_ingested_adapters) == 0:
-                        registered = True
-                        logging.info('Successful registration on all adapters')
-                        return registered
-
-        # If the desired data source and container is not found, repeat
-        logging.info(
-            f'Datasource(s) {", ".join(data_ingested_adapters)} not found. Next event registration attempt in {os.getenv("REGISTER_WAIT_SECONDS")} seconds.'
-        )
-        time.sleep(float(os.getenv('REGISTER_WAIT_SECONDS')))
+                            logging.info('Successful creation of event action on ' + name + ' datasource')
+                            data_ingested_adapters.discard(name)
+
+            # If all events are registered
+            if len(data_ingested_adapters) == 0:
+                logging.info('Successful registration on all adapters')
+                return True
+
+        # If the desired data source and container is not found, repeat after a wait that doubles up to
+        # REGISTER_WAIT_SECONDS
+        wait_seconds = min(wait_seconds, float(os.getenv('REGISTER_WAIT_SECONDS')))
+        logging.info(f'Datasource(s) {", ".join(sorted(data_ingested_adapters))} not found. '
+                     f'Next event registration attempt in {wait_seconds} seconds.')
+        time.sleep(wait_seconds)
+        wait_seconds *= 2
         iterations -= 1
 
-    return registered
+    return False
 
 
 def deep_lynx_init():
@@ -205,28 +413,42 @@ def deep_lynx_init():
     Return
         container_id (str), data_source_id (str), api_client (ApiClient)
     """
-    # initialize an ApiClient for use with deep_lynx APIs
-    configuration = deep_lynx.configuration.Configuration()
-    configuration.host = os.getenv('DEEP_LYNX_URL')
-    api_client = deep_lynx.ApiClient(configuration)
+    global token_manager
+    # initialize an ApiClient for use with deep_lynx APIs, with a pool of keep-alive connections shared by all threads
+    api_client = create_api_client(os.getenv('DEEP_LYNX_URL'),
+                                   max_requests=int(os.getenv('DEEP_LYNX_MAX_REQUESTS', 16)),
+                                   max_connections=int(os.getenv('DEEP_LYNX_MAX_CONNECTIONS', 0)) or None)
 
     # perform API token authentication only if values are provided
     if os.getenv('DEEP_LYNX_API_KEY') != '' and os.getenv('DEEP_LYNX_API_KEY') is not None:
 
-        # authenticate via an API key and secret
-        auth_api = deep_lynx.AuthenticationApi(api_client)
+        # authenticate via an API key and secret, the token is refreshed in the background before it expires
+        token_manager = TokenManager(api_client,
+                                     os.getenv('DEEP_LYNX_API_KEY'),
+                                     os.getenv('DEEP_LYNX_API_SECRET'),
+                                     expiry=os.getenv('DEEP_LYNX_TOKEN_EXPIRY') or '12h',
+                                     refresh_fraction=float(os.getenv('DEEP_LYNX_TOKEN_REFRESH_FRACTION', 0.8)))
 
         try:
-            token = auth_api.retrieve_o_auth_token(x_api_key=os.getenv('DEEP_LYNX_API_KEY'),
-                                                   x_api_secret=os.getenv('DEEP_LYNX_API_SECRET'),
-                                                   x_api_expiry='12h')
+            token_manager.start()
         except TypeError:
             print("ERROR: Cannot connect to DeepLynx.")
             logging.error("Cannot connect to DeepLynx.")
+            token_manager = None
             return '', '', None
 
-        # update header
-        api_client.set_default_header('Authorization', 'Bearer {}'.format(token))
+        # replace tokens that Deep Lynx rejects
+        api_client.token_manager = token_manager
+
+    # use the ids resolved by a previous start if they are still valid
+    cache_key = StartupCache.get_key(os.getenv('DEEP_LYNX_URL'), os.getenv('CONTAINER_NAME'),
+                                     os.getenv('DATA_SOURCE_NAME'))
+    cached_ids = startup_cache.get(cache_key)
+    if cached_ids is not None:
+        if is_valid_data_source(api_client, cached_ids['container_id'], cached_ids['data_source_id']):
+            logging.info('Using the cached container and data source ids')
+            return cached_ids['container_id'], cached_ids['data_source_id'], api_client
+        startup_cache.discard(cache_key)
 
     # get container ID
     container_id = None
@@ -254,4 +476,23 @@ def deep_lynx_init():
             deep_lynx.CreateDataSourceRequest(os.getenv('DATA_SOURCE_NAME'), 'standard', True), container_id)
         data_source_id = datasource.value.id
 
+    startup_cache.put(cache_key, {'container_id': container_id, 'data_source_id': data_source_id})
     return container_id, data_source_id, api_client
+
+
+def is_valid_data_source(api_client: deep_lynx.ApiClient, container_id: str, data_source_id: str):
+    """
+    Checks with a single request that cached ids still name the data source of the adapter
+    Args
+        api_client (deep_lynx.ApiClient): deep lynx api client
+        container_id (string): the cached container id
+        data_source_id (string): the cached data source id
+    Return
+        True: if the data source exists in the container
+        False: otherwise
+    """
+    try:
+        datasource = deep_lynx.DataSourcesApi(api_client).retrieve_data_source(container_id, data_source_id)
+    except deep_lynx.rest.ApiException:
+        return False
+    return not datasource.is_error and datasource.value.name == os.getenv('DATA_SOURCE_NAME')
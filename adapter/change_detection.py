@@ -0,0 +1,114 @@
+# Copyright 2021, Battelle Energy Alliance, LLC
+
+# Python Packages
+import numbers
+import threading
+import numpy as np
+
+
+class ChangeDetector:
+    """
+    Skips MOOSE runs whose parameters did not change beyond their tolerances since the last scheduled run
+
+    The tolerances of a parameter are the 'atol' and 'rtol' options of its {{config}} tag, and a parameter is
+    unchanged when |candidate - last| <= atol + rtol * |last|. Parameters without tolerances must match exactly. When
+    the last scheduled run fails, its parameters are rolled back to those of the last successful run, so the same
+    parameters are run again
+    """
+
+    def __init__(self):
+        self.last_json_data = None
+        self.succeeded_json_data = None
+        self.skipped_runs = 0
+        self._lock = threading.Lock()
+
+    def has_changed(self, json_data: list, config: dict):
+        """
+        Compares the parameters of a candidate run against the parameters of the last scheduled run, and counts
+        the run as skipped when they did not change
+        Args
+            json_data (list): an array of json objects of the candidate run
+            config (dictionary): the configuration parameters returned by edit_input_file.read_config
+        Return
+            True: if the run should be executed
+            False: if the run should be skipped
+        """
+        with self._lock:
+            is_changed = self._compare(json_data, config)
+            if not is_changed:
+                self.skipped_runs += 1
+            return is_changed
+
+    def update(self, json_data: list):
+        """
+        Records the parameters of a scheduled run
+        Args
+            json_data (list): an array of json objects of the scheduled run
+        """
+        with self._lock:
+            self.last_json_data = list(json_data)
+
+    def complete(self, json_data: list, is_success: bool):
+        """
+        Records the outcome of a scheduled run, in the order the runs were scheduled
+        Args
+            json_data (list): an array of json objects of the run
+            is_success (boolean): whether the results of the run were imported into Deep Lynx
+        """
+        with self._lock:
+            if is_success:
+                self.succeeded_json_data = list(json_data)
+            elif self.last_json_data == list(json_data):
+                # No run was scheduled after the failed run, compare the next run against the last successful run
+                self.last_json_data = self.succeeded_json_data
+
+    def stats(self):
+        """
+        Return
+            stats (dictionary): the number of skipped runs
+        """
+        with self._lock:
+            return {'skipped': self.skipped_runs}
+
+    def _compare(self, json_data: list, config: dict):
+        # Always run without parameters to compare, or when the set of parameters changed
+        if not json_data or self.last_json_data is None:
+            return True
+        candidate = {(json_object['node'], json_object['parameter']): json_object['value'] for json_object in json_data}
+        last = {
+            (json_object['node'], json_object['parameter']): json_object['value']
+            for json_object in self.last_json_data
+        }
+        if candidate.keys() != last.keys():
+            return True
+
+        keys = list(candidate.keys())
+        is_numeric = np.array([is_number(candidate[key]) and is_number(last[key]) for key in keys], dtype=bool)
+        # Parameters that are not numbers must match exactly
+        if any(candidate[key] != last[key] for key, numeric in zip(keys, is_numeric) if not numeric):
+            return True
+
+        numeric_keys = [key for key, numeric in zip(keys, is_numeric) if numeric]
+        if not numeric_keys:
+            return False
+        candidate_values = np.array([candidate[key] for key in numeric_keys], dtype=float)
+        last_values = np.array([last[key] for key in numeric_keys], dtype=float)
+        atol = np.array([float(get_options(config, key).get('atol', 0)) for key in numeric_keys])
+        rtol = np.array([float(get_options(config, key).get('rtol', 0)) for key in numeric_keys])
+        return bool(np.any(np.abs(candidate_values - last_values) > atol + rtol * np.abs(last_values)))
+
+
+def is_number(value):
+    return isinstance(value, numbers.Number) and not isinstance(value, bool)
+
+
+def get_options(config: dict, key: tuple):
+    """
+    Args
+        config (dictionary): the configuration parameters returned by edit_input_file.read_config
+        key (tuple): the (node, parameter) of a parameter
+    Return
+        options (dictionary): the options of the {{config}} tag of the parameter
+    """
+    datatype, options = config.get(key, (None, dict()))
+    return options
@@ -0,0 +1,81 @@
+# Copyright 2021, Battelle Energy Alliance, LLC
+
+# Python Packages
+import threading
+import deep_lynx
+
+
+class PooledApiClient(deep_lynx.ApiClient):
+    """
+    A Deep Lynx api client that is shared by all threads of the adapter
+
+    Requests reuse the keep-alive connections of a single urllib3 connection pool, and a semaphore caps the number of
+    requests in flight so the pool is never exhausted and Deep Lynx is not flooded by concurrent fetches
+    """
+
+    def __init__(self, configuration: deep_lynx.Configuration, max_requests: int):
+        """
+        Args
+            configuration (deep_lynx.Configuration): the configuration of the client
+            max_requests (integer): the maximum number of requests in flight
+        """
+        super().__init__(configuration)
+        self.max_requests = max_requests
+        self.requests = 0
+        self.in_flight = 0
+        # The TokenManager that replaces rejected tokens (optional)
+        self.token_manager = None
+        self._semaphore = threading.BoundedSemaphore(max_requests)
+        self._lock = threading.Lock()
+
+    def request(self, method, url, query_params=None, headers=None, **kwargs):
+        """
+        Makes an HTTP request once fewer than max_requests requests are in flight. Every api of the deep_lynx package
+        calls this method, including requests made with async_req. A request rejected with 401 is sent once more with
+        the token of the token manager
+        """
+        try:
+            return self._request(method, url, query_params=query_params, headers=headers, **kwargs)
+        except deep_lynx.rest.ApiException as error:
+            authorization = (headers or dict()).get('Authorization')
+            if error.status != 401 or self.token_manager is None or authorization is None \
+                    or self.token_manager.is_authenticating():
+                raise
+            headers = dict(headers, Authorization=self.token_manager.reauthenticate(authorization))
+            return self._request(method, url, query_params=query_params, headers=headers, **kwargs)
+
+    def _request(self, method, url, **kwargs):
+        with self._semaphore:
+            with self._lock:
+                self.requests += 1
+                self.in_flight += 1
+            try:
+                return super().request(method, url, **kwargs)
+            finally:
+                with self._lock:
+                    self.in_flight -= 1
+
+    def stats(self):
+        """
+        Return
+            stats (dictionary): the number of requests made and in flight
+        """
+        with self._lock:
+            return {'requests': self.requests, 'in_flight': self.in_flight, 'max_requests': self.max_requests}
+
+
+def create_api_client(host: str, max_requests: int = 16, max_connections: int = None):
+    """
+    Args
+        host (string): the url of Deep Lynx
+        max_requests (integer): the maximum number of requests in flight
+        max_connections (integer): the number of keep-alive connections of the connection pool (defaults to
+            max_requests, so every request in flight reuses a pooled connection)
+    Return
+        api_client (PooledApiClient): the api client
+    """
+    configuration = deep_lynx.Configuration()
+    configuration.host = host
+    # The urllib3 pool keeps this many connections alive, connections past it are closed after each request
+    configuration.connection_pool_maxsize = max_connections or max_requests
+    return PooledApiClient(configuration, max_requests)
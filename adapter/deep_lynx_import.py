@@ -5,56 +5,47 @@ import os
 import logging
 import deep_lynx
 import json
-import time
+import mimetypes
+import threading
 
 # Repository Modules
 import adapter
+from . import file_watcher, metatype_cache
 
+# Content types of the columnar import files, which the deep_lynx package derives from the file extension
+mimetypes.add_type('application/vnd.apache.parquet', '.parquet')
+mimetypes.add_type('application/vnd.apache.arrow.file', '.arrow')
 
-def import_to_deep_lynx(import_file: str):
+
+def import_to_deep_lynx(import_file: str, upload_files: list = None, done: threading.Event = None):
     """
     Import data into Deep Lynx
     Args
         import_file (string): the file path to import into Deep Lynx
+        upload_files (list): the files uploaded once the import file exists (defaults to the import file)
+        done (Event): set once the import file was written, after which it is not waited for (optional)
     """
     # Get deep lynx environment variables
     api_client = adapter.api_client
     container_id = os.environ["CONTAINER_ID"]
     data_source_id = os.environ["DATA_SOURCE_ID"]
 
-    done = False
-    did_succeed = False
-    start = time.time()
-    path = os.path.join(os.getcwd() + '/' + import_file)
-    while not done:
-        # Check if import file exists
-        if os.path.exists(path):
-            logging.info(f'Found {import_file}.')
-            # Import data into Deep Lynx
-            data_sources_api = deep_lynx.DataSourcesApi(api_client)
-            info = upload_file(data_sources_api, import_file)
-            logging.info('Success: Run complete. Output data sent.')
-            done = True
-            did_succeed = True
-            break
-        else:
-            logging.info(
-                f'Fail: {import_file} not found. Trying again in {os.getenv("IMPORT_FILE_WAIT_SECONDS")} seconds')
-            end = time.time()
-            # Break out of infinite loop
-            if end - start > float(os.getenv("IMPORT_FILE_WAIT_SECONDS")) * 20:
-                logging.info(f'Fail: In the final attempt, {import_file} was not found.')
-                done = True
-                break
-            # Sleep for wait seconds
-            else:
-                logging.info(
-                    f'Fail: {import_file} was not found. Trying again in {os.getenv("IMPORT_FILE_WAIT_SECONDS")} seconds'
-                )
-                time.sleep(int(os.getenv("IMPORT_FILE_WAIT_SECONDS")))
-    if did_succeed:
-        return True
-    return False
+    path = os.path.join(os.getcwd(), import_file)
+    # Wait for the import file as it is created instead of checking every IMPORT_FILE_WAIT_SECONDS
+    timeout = float(os.getenv("IMPORT_FILE_WAIT_SECONDS")) * 20
+    max_interval = float(os.getenv("IMPORT_FILE_POLL_MAX_SECONDS", 1))
+    if not file_watcher.wait_for_file(path, timeout, done=done, max_interval=max_interval):
+        logging.info(f'Fail: In the final attempt, {import_file} was not found.')
+        return False
+    logging.info(f'Found {import_file}.')
+    # Import data into Deep Lynx
+    data_sources_api = deep_lynx.DataSourcesApi(api_client)
+    info = upload_file(data_sources_api, upload_files or import_file)
+    if info is None:
+        logging.info(f'Fail: {import_file} could not be imported into Deep Lynx.')
+        return False
+    logging.info('Success: Run complete. Output data sent.')
+    return True
 
 
 def upload_file(data_sources_api: deep_lynx.DataSourcesApi, file_path: str):
@@ -62,25 +53,31 @@ def upload_file(data_sources_api: deep_lynx.DataSourcesApi, file_path: str):
     Uploads a file into Deep Lynx   
     Args
         data_sources_api (deep_lynx.DataSourcesApi): deep lynx data source api
-        file_path (string): the file path to import into Deep Lynx
+        file_path (string or list): the file path, or a list of file paths, to import into Deep Lynx
+    Return
+        file_return (dictionary): the response of Deep Lynx, or None if the files were not imported
     """
     # Get deep lynx environment variables
     api_client = adapter.api_client
     container_id = os.environ["CONTAINER_ID"]
     data_source_id = os.environ["DATA_SOURCE_ID"]
 
-    file_return = data_sources_api.upload_file(container_id,
-                                               data_source_id,
-                                               file=file_path,
-                                               metadata=os.getenv("METADATA_FILE_NAME"),
-                                               async_req=False)
-    if len(file_return["value"]) > 0:
+    try:
+        file_return = data_sources_api.upload_file(container_id,
+                                                   data_source_id,
+                                                   file=file_path,
+                                                   metadata=os.getenv("METADATA_FILE_NAME"),
+                                                   async_req=False)
+    except deep_lynx.rest.ApiException as error:
+        logging.error('Could not import data into Deep Lynx: %s', error)
+        file_return = None
+    if file_return and not file_return.get("isError") and file_return.get("value"):
         logging.info("Successfully imported data to deep lynx")
         print("Successfully imported data to deep lynx")
-    else:
-        logging.error("Could not import data into Deep Lynx. Check log file for more information")
-        print("Could not import data into Deep Lynx. Check log file for more information")
-    return file_return
+        return file_return
+    logging.error("Could not import data into Deep Lynx. Check log file for more information")
+    print("Could not import data into Deep Lynx. Check log file for more information")
+    return None
 
 
 def create_manual_import(data_sources_api: deep_lynx.DataSourcesApi = None, payload: list = None):
@@ -116,7 +113,9 @@ def generate_payload(data_file: str):
 
 def validate_payload(payload: dict):
     """
-    Validates the payload before inserting into deep lynx
+    Validates the payload before inserting into deep lynx. The nodes of a metatype are validated locally against the
+    schema of the metatype cached in adapter.metatype_registry, and by Deep Lynx only if the schema has data types
+    that are not validated locally
     
     Args
         payload (dictionary): a dictionary of payloads to import into deep lynx e.g. {metatype: list(payload)}
@@ -129,18 +128,40 @@ def validate_payload(payload: dict):
     container_id = os.environ["CONTAINER_ID"]
     data_source_id = os.environ["DATA_SOURCE_ID"]
 
-    # Create deep lynx validator object
-    metatypes_api = deep_lynx.MetatypesApi(api_client)
+    registry = adapter.metatype_registry or metatype_cache.MetatypeRegistry(api_client, container_id)
     is_valid = True
     for metatype, nodes in payload.items():
-        for node in nodes:
-            # For each node, validate the its properies
-            # assumes the first return is the desired metatype
-            metatype_id = metatypes_api.list_metatypes(container_id, name=metatype)[0].id
-            json_error = metatypes_api.validate_metatype_properties(container_id, metatype_id, node)
-            json_error = json.loads(json_error)
-            if json_error["isError"]:
-                for error in json_error["error"]:
-                    logging.error(error)
-                    is_valid = False
+        schema = registry.get(metatype)
+        if schema is None:
+            logging.error('Cannot validate the nodes of metatype %s: its schema could not be loaded', metatype)
+            is_valid = False
+            continue
+        if metatype_cache.is_local(schema):
+            errors = metatype_cache.validate_nodes(metatype, schema, nodes)
+        else:
+            errors = validate_nodes_remotely(api_client, container_id, schema['id'], nodes)
+        for error in errors:
+            logging.error(error)
+            is_valid = False
     return is_valid
+
+
+def validate_nodes_remotely(api_client: deep_lynx.ApiClient, container_id: str, metatype_id: str, nodes: list):
+    """
+    Validates the properties of nodes with Deep Lynx, one request per node
+    Args
+        api_client (deep_lynx.ApiClient): deep lynx api client
+        container_id (string): the container of the metatype
+        metatype_id (string): the id of the metatype
+        nodes (list): the properties of each node
+    Return
+        errors (list): the errors of the invalid nodes
+    """
+    # Create deep lynx validator object
+    metatypes_api = deep_lynx.MetatypesApi(api_client)
+    errors = list()
+    for node in nodes:
+        response = metatypes_api.validate_metatype_properties(container_id, metatype_id, body=node)
+        if response.is_error:
+            errors.extend(response.value if isinstance(response.value, list) else [response.value])
+    return errors
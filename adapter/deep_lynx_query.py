@@ -2,12 +2,20 @@
 
 # Python Packages
 import os
+import json
+import time
+import logging
+import concurrent.futures
 import pandas as pd
 import deep_lynx
 
 # Repository Modules
 import settings
 import adapter
+from . import edit_input_file
+
+# Time of the last queue checkpoint
+last_checkpoint = 0
 
 
 def query_deep_lynx(file_id: str):
@@ -15,37 +23,203 @@ def query_deep_lynx(file_id: str):
     Retrieve data from Deep Lynx
     Args
         file_id (string): the id of a file stored in Deep Lynx
+    Return
+        True: if the data of the file was added to the queue
+        False: if the file could not be read
+    """
+    query_df, rows = read_file(file_id)
+    if query_df is None:
+        return False
+    queue(query_df, rows)
+    return True
+
+
+def query_deep_lynx_batch(file_ids: list):
+    """
+    Retrieve data from many Deep Lynx files concurrently and add it to the queue in a single append. A file that
+    cannot be read does not stop the data of the other files from being added
+    Args
+        file_ids (list): the ids of files stored in Deep Lynx, in the order their data is added to the queue
+    Return
+        failed_file_ids (list): the ids of the files that could not be read
+    """
+    max_workers = max(1, min(len(file_ids), int(os.getenv("BATCH_FETCH_WORKERS", 8))))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='batch_fetch') as executor:
+        futures = [executor.submit(read_file, file_id) for file_id in file_ids]
+    results = list()
+    failed_file_ids = list()
+    for file_id, future in zip(file_ids, futures):
+        try:
+            query_df, rows = future.result()
+        except Exception:
+            logging.exception('Could not read file %s from Deep Lynx', file_id)
+            query_df = None
+        if query_df is None:
+            failed_file_ids.append(file_id)
+        else:
+            results.append((query_df, rows))
+    if results:
+        queue(pd.concat([query_df for query_df, rows in results], ignore_index=True),
+              sum(rows for query_df, rows in results))
+    return failed_file_ids
+
+
+def read_file(file_id: str):
+    """
+    Retrieve a file from Deep Lynx and read its data. With QUERY_RETRIEVAL_MODE=download the file is streamed from
+    Deep Lynx over HTTP, otherwise it is read from the file store of Deep Lynx on the same filesystem
+    Args
+        file_id (string): the id of a file stored in Deep Lynx
+    Return
+        query_df (DataFrame): the newest QUEUE_LENGTH rows of the file, or None if the file could not be retrieved
+        rows (integer): the number of rows of the file
     """
     # Get deep lynx environment variables
     api_client = adapter.api_client
-    container_id = os.environ["CONTAINER_ID"]
-    data_source_id = os.environ["DATA_SOURCE_ID"]
 
     # Retrieve file from Deep Lynx
     data_sources_api = deep_lynx.DataSourcesApi(api_client)
+    if os.getenv("QUERY_RETRIEVAL_MODE", "path") == "download":
+        response = download_file(data_sources_api, file_id)
+        if response is None:
+            logging.error('Could not download file %s from Deep Lynx', file_id)
+            return None, 0
+        try:
+            return read_query_file(response)
+        finally:
+            response.release_conn()
+
     dl_file_path = retrieve_file(data_sources_api, file_id)
+    if dl_file_path is None:
+        logging.error('Could not retrieve file %s from Deep Lynx', file_id)
+        return None, 0
 
-    # Write csv to local repository
-    query_df = pd.read_csv(dl_file_path)
-    queue(query_df)
+    return read_query_file(dl_file_path)
+
+
+def read_query_file(query_file, schema: dict = None, columns: list = None):
+    """
+    Parses a csv file in chunks, keeping only the newest QUEUE_LENGTH rows that can be in the queue, so the memory
+    used does not depend on the size of the file
+    Args
+        query_file (string or file-like): the path of the file or a stream of its content
+        schema (dictionary): the dtype of each column, so dtypes are not inferred (defaults to QUERY_SCHEMA_FILE_NAME)
+        columns (list): the columns kept, in addition to the columns of the schema (defaults to the columns of the
+            parameters of the configuration file). All columns are kept without a schema
+    Return
+        query_df (DataFrame): the newest QUEUE_LENGTH rows of the file
+        rows (integer): the number of rows of the file
+    """
+    schema = read_query_schema() if schema is None else schema
+    kept_columns = get_kept_columns(schema, columns)
+    usecols = None if kept_columns is None else kept_columns.__contains__
+    max_rows = int(os.getenv("QUEUE_LENGTH"))
+    rows = 0
+    query_df = None
+    for chunk in pd.read_csv(query_file,
+                             usecols=usecols,
+                             dtype=schema or None,
+                             chunksize=int(os.getenv("QUERY_CHUNK_SIZE", 100000))):
+        rows += chunk.shape[0]
+        query_df = chunk if query_df is None else pd.concat([query_df, chunk], ignore_index=True)
+        query_df = query_df.iloc[-max_rows:]
+    if query_df is None:
+        query_df = pd.DataFrame()
+    return query_df.reset_index(drop=True), rows
+
+
+def select_query_columns(queue_df: pd.DataFrame, schema: dict = None, columns: list = None):
+    """
+    Selects the columns kept by read_query_file from queue rows restored from disk, so the rows of new files can be
+    appended to the queue after QUERY_SCHEMA_FILE_NAME was set or changed. A kept column that the restored rows do not
+    have is added as missing values
+    Args
+        queue_df (DataFrame): the restored rows
+        schema (dictionary): the dtype of each column (defaults to QUERY_SCHEMA_FILE_NAME)
+        columns (list): the columns kept, in addition to the columns of the schema (defaults to the columns of the
+            parameters of the configuration file)
+    Return
+        queue_df (DataFrame): the restored rows with the kept columns, unchanged without a schema
+    """
+    schema = read_query_schema() if schema is None else schema
+    kept_columns = get_kept_columns(schema, columns)
+    if kept_columns is None or queue_df.shape[0] == 0:
+        return queue_df
+    dropped_columns = [column for column in queue_df.columns if column not in kept_columns]
+    if dropped_columns:
+        logging.warning('Dropped column(s) %s of the restored queue that are not kept with the query schema',
+                        ', '.join(map(str, dropped_columns)))
+    added_columns = sorted(kept_columns.difference(queue_df.columns))
+    restored_columns = [column for column in queue_df.columns if column in kept_columns]
+    queue_df = queue_df.reindex(columns=restored_columns + added_columns)
+    for column, dtype in schema.items():
+        try:
+            queue_df[column] = queue_df[column].astype(dtype)
+        except (TypeError, ValueError):
+            # e.g. missing values of an integer column, the dtype of the values appended later is used instead
+            logging.warning('Could not convert column %s of the restored queue to %s', column, dtype)
+    return queue_df
+
+
+def get_kept_columns(schema: dict, columns: list = None):
+    """
+    Args
+        schema (dictionary): the dtype of each column
+        columns (list): the columns kept, in addition to the columns of the schema (defaults to the columns of the
+            parameters of the configuration file)
+    Return
+        kept_columns (set): the columns kept from the files, None to keep every column when there is no schema
+    """
+    if not schema:
+        return None
+    return set(schema) | set(get_template_columns() if columns is None else columns)
+
+
+def read_query_schema():
+    """
+    Reads the declared dtypes of the columns of the files in Deep Lynx e.g. {"/BCs/left/value": "float64"}
+    Return
+        schema (dictionary): the dtype of each column, empty if QUERY_SCHEMA_FILE_NAME is not set
+    """
+    schema_file = os.getenv("QUERY_SCHEMA_FILE_NAME")
+    if not schema_file:
+        return dict()
+    with open(schema_file, 'r') as json_file:
+        return json.load(json_file)
+
+
+def get_template_columns():
+    """
+    Return
+        columns (list): the columns of the queue used by the templates, the parameters of the configuration file
+    """
+    if not os.getenv("CONFIG_FILE_NAME"):
+        return list()
+    return [
+        parameter if node is None else node + '/' + parameter
+        for node, parameter in edit_input_file.read_config().keys()
+    ]
 
 
 def download_file(dl_service: deep_lynx.DataSourcesApi, file_id: str):
     """
-    Downloads a file from Deep Lynx
+    Downloads a file from Deep Lynx without reading its content into memory
     Args
         dl_service (deep_lynx.DataSourcesApi): deep lynx data source api
         file_id (string): the id of a file
+    Return
+        response (urllib3.HTTPResponse): the response, whose content is read as a stream, or None
     """
     # Get deep lynx environment variables
     api_client = adapter.api_client
     container_id = os.environ["CONTAINER_ID"]
     data_source_id = os.environ["DATA_SOURCE_ID"]
 
-    download_file = dl_service.download_file(container_id, file_id)
-
-    if not download_file.is_error:
-        return download_file
+    try:
+        return dl_service.download_file(container_id, file_id, _preload_content=False)
+    except deep_lynx.rest.ApiException as error:
+        logging.error('Download of file %s failed: %s', file_id, error)
+        return None
 
 
 def retrieve_file(data_sources_api: deep_lynx.DataSourcesApi, file_id: str):
@@ -69,26 +243,31 @@ def retrieve_file(data_sources_api: deep_lynx.DataSourcesApi, file_id: str):
         return path
 
 
-def queue(query_df: pd.DataFrame or pd.Series):
+def queue(query_df: pd.DataFrame or pd.Series, rows: int = None):
     """
-    Maintains a queue file of a given length via the First In First Out (FIFO) data structure
+    Maintains a queue of a given length via the First In First Out (FIFO) data structure
     Args
         query_df (DataFrame or Series): data to add to the queue
+        rows (integer): the number of new rows the data was read from, which counts towards the run trigger
+            (defaults to the rows of the data)
     """
+    global last_checkpoint
+    if isinstance(query_df, pd.Series):
+        query_df = query_df.to_frame().T
+    queue_df = None
     # Applies a lock for threading
     with adapter.lock_:
-        if os.path.exists(os.getenv("QUEUE_FILE_NAME")):
-            # Read master queue file
-            queue_df = pd.read_csv(os.getenv("QUEUE_FILE_NAME"))
-            # Append query file to queue
-            queue_df = queue_df.append(query_df, ignore_index=True)
-        else:
-            # If queue file does not exist
-            queue_df = query_df
-        new_queue_length = queue_df.shape[0]
-        # Keep queue at given length
-        if new_queue_length > int(os.getenv("QUEUE_LENGTH")):
-            subtract_length = new_queue_length - int(os.getenv("QUEUE_LENGTH"))
-            queue_df.drop([i for i in range(subtract_length)], axis=0, inplace=True)
-        # Write queue to csv
-        queue_df.to_csv(os.getenv("QUEUE_FILE_NAME"), index=False)
+        # Append query data to the in-memory queue, which evicts the oldest rows past QUEUE_LENGTH and raises before
+        # anything is written when the data is missing a column of the queue
+        adapter.queue_buffer.append(query_df)
+        # Append the accepted rows to the durable queue log, only the new rows are written to disk
+        adapter.queue_log.append(query_df[adapter.queue_buffer.columns])
+        # Wake the MOOSE thread if the new rows meet the run trigger
+        adapter.scheduler.notify(query_df.shape[0] if rows is None else rows)
+        # Copy the queue for a periodic checkpoint, the csv itself is written outside of the lock
+        checkpoint_seconds = float(os.getenv("QUEUE_CHECKPOINT_SECONDS", 0))
+        if checkpoint_seconds > 0 and time.time() - last_checkpoint >= checkpoint_seconds:
+            last_checkpoint = time.time()
+            queue_df = adapter.queue_buffer.to_dataframe()
+    if queue_df is not None:
+        adapter.queue_buffer.checkpoint(os.getenv("QUEUE_FILE_NAME"), queue_df)
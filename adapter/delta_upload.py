@@ -0,0 +1,233 @@
+# Copyright 2021, Battelle Energy Alliance, LLC
+
+# Python Packages
+import os
+import json
+import logging
+import threading
+import numpy as np
+import pandas as pd
+
+# Repository Modules
+from . import output_format
+
+# Columns that identify a row of results, when they are in the import file
+KEY_COLUMNS = ('source', 'variable', 'time_step', 'index', 'variant')
+# Column of the delta file with the change of each row, 'upsert' or 'delete'
+CHANGE_COLUMN = 'change'
+
+
+class DeltaUploader:
+    """
+    Uploads only the rows of results that changed since the last upload, with a manifest of the changes
+
+    The values last uploaded to Deep Lynx are kept locally as the baseline. A row is changed when it is new, or when a
+    value differs from the baseline by more than atol + rtol * |baseline|. Rows of the baseline that are not in the
+    new results are uploaded as deletions
+    """
+
+    def __init__(self, directory: str, atol: float = 0.0, rtol: float = 0.0, key_columns: list = None):
+        """
+        Args
+            directory (string): the directory of the baseline
+            atol (float): the absolute tolerance of numeric values
+            rtol (float): the relative tolerance of numeric values
+            key_columns (list): the columns that identify a row (defaults to the KEY_COLUMNS in the results, or the
+                position of the row)
+        """
+        self.directory = directory
+        self.atol = atol
+        self.rtol = rtol
+        self.key_columns = key_columns
+        self.uploaded_rows = 0
+        self.skipped_rows = 0
+        # Deltas are computed against the baseline of the previous upload, so uploads must not overlap
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def upload(self, import_file: str, upload):
+        """
+        Uploads the changes of an import file, and updates the baseline once the upload succeeded
+        Args
+            import_file (string): the import file of a run
+            upload (callable): called with the import file and the list of files to upload, returns True on success
+        Return
+            True: if the changes were uploaded or there were no changes
+            False: otherwise
+        """
+        if not os.path.exists(import_file):
+            # Nothing to compare, upload waits for the import file
+            return upload(import_file, None)
+        with self._lock:
+            results = read_results(import_file)
+            baseline_file = self.get_baseline_file(import_file)
+            baseline = read_results(baseline_file) if os.path.exists(baseline_file) else None
+            key_columns = self.get_key_columns(results)
+            # Results with other columns than the baseline, or rows with the same key, are uploaded in full
+            is_delta = is_comparable(results, baseline, key_columns)
+            delta, new_baseline = get_delta(results, baseline if is_delta else None, key_columns, self.atol, self.rtol)
+
+            changed_rows = delta.shape[0]
+            if is_delta and changed_rows == 0:
+                logging.info('Skipped upload of %s: no results changed beyond their tolerances', import_file)
+                self.skipped_rows += results.shape[0]
+                return True
+
+            base, extension = os.path.splitext(import_file)
+            delta_file = base + '_delta' + extension
+            manifest_file = base + '_manifest.json'
+            write_results(delta, delta_file)
+            manifest = {
+                'file': os.path.basename(delta_file),
+                'is_delta': is_delta,
+                'rows': int(results.shape[0]),
+                'upserted': int((delta[CHANGE_COLUMN] == 'upsert').sum()),
+                'deleted': int((delta[CHANGE_COLUMN] == 'delete').sum()),
+                'key_columns': key_columns,
+                'atol': self.atol,
+                'rtol': self.rtol
+            }
+            with open(manifest_file, 'w') as json_file:
+                json.dump(manifest, json_file)
+
+            if not upload(import_file, [delta_file, manifest_file]):
+                return False
+            write_results(new_baseline, baseline_file)
+            self.uploaded_rows += changed_rows
+            self.skipped_rows += results.shape[0] - manifest['upserted']
+            logging.info('Uploaded %s changed rows of %s rows of %s', changed_rows, results.shape[0], import_file)
+            return True
+
+    def get_baseline_file(self, import_file: str):
+        """
+        Args
+            import_file (string): the import file of a run
+        Return
+            baseline_file (string): the baseline of import files of the same output format
+        """
+        return os.path.join(self.directory, 'baseline' + os.path.splitext(import_file)[1])
+
+    def get_key_columns(self, results: pd.DataFrame):
+        """
+        Args
+            results (DataFrame): the results of a run
+        Return
+            key_columns (list): the columns that identify a row, empty to identify rows by position
+        """
+        key_columns = self.key_columns or KEY_COLUMNS
+        return [column for column in key_columns if column in results.columns]
+
+    def stats(self):
+        """
+        Return
+            stats (dictionary): the number of uploaded rows and the number of unchanged rows that were not uploaded
+        """
+        with self._lock:
+            return {'uploaded_rows': self.uploaded_rows, 'skipped_rows': self.skipped_rows}
+
+
+def read_results(file_name: str):
+    """
+    Args
+        file_name (string): a file written in an output format
+    Return
+        results (DataFrame): the rows of the file
+    """
+    chunks = list(output_format.read_chunks(file_name, int(os.getenv("POST_PROCESS_CHUNK_SIZE", 100000))))
+    if not chunks:
+        return pd.DataFrame()
+    return pd.concat(chunks, ignore_index=True)
+
+
+def write_results(results: pd.DataFrame, file_name: str):
+    """
+    Writes results atomically, so an interrupted write never replaces the previous file
+    Args
+        results (DataFrame): the rows to write
+        file_name (string): the file, written in the output format of its extension
+    """
+    base, extension = os.path.splitext(file_name)
+    temp_file = base + '.tmp' + extension
+    writer = output_format.create_writer(temp_file)
+    try:
+        writer.write(results)
+    finally:
+        writer.close()
+    os.replace(temp_file, file_name)
+
+
+def is_comparable(results: pd.DataFrame, baseline: pd.DataFrame, key_columns: list):
+    """
+    Args
+        results (DataFrame): the results of a run
+        baseline (DataFrame): the values last uploaded, None before the first upload
+        key_columns (list): the columns that identify a row, empty to identify rows by position
+    Return
+        True: if the rows of the results can be matched with the rows of the baseline by their key
+        False: otherwise
+    """
+    if baseline is None or list(baseline.columns) != list(results.columns):
+        return False
+    for name, frame in (('results', results), ('baseline', baseline)):
+        if key_columns and frame.duplicated(subset=key_columns).any():
+            logging.warning('Uploading the results in full: the key columns %s of the %s are not unique', key_columns,
+                            name)
+            return False
+    return True
+
+
+def get_delta(results: pd.DataFrame, baseline: pd.DataFrame, key_columns: list, atol: float, rtol: float):
+    """
+    Compares the results of a run against the baseline
+    Args
+        results (DataFrame): the results of the run
+        baseline (DataFrame): the values last uploaded, None before the first upload
+        key_columns (list): the columns that identify a row, empty to identify rows by position
+        atol (float): the absolute tolerance of numeric values
+        rtol (float): the relative tolerance of numeric values
+    Return
+        delta (DataFrame): the changed rows with the CHANGE_COLUMN
+        new_baseline (DataFrame): the baseline after the delta is uploaded
+    """
+    if not is_comparable(results, baseline, key_columns):
+        return results.assign(**{CHANGE_COLUMN: 'upsert'}), results
+
+    # Align the rows of the baseline with the rows of the results by their key
+    if key_columns:
+        results_index = pd.MultiIndex.from_frame(results[key_columns])
+        baseline_index = pd.MultiIndex.from_frame(baseline[key_columns])
+    else:
+        results_index = pd.RangeIndex(results.shape[0])
+        baseline_index = pd.RangeIndex(baseline.shape[0])
+    positions = baseline_index.get_indexer(results_index)
+    is_new = positions < 0
+
+    is_changed = is_new.copy()
+    matched = baseline.iloc[np.where(is_new, 0, positions)] if baseline.shape[0] else None
+    value_columns = [column for column in results.columns if column not in key_columns]
+    for column in value_columns:
+        if matched is None:
+            break
+        new_values = results[column].to_numpy()
+        old_values = matched[column].to_numpy()
+        if pd.api.types.is_numeric_dtype(results[column]) and pd.api.types.is_numeric_dtype(baseline[column]):
+            new_values = new_values.astype(float)
+            old_values = old_values.astype(float)
+            both_nan = np.isnan(new_values) & np.isnan(old_values)
+            is_close = np.abs(new_values - old_values) <= atol + rtol * np.abs(old_values)
+            is_changed |= ~(is_close | both_nan)
+        else:
+            both_null = pd.isnull(new_values) & pd.isnull(old_values)
+            is_changed |= ~((new_values == old_values) | both_null)
+
+    # Rows of the baseline that are not in the results
+    is_deleted = np.ones(baseline.shape[0], dtype=bool)
+    is_deleted[positions[~is_new]] = False
+
+    upserted = results[is_changed].assign(**{CHANGE_COLUMN: 'upsert'})
+    deleted = baseline[is_deleted].assign(**{CHANGE_COLUMN: 'delete'})
+    delta = pd.concat([upserted, deleted], ignore_index=True)
+    # Rows within their tolerances keep the values last uploaded, so small changes cannot accumulate unseen
+    unchanged = baseline.iloc[positions[~is_changed]]
+    new_baseline = pd.concat([unchanged, results[is_changed]], ignore_index=True)
+    return delta, new_baseline
@@ -4,6 +4,7 @@
 import os
 import logging
 import configparser
+import pandas as pd
 
 # Repository Modules
 from adapter import template_parser
@@ -14,6 +15,39 @@ import pyhit
 import moosetree
 import mooseutils
 
+# Strings of the boolean values in the queue
+BOOL_VALUES = {'true': True, '1': True, '1.0': True, 'false': False, '0': False, '0.0': False}
+
+
+def to_int(value):
+    """
+    Args
+        value: a number or string of an integer e.g. 3, 3.0, or '3'
+    Return
+        value (integer): the integer, a ValueError is raised if the value is not an integer
+    """
+    number = float(value)
+    if not number.is_integer():
+        raise ValueError('{0!r} is not an integer'.format(value))
+    return int(number)
+
+
+def to_bool(value):
+    """
+    Args
+        value: a boolean, number, or string of a boolean e.g. True, 0, or 'false'
+    Return
+        value (boolean): the boolean, a ValueError is raised if the value is not a boolean
+    """
+    text = str(value).strip().lower()
+    if text not in BOOL_VALUES:
+        raise ValueError('{0!r} is not a boolean'.format(value))
+    return BOOL_VALUES[text]
+
+
+# Conversion of queue values to the datatypes of the configuration file
+CONFIG_DATATYPES = {'int': to_int, 'float': float, 'str': str, 'bool': to_bool}
+
 
 def create_json_data():
     """
@@ -66,6 +100,7 @@ def validate_changes_to_input_file(json_data: list):
                         # If a valid parameter
                         if config_param == json_object['parameter']:
                             is_parameter_found = True
+                            config_value, config_options = template_parser.parse_config_value(config_value)
                             # If a valid datatype
                             if config_value in type(json_object['value']).__name__:
                                 break
@@ -99,6 +134,54 @@ def validate_changes_to_input_file(json_data: list):
     return True
 
 
+def read_config():
+    """
+    Reads the parameters of the configuration file
+    Return
+        config (dictionary): dictionary of (node, parameter) and (datatype, options) e.g.
+            {('/BCs/left', 'value'): ('int', {'atol': '0.5'})}, where the node of a global variable is None
+    """
+    config = configparser.ConfigParser()
+    config.optionxform = str
+    config.read(os.getenv('CONFIG_FILE_NAME'))
+    config_params = dict()
+    for section in config.sections():
+        node = None if section == 'root' else section
+        for parameter, config_value in config.items(section):
+            config_params[(node, parameter)] = template_parser.parse_config_value(config_value)
+    return config_params
+
+
+def get_json_data(queue_df: pd.DataFrame, config: dict):
+    """
+    Creates the json objects of the configuration parameters from the newest row of the queue. The column of a
+    parameter is the full path of the parameter e.g. '/BCs/left/value', or its name for a global variable e.g. 'xmax'
+    Args
+        queue_df (DataFrame): the queue
+        config (dictionary): the configuration parameters returned by read_config
+    Return
+        json_data (list): an array of json objects of the parameters found in the queue, a ValueError is raised if a
+            value is missing or is not a value of the datatype of its parameter
+    """
+    json_data = list()
+    if queue_df.shape[0] == 0:
+        return json_data
+    row = queue_df.iloc[-1]
+    for (node, parameter), (datatype, options) in config.items():
+        column = parameter if node is None else node + '/' + parameter
+        if column in queue_df.columns:
+            value = row[column]
+            if pd.isnull(value):
+                raise ValueError('Missing value of parameter {0}'.format(column))
+            if datatype in CONFIG_DATATYPES:
+                try:
+                    value = CONFIG_DATATYPES[datatype](value)
+                except (TypeError, ValueError) as error:
+                    raise ValueError('Invalid {0} value of parameter {1}: {2}'.format(datatype, column, error))
+            json_data.append({"node": node, "parameter": parameter, "value": value})
+    return json_data
+
+
 def update_parameter_values(node: moosetree.Node, json_object: dict):
     """
     Updates the parameter value of a node and adds a comment documenting the change
@@ -139,15 +222,23 @@ def remove_config_comments(node: moosetree.Node):
                 node.setComment(key, None)
             # Modify existing comment
             elif '{{config}}' in original_comment:
-                modified_comment = original_comment.replace('{{config}}', '').strip()
-                node.setComment(key, modified_comment)
+                config_options = template_parser.get_config_options(original_comment)
+                modified_comment = original_comment.replace('{{config}}', '')
+                # Remove the options of the {{config}} tag e.g. 'atol=0.5'
+                for option_key, option_value in config_options.items():
+                    modified_comment = modified_comment.replace(option_key + '=' + option_value, '', 1)
+                if config_options:
+                    modified_comment = ' '.join(modified_comment.split())
+                modified_comment = modified_comment.strip()
+                node.setComment(key, modified_comment or None)
 
 
-def modify_input_file(json_data: list):
+def modify_input_file(json_data: list, run_file: str = None):
     """
     Creates an input file that incorporates the modifications from Deep Lynx
     Args
         json_data (list): an array of json objects from Deep Lynx
+        run_file (string): the input file to write (defaults to RUN_FILE_NAME)
     """
     # Read the file
     root = pyhit.load(os.getenv('TEMPLATE_INPUT_FILE_NAME'))
@@ -169,7 +260,7 @@ def modify_input_file(json_data: list):
         remove_config_comments(node)
 
     # Write the moosetree to a file
-    pyhit.write(os.getenv('RUN_FILE_NAME'), root)
+    pyhit.write(run_file or os.getenv('RUN_FILE_NAME'), root)
 
 
 def main(json_data=None, event=None, dlService=None):
@@ -0,0 +1,99 @@
+# Copyright 2021, Battelle Energy Alliance, LLC
+
+# Python Packages
+import os
+import time
+import logging
+import threading
+
+# Optional Packages
+try:
+    import inotify_simple
+except ImportError:
+    inotify_simple = None
+
+
+def wait_for_file(file_name: str,
+                  timeout: float,
+                  done: threading.Event = None,
+                  min_interval: float = 0.05,
+                  max_interval: float = 1.0):
+    """
+    Waits until a file exists. The directory of the file is watched with inotify when the optional inotify_simple
+    package is installed, otherwise the file is polled with an interval that doubles from min_interval to max_interval
+    Args
+        file_name (string): the file to wait for
+        timeout (float): the maximum number of seconds to wait
+        done (Event): set once the producer of the file finished e.g. the process that writes it exited, after which
+            the file is checked one last time instead of waiting for the timeout (optional)
+        min_interval (float): the first number of seconds between checks of the file
+        max_interval (float): the maximum number of seconds between checks of the file
+    Return
+        True: if the file exists
+        False: if the file does not exist after the timeout or after its producer finished
+    """
+    deadline = time.monotonic() + timeout
+    directory = os.path.dirname(os.path.abspath(file_name))
+    if inotify_simple is not None and os.path.isdir(directory):
+        try:
+            return watch_for_file(file_name, directory, deadline, done, max_interval)
+        except OSError as error:
+            # e.g. the limit of inotify watches is reached
+            logging.warning('Cannot watch %s with inotify, polling instead: %s', directory, error)
+    return poll_for_file(file_name, deadline, done, min_interval, max_interval)
+
+
+def watch_for_file(file_name: str, directory: str, deadline: float, done: threading.Event, max_interval: float):
+    """
+    Waits until a file exists with inotify events of its directory
+    Args
+        file_name (string): the file to wait for
+        directory (string): the directory of the file
+        deadline (float): the time.monotonic() after which to stop waiting
+        done (Event): set once the producer of the file finished (optional)
+        max_interval (float): the maximum number of seconds between checks of done
+    Return
+        True: if the file exists
+        False: otherwise
+    """
+    flags = inotify_simple.flags
+    with inotify_simple.INotify() as inotify:
+        inotify.add_watch(directory, flags.CREATE | flags.MOVED_TO | flags.CLOSE_WRITE)
+        # The file may have been created before the watch was added
+        while not os.path.exists(file_name):
+            if done is not None and done.is_set():
+                return os.path.exists(file_name)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            inotify.read(timeout=int(1000 * min(remaining, max_interval)))
+    return True
+
+
+def poll_for_file(file_name: str, deadline: float, done: threading.Event, min_interval: float, max_interval: float):
+    """
+    Waits until a file exists by polling it with an adaptive backoff
+    Args
+        file_name (string): the file to wait for
+        deadline (float): the time.monotonic() after which to stop waiting
+        done (Event): set once the producer of the file finished (optional)
+        min_interval (float): the first number of seconds between checks of the file
+        max_interval (float): the maximum number of seconds between checks of the file
+    Return
+        True: if the file exists
+        False: otherwise
+    """
+    interval = min_interval
+    while not os.path.exists(file_name):
+        if done is not None and done.is_set():
+            return os.path.exists(file_name)
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        # Wake up as soon as the producer finished
+        if done is not None:
+            done.wait(min(remaining, interval))
+        else:
+            time.sleep(min(remaining, interval))
+        interval = min(2 * interval, max_interval)
+    return True
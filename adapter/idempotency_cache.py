@@ -0,0 +1,115 @@
+# Copyright 2021, Battelle Energy Alliance, LLC
+
+# Python Packages
+import os
+import json
+import time
+import logging
+import threading
+import collections
+
+
+class IdempotencyCache:
+    """
+    A least recently used (LRU) cache of recently seen keys that expire after a time to live (TTL)
+    """
+
+    def __init__(self, capacity: int, ttl_seconds: float, file_name: str = None, save_seconds: float = 10):
+        """
+        Args
+            capacity (integer): the maximum number of keys kept in the cache
+            ttl_seconds (float): the number of seconds a key is kept in the cache
+            file_name (string): the json file the cache is persisted to across restarts (optional)
+            save_seconds (float): the minimum number of seconds between writes of the json file
+        """
+        self.capacity = capacity
+        self.ttl_seconds = ttl_seconds
+        self.file_name = file_name
+        self.save_seconds = save_seconds
+        self.hits = 0
+        self.misses = 0
+        # Dictionary of key and the time it was last seen, oldest first
+        self._keys = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._last_save = 0
+        if self.file_name and os.path.exists(self.file_name):
+            self._load()
+
+    def check_and_add(self, key: str):
+        """
+        Checks whether a key was seen within the time to live, and adds it to the cache
+        Args
+            key (string): the key to check e.g. a file id
+        Return
+            True: if the key is a duplicate
+            False: if the key is new or expired
+        """
+        now = time.time()
+        with self._lock:
+            seen = self._keys.pop(key, None)
+            is_duplicate = seen is not None and now - seen < self.ttl_seconds
+            if is_duplicate:
+                self.hits += 1
+            else:
+                self.misses += 1
+            self._keys[key] = now
+            while len(self._keys) > self.capacity:
+                self._keys.popitem(last=False)
+        self._save()
+        return is_duplicate
+
+    def discard(self, key: str):
+        """
+        Removes a key from the cache, e.g. when the work for the key could not be scheduled. The json file is written
+        at once, so the key is not restored as a duplicate after a restart
+        Args
+            key (string): the key to remove
+        """
+        with self._lock:
+            is_removed = self._keys.pop(key, None) is not None
+        if is_removed:
+            self._save(force=True)
+
+    def stats(self):
+        """
+        Return
+            stats (dictionary): the number of keys, hits, and misses of the cache
+        """
+        with self._lock:
+            return {'size': len(self._keys), 'hits': self.hits, 'misses': self.misses}
+
+    def _save(self, force: bool = False):
+        """
+        Writes the unexpired keys to the json file, at most once every save_seconds
+        Args
+            force (boolean): whether to ignore save_seconds
+        """
+        if not self.file_name:
+            return
+        now = time.time()
+        with self._lock:
+            if not force and now - self._last_save < self.save_seconds:
+                return
+            self._last_save = now
+            keys = {key: seen for key, seen in self._keys.items() if now - seen < self.ttl_seconds}
+        temp_file_name = '{0}.{1}.tmp'.format(self.file_name, threading.get_ident())
+        with open(temp_file_name, 'w') as cache_file:
+            json.dump(keys, cache_file)
+        os.replace(temp_file_name, self.file_name)
+
+    def _load(self):
+        """
+        Reads the unexpired keys from the json file
+        """
+        try:
+            with open(self.file_name) as cache_file:
+                keys = json.load(cache_file)
+        except ValueError:
+            logging.error('Ignoring invalid idempotency cache file %s', self.file_name)
+            return
+        now = time.time()
+        for key, seen in sorted(keys.items(), key=lambda item: item[1]):
+            if now - seen < self.ttl_seconds:
+                self._keys[key] = seen
+        while len(self._keys) > self.capacity:
+            self._keys.popitem(last=False)
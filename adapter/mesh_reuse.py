@@ -0,0 +1,83 @@
+# Copyright 2021, Battelle Energy Alliance, LLC
+
+# Python Packages
+import os
+import hashlib
+
+# Repository Modules
+from .result_cache import update_executable
+
+# MOOSE Modules
+import pyhit
+import moosetree
+
+# Name of the mesh file in the work directory of a run
+MESH_FILE_NAME = 'mesh.e'
+
+# Parameters of [Mesh] that apply to the mesh read from a file, kept when a mesh of the legacy syntax e.g.
+# type = GeneratedMesh is replaced. The other parameters of a legacy mesh are parameters of its generation
+MESH_PARAMETERS = {
+    'uniform_refine', 'second_order', 'parallel_type', 'partitioner', 'centroid_partitioner_direction',
+    'allow_renumbering', 'skip_partitioning', 'displacements', 'use_displaced_mesh', 'patch_size',
+    'patch_update_strategy', 'ghosting_patch_size', 'max_leaf_size', 'construct_node_list_from_side_list',
+    'construct_side_list_from_node_list', 'ghosted_boundaries', 'ghosted_boundaries_inflation', 'nemesis',
+    'add_subdomain_ids', 'add_subdomain_names', 'add_sideset_ids', 'add_sideset_names', 'build_all_side_lowerd_mesh'
+}
+
+# Sub-blocks of [Mesh] that are not mesh generators
+MESH_SUB_BLOCKS = {'Partitioner'}
+
+
+def get_mesh_node(root: moosetree.Node):
+    """
+    Args
+        root (Node): the root node of an input file
+    Return
+        mesh (Node): the [Mesh] block of the input file, or None
+    """
+    return moosetree.find(root, func=lambda node: node.fullpath == '/Mesh')
+
+
+def get_mesh_key(run_file: str, executable: str = None):
+    """
+    Hashes the [Mesh] block of an input file, so runs that only changed parameters outside of the mesh e.g.
+    /BCs/left/value have the same key. Global variables referenced by the block e.g. ${xmax} are replaced by their value
+    Args
+        run_file (string): the input file
+        executable (string): the path of the MOOSE executable that generates the mesh (optional)
+    Return
+        key (string): the hex digest of the mesh parameters, or None if the input file has no [Mesh] block
+    """
+    root = pyhit.load(run_file)
+    mesh = get_mesh_node(root)
+    if mesh is None:
+        return None
+    text = mesh.render()
+    for name, value in root.params():
+        text = text.replace('${' + name + '}', str(value))
+    digest = hashlib.sha256(text.encode())
+    if executable:
+        update_executable(digest, executable)
+    return digest.hexdigest()
+
+
+def use_mesh_file(run_file: str, mesh_file: str):
+    """
+    Replaces the mesh generators of the [Mesh] block of an input file with a FileMeshGenerator that reads a mesh
+    file. The other parameters of the block e.g. uniform_refine or parallel_type are kept
+    Args
+        run_file (string): the input file
+        mesh_file (string): the mesh file, relative to the directory MOOSE runs the input file in
+    """
+    root = pyhit.load(run_file)
+    mesh = get_mesh_node(root)
+    parameters = dict(mesh.params())
+    for name in parameters:
+        # The legacy syntax sets the type of the mesh and its generation parameters on the block itself
+        is_generation_parameter = 'type' in parameters and name not in MESH_PARAMETERS
+        if is_generation_parameter or name == 'final_generator':
+            mesh.removeParam(name)
+    for generator in [child for child in mesh.children if child.name not in MESH_SUB_BLOCKS]:
+        generator.remove()
+    mesh.append('file', type='FileMeshGenerator', file=mesh_file)
+    pyhit.write(run_file, root)
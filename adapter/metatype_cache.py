@@ -0,0 +1,200 @@
+# Copyright 2021, Battelle Energy Alliance, LLC
+
+# Python Packages
+import time
+import logging
+import threading
+import numpy as np
+import pandas as pd
+import deep_lynx
+
+# Data types of metatype keys that are validated locally, other data types are validated by Deep Lynx
+NUMBER_TYPES = ('number', 'number64', 'float', 'float64')
+LOCAL_TYPES = NUMBER_TYPES + ('string', 'boolean', 'date', 'enumeration', 'list')
+
+
+class MetatypeRegistry:
+    """
+    A cache of the property schemas of the metatypes of a Deep Lynx container
+
+    The schema of a metatype is loaded with its keys in a single request the first time it is used, and again once it
+    is older than ttl_seconds. Only schemas that were loaded are cached, so a failed request or a metatype that does
+    not exist yet is requested again on its next use
+    """
+
+    def __init__(self, api_client: deep_lynx.ApiClient, container_id: str, ttl_seconds: float = 3600):
+        """
+        Args
+            api_client (deep_lynx.ApiClient): deep lynx api client
+            container_id (string): the container of the metatypes
+            ttl_seconds (float): the number of seconds a schema is used before it is loaded again
+        """
+        self.api_client = api_client
+        self.container_id = container_id
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._schemas = dict()
+        self._lock = threading.Lock()
+
+    def get(self, name: str):
+        """
+        Args
+            name (string): the name of a metatype
+        Return
+            schema (dictionary): the id of the metatype and its keys by property name e.g.
+                {'id': '1', 'keys': {'temperature': {'data_type': 'number', 'required': True, 'options': None,
+                'regex': None, 'min': None, 'max': None}}}, or None if the schema could not be loaded
+        """
+        with self._lock:
+            loaded, schema = self._schemas.get(name, (None, None))
+            if loaded is not None and time.monotonic() - loaded < self.ttl_seconds:
+                self.hits += 1
+                return schema
+            self.misses += 1
+        # Load outside of the lock, so the schemas of other metatypes are not blocked by a slow request
+        schema = self._load(name)
+        if schema is not None:
+            with self._lock:
+                self._schemas[name] = (time.monotonic(), schema)
+        return schema
+
+    def invalidate(self, name: str = None):
+        """
+        Args
+            name (string): the metatype whose schema is loaded again on its next use, None for every metatype
+        """
+        with self._lock:
+            if name is None:
+                self._schemas.clear()
+            else:
+                self._schemas.pop(name, None)
+
+    def stats(self):
+        """
+        Return
+            stats (dictionary): the number of cached schemas, and the number of cache hits and misses
+        """
+        with self._lock:
+            return {'size': len(self._schemas), 'hits': self.hits, 'misses': self.misses}
+
+    def _load(self, name: str):
+        metatypes_api = deep_lynx.MetatypesApi(self.api_client)
+        try:
+            metatypes = metatypes_api.list_metatypes(self.container_id, name=name, load_keys='true')
+        except deep_lynx.rest.ApiException as error:
+            logging.error('Could not list the metatype %s: %s', name, error)
+            return None
+        if metatypes.is_error:
+            logging.error('Could not list the metatype %s', name)
+            return None
+        # The name filter of Deep Lynx also matches other names that contain the name
+        for metatype in metatypes.value:
+            if metatype.name == name:
+                keys = {key.property_name: get_key_schema(key) for key in metatype.keys or []}
+                return {'id': metatype.id, 'keys': keys}
+        logging.error('Metatype %s not found', name)
+        return None
+
+
+def get_key_schema(key):
+    """
+    Args
+        key (deep_lynx.MetatypeKey): a key of a metatype
+    Return
+        key_schema (dictionary): the data type, whether it is required, the options, and the validation of the key
+    """
+    validation = key.validation
+    return {
+        'data_type': key.data_type,
+        'required': bool(key.required),
+        'options': key.options,
+        'regex': validation.regex if validation is not None else None,
+        'min': validation.min if validation is not None else None,
+        'max': validation.max if validation is not None else None
+    }
+
+
+def is_local(schema: dict):
+    """
+    Args
+        schema (dictionary): the schema of a metatype returned by MetatypeRegistry.get
+    Return
+        True: if every key of the metatype can be validated locally
+        False: otherwise
+    """
+    return all(key_schema['data_type'] in LOCAL_TYPES for key_schema in schema['keys'].values())
+
+
+def validate_nodes(metatype: str, schema: dict, nodes: list):
+    """
+    Validates the properties of a batch of nodes against the schema of their metatype, one key at a time for every
+    node at once
+    Args
+        metatype (string): the name of the metatype
+        schema (dictionary): the schema of the metatype returned by MetatypeRegistry.get
+        nodes (list): the properties of each node
+    Return
+        errors (list): a message for each invalid property of a node
+    """
+    errors = list()
+    if not nodes:
+        return errors
+    properties = pd.DataFrame.from_records(nodes)
+    for property_name, key_schema in schema['keys'].items():
+        if property_name not in properties.columns:
+            if key_schema['required']:
+                errors.append('{0}: property {1} is required but missing from every node'.format(
+                    metatype, property_name))
+            continue
+        values = properties[property_name]
+        is_missing = values.isnull().to_numpy()
+        is_invalid = is_missing & key_schema['required']
+        is_invalid |= ~is_missing & ~is_valid_value(values, key_schema)
+        for index in np.flatnonzero(is_invalid):
+            errors.append('{0}: node {1} has an invalid value of property {2}: {3}'.format(
+                metatype, index, property_name, values.iloc[index]))
+    return errors
+
+
+def is_valid_value(values: pd.Series, key_schema: dict):
+    """
+    Args
+        values (Series): the values of a property of every node
+        key_schema (dictionary): the schema of the property
+    Return
+        is_valid (ndarray): whether each value is valid, missing values are validated by validate_nodes
+    """
+    data_type = key_schema['data_type']
+    is_valid = np.ones(values.shape[0], dtype=bool)
+    if data_type in NUMBER_TYPES:
+        is_bool = values.map(lambda value: isinstance(value, bool)).to_numpy(dtype=bool)
+        numbers = pd.to_numeric(values.where(~is_bool), errors='coerce')
+        is_valid = numbers.notnull().to_numpy()
+        if data_type in ('number', 'number64'):
+            is_valid = is_valid & (numbers.fillna(0) % 1 == 0).to_numpy()
+        if key_schema['min'] is not None:
+            is_valid = is_valid & (numbers.fillna(key_schema['min']) >= key_schema['min']).to_numpy()
+        if key_schema['max'] is not None:
+            is_valid = is_valid & (numbers.fillna(key_schema['max']) <= key_schema['max']).to_numpy()
+    elif data_type == 'boolean':
+        is_valid = values.map(lambda value: isinstance(value, (bool, np.bool_))).to_numpy(dtype=bool)
+    elif data_type == 'date':
+        is_string = values.map(lambda value: isinstance(value, str)).to_numpy(dtype=bool)
+        # pandas 2 parses every value in the format of the first value unless the format is mixed
+        options = {'format': 'mixed'} if int(pd.__version__.split('.')[0]) >= 2 else dict()
+        is_valid = pd.to_datetime(values.where(is_string), errors='coerce', **options).notnull().to_numpy()
+    elif data_type == 'enumeration':
+        is_valid = values.isin(key_schema['options'] or []).to_numpy()
+    elif data_type == 'list':
+        is_valid = values.map(lambda value: isinstance(value, list)).to_numpy(dtype=bool)
+    elif data_type == 'string':
+        is_valid = values.map(lambda value: isinstance(value, str)).to_numpy(dtype=bool)
+        lengths = values.where(is_valid, '').str.len()
+        if key_schema['min'] is not None:
+            is_valid = is_valid & (lengths >= key_schema['min']).to_numpy()
+        if key_schema['max'] is not None:
+            is_valid = is_valid & (lengths <= key_schema['max']).to_numpy()
+    if key_schema['regex']:
+        is_valid = is_valid & values.astype(str).str.contains(key_schema['regex'], regex=True).to_numpy(dtype=bool)
+    return is_valid
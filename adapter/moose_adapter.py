@@ -5,6 +5,10 @@ import os
 import logging
 import datetime
 import time
+import json
+import shutil
+import functools
+import threading
 import pandas as pd
 import deep_lynx
 
@@ -12,37 +16,323 @@ import deep_lynx
 import settings
 import utils
 import adapter
+from . import edit_input_file, template_parser, sweep, multiapp_batch, mesh_reuse, warm_start, moose_process, post_processor, output_format
 from .deep_lynx_import import import_to_deep_lynx
+from .pipeline import Pipeline, Stage
 
-# MOOSE Modules
-import mooseutils
 
-
-def run_input_file():
+def run_input_file(run_file: str = None, work_directory: str = None, mpi_ranks: int = 1, arguments: list = None):
     """
     Runs the input file in MOOSE
+    Args
+        run_file (string): the input file to run (defaults to RUN_FILE_NAME)
+        work_directory (string): the directory MOOSE runs in, which relative output paths are written to (optional)
+        mpi_ranks (integer): the number of MPI ranks, 1 to run without mpiexec
+        arguments (list): additional command line arguments of MOOSE e.g. ['--mesh-only', 'mesh.e'] (optional)
     """
+    run_file = run_file or os.getenv("RUN_FILE_NAME")
     # Validate paths exist
     moose_opt_path = os.path.expanduser(os.getenv("MOOSE_OPT_PATH"))
-    utils.validate_paths_exist(moose_opt_path, os.getenv("RUN_FILE_NAME"))
+    utils.validate_paths_exist(moose_opt_path, run_file)
     # Run input file in MOOSE
-    return_code = mooseutils.run_executable(moose_opt_path, '-i', os.getenv("RUN_FILE_NAME"))
-    if return_code != 0:
+    command = [moose_opt_path, '-i', os.path.abspath(run_file)] + (arguments or list())
+    if mpi_ranks > 1:
+        command = ['mpiexec', '-n', str(mpi_ranks)] + command
+    return_code, usage = moose_process.run_process(command,
+                                                   cwd=work_directory,
+                                                   timeout=float(os.getenv("MOOSE_TIMEOUT_SECONDS", 0)),
+                                                   memory_bytes=int(os.getenv("MOOSE_MEMORY_LIMIT_BYTES", 0)),
+                                                   cpu_seconds=int(os.getenv("MOOSE_CPU_LIMIT_SECONDS", 0)),
+                                                   grace_seconds=float(os.getenv("MOOSE_KILL_GRACE_SECONDS", 10)))
+    if adapter.resource_usage is not None:
+        adapter.resource_usage.record(run_file, usage)
+    if usage['timed_out']:
+        logging.error('Fail: MOOSE run %s was killed after %s seconds', run_file, os.getenv("MOOSE_TIMEOUT_SECONDS"))
+    elif return_code != 0:
         logging.error('Fail: Could not run MOOSE')
     else:
-        logging.info('Success: The MOOSE Adapter used the MOOSE input file %s to generate the output file %s',
-                     os.getenv('RUN_FILE_NAME'), os.getenv('IMPORT_FILE_NAME'))
+        logging.info('Success: The MOOSE Adapter used the MOOSE input file %s to generate the output file %s', run_file,
+                     os.getenv('IMPORT_FILE_NAME'))
         return True
     return False
 
 
-def create_output_file():
+def create_output_file(import_file: str = None, work_directory: str = None):
     """
     Parses the file(s) produced by the MOOSE executable into an output file to send back to Deep Lynx
+    Args
+        import_file (string): the output file (defaults to IMPORT_FILE_NAME)
+        work_directory (string): the directory of the files produced by MOOSE (defaults to the current directory)
+    Return
+        rows (integer): the number of rows of results written to the output file
+    """
+    # Stream the outputs selected by POST_PROCESS_CONFIG_FILE_NAME to the output file
+    return post_processor.main(work_directory or os.getcwd(), import_file or os.getenv("IMPORT_FILE_NAME"))
+
+
+def create_run(queue_df: pd.DataFrame, variants: list, json_data: list):
+    """
+    Creates the state of a run that is passed through the stages of the pipeline. A sweep runs each of its variants
+    in a work directory inside the work directory of the run
+    Args
+        queue_df (DataFrame): the queue
+        variants (list): an array of json_data, the parameters of each variant of the run
+        json_data (list): the parameters from the queue that the variants were expanded from
+    Return
+        run (dictionary): the state of the run
+    """
+    work_directory = adapter.run_executor.create_work_directory()
+    # The import file has the extension of OUTPUT_FORMAT e.g. 'import_file.parquet'
+    import_file_name = output_format.get_file_name(os.path.basename(os.getenv("IMPORT_FILE_NAME")),
+                                                   output_format.get_output_format())
+    run = {
+        "queue_df": queue_df,
+        "json_data": json_data,
+        "work_directory": work_directory,
+        "import_file": os.path.join(work_directory, import_file_name),
+        "variants": list(),
+        "batches": list(),
+        # Set once the post-process stage finished, so the upload does not wait for an import file that never comes
+        "outputs_ready": threading.Event()
+    }
+    for index, json_data in enumerate(variants):
+        variant_directory = work_directory
+        if len(variants) > 1:
+            variant_directory = os.path.join(work_directory, 'variant-{:04d}'.format(index))
+            os.makedirs(variant_directory)
+        variant = {
+            "json_data": json_data,
+            "work_directory": variant_directory,
+            "query_file": os.path.join(variant_directory, os.path.basename(os.getenv("QUERY_FILE_NAME"))),
+            "run_file": os.path.join(variant_directory, os.path.basename(os.getenv("RUN_FILE_NAME"))),
+            "import_file": os.path.join(variant_directory, import_file_name),
+            "cache_key": None,
+            "is_cached": False,
+            "checkpoint_key": None
+        }
+        run["variants"].append(variant)
+    return run
+
+
+def render_run(run: dict):
+    """
+    Stage of the pipeline that writes the query file and updates the input file of each variant of a run
+    Args
+        run (dictionary): the state of the run
+    """
+    for index, variant in enumerate(run["variants"]):
+        # Write csv
+        if index == 0:
+            run["queue_df"].to_csv(variant["query_file"], index=False)
+        else:
+            shutil.copyfile(run["variants"][0]["query_file"], variant["query_file"])
+
+        # Update input file
+        edit_input_file.modify_input_file(variant["json_data"], variant["run_file"])
+
+        # Reuse the results of a previous run with identical inputs
+        if adapter.result_cache is not None:
+            variant["cache_key"] = adapter.result_cache.get_key(variant["run_file"],
+                                                                variant["query_file"],
+                                                                executable=os.getenv("MOOSE_OPT_PATH"))
+            variant["is_cached"] = adapter.result_cache.get(
+                variant["cache_key"], {os.path.basename(variant["import_file"]): variant["import_file"]})
+
+        # Find compatible checkpoints by the mesh parameters, before the [Mesh] block is replaced by a mesh file
+        if adapter.checkpoint_store is not None and not variant["is_cached"] and is_warm_start_enabled():
+            variant["checkpoint_key"] = adapter.checkpoint_store.get_key(os.getenv("TEMPLATE_INPUT_FILE_NAME"),
+                                                                         mesh_reuse.get_mesh_key(variant["run_file"]))
+
+        # Read the mesh from a file when the mesh parameters match a previous run
+        if adapter.mesh_cache is not None and not variant["is_cached"]:
+            reuse_mesh(variant)
+
+        # Start the run from the newest compatible checkpoint, and write a checkpoint for later runs
+        if variant["checkpoint_key"] is not None:
+            warm_start_run(variant)
+    # Release the queue copy, it is no longer needed by later stages
+    run["queue_df"] = None
+
+    # Solve the variants that were not cached as the sub-apps of master input files, one MOOSE process per batch
+    indices = [index for index, variant in enumerate(run["variants"]) if not variant["is_cached"]]
+    if adapter.env.bool("MULTIAPP_BATCH", False) and len(indices) > 1:
+        # Sub-apps may resolve relative paths from the work directory of the master input file
+        shutil.copyfile(run["variants"][0]["query_file"],
+                        os.path.join(run["work_directory"], os.path.basename(os.getenv("QUERY_FILE_NAME"))))
+        for number, batch in enumerate(multiapp_batch.create_batches(indices, int(os.getenv("MULTIAPP_MAX_APPS", 0)))):
+            master_file = os.path.join(run["work_directory"], 'batch-{:04d}.i'.format(number))
+            multiapp_batch.write_master_input_file(master_file, [run["variants"][index]["run_file"] for index in batch],
+                                                   run["work_directory"])
+            run["batches"].append(master_file)
+
+
+def reuse_mesh(variant: dict):
+    """
+    Replaces the [Mesh] block of the input file of a variant with the cached mesh of its mesh parameters. A mesh that
+    is not cached is generated once with --mesh-only
+    Args
+        variant (dictionary): the state of the variant
+    """
+    key = mesh_reuse.get_mesh_key(variant["run_file"], executable=os.getenv("MOOSE_OPT_PATH"))
+    if key is None:
+        return
+    mesh_file = os.path.join(variant["work_directory"], mesh_reuse.MESH_FILE_NAME)
+    if not adapter.mesh_cache.get(key, {'mesh': mesh_file}):
+        if not adapter.run_executor.run(run_input_file, variant["run_file"], variant["work_directory"], 1,
+                                        ['--mesh-only', mesh_reuse.MESH_FILE_NAME]):
+            logging.error('Fail: Could not generate the mesh of %s, the run generates its own mesh',
+                          variant["run_file"])
+            return
+        adapter.mesh_cache.put(key, {'mesh': mesh_file})
+    mesh_reuse.use_mesh_file(variant["run_file"], mesh_reuse.MESH_FILE_NAME)
+
+
+def is_warm_start_enabled():
     """
-    results = pd.DataFrame()
-    # Write the MOOSE results to csv file
-    results.to_csv(os.getenv("IMPORT_FILE_NAME"), index=False)
+    Return
+        True: if warm-start is enabled for the template input file
+        False: if the template input file is listed in WARM_START_DISABLED_TEMPLATES
+    """
+    disabled_templates = json.loads(os.getenv("WARM_START_DISABLED_TEMPLATES") or "[]")
+    template = os.path.normpath(os.getenv("TEMPLATE_INPUT_FILE_NAME"))
+    return template not in [os.path.normpath(disabled_template) for disabled_template in disabled_templates]
+
+
+def warm_start_run(variant: dict):
+    """
+    Enables the checkpoint output of the input file of a variant, and starts it from the newest compatible checkpoint
+    Args
+        variant (dictionary): the state of the variant
+    """
+    restart_directory = os.path.join(variant["work_directory"], warm_start.RESTART_DIRECTORY_NAME)
+    restart_file_base = None
+    if adapter.checkpoint_store.get(variant["checkpoint_key"], restart_directory):
+        # Absolute, since the sub-apps of a MultiApp batch resolve relative paths from the master input file
+        restart_file_base = os.path.join(os.path.abspath(restart_directory), 'LATEST')
+    warm_start.enable_checkpoint(variant["run_file"], restart_file_base)
+
+
+def simulate_run(run: dict):
+    """
+    Stage of the pipeline that runs the input file of each variant of a run in MOOSE, the variants in parallel
+    Args
+        run (dictionary): the state of the run
+    Return
+        True: if MOOSE succeeded or the results were cached for every variant
+        False: otherwise
+    """
+    start = time.time()
+    if run["batches"]:
+        futures = [
+            adapter.run_executor.submit(run_input_file, master_file, run["work_directory"],
+                                        adapter.run_executor.mpi_ranks) for master_file in run["batches"]
+        ]
+    else:
+        futures = [
+            adapter.run_executor.submit(run_input_file, variant["run_file"], variant["work_directory"],
+                                        adapter.run_executor.mpi_ranks) for variant in run["variants"]
+            if not variant["is_cached"]
+        ]
+    is_run = all([future.result() for future in futures])
+    end = time.time()
+    print(end - start)
+    return is_run
+
+
+def post_process_run(run: dict):
+    """
+    Stage of the pipeline that creates the import file of a run, combining the results of the variants of a sweep
+    Args
+        run (dictionary): the state of the run
+    Return
+        False: if the outputs of a variant had no results, so an empty import file is not uploaded
+    """
+    try:
+        for variant in run["variants"]:
+            if variant["is_cached"]:
+                continue
+            if create_output_file(variant["import_file"], variant["work_directory"]) == 0:
+                logging.error('Fail: MOOSE run in %s had no results to import', variant["work_directory"])
+                return False
+            if variant["cache_key"] is not None:
+                adapter.result_cache.put(variant["cache_key"],
+                                         {os.path.basename(variant["import_file"]): variant["import_file"]})
+            if variant["checkpoint_key"] is not None:
+                checkpoint_directory = warm_start.find_checkpoint_directory(variant["work_directory"])
+                if checkpoint_directory is not None:
+                    adapter.checkpoint_store.put(variant["checkpoint_key"], checkpoint_directory)
+        if len(run["variants"]) > 1:
+            sweep.aggregate_results(run["variants"], run["import_file"],
+                                    int(os.getenv("POST_PROCESS_CHUNK_SIZE", 100000)))
+    finally:
+        run["outputs_ready"].set()
+
+
+def upload_run(run: dict):
+    """
+    Stage of the pipeline that imports the results of a run into Deep Lynx
+    Args
+        run (dictionary): the state of the run
+    Return
+        True: if the results were imported into Deep Lynx
+        False: otherwise
+    """
+    # Import the results to deep lynx
+    print("Begin import to deep lynx")
+    upload = functools.partial(import_to_deep_lynx, done=run["outputs_ready"])
+    if adapter.delta_uploader is not None:
+        # Upload only the results that changed since the last upload
+        is_imported = adapter.delta_uploader.upload(run["import_file"], upload)
+    else:
+        is_imported = upload(run["import_file"])
+    print("Deep Lynx Import", is_imported)
+    return is_imported
+
+
+def complete_run(run: dict, is_success: bool):
+    """
+    Cleans up a run after the last stage of the pipeline
+    Args
+        run (dictionary): the state of the run
+        is_success (boolean): whether every stage of the run succeeded
+    """
+    # Record the outcome of the run, so the parameters of a failed run are not skipped as unchanged
+    adapter.change_detector.complete(run["json_data"], is_success)
+    # File cleanup
+    if is_success:
+        adapter.run_executor.cleanup(run["work_directory"])
+    else:
+        logging.error('Fail: MOOSE run in %s was not imported into Deep Lynx', run["work_directory"])
+
+
+def create_pipeline():
+    """
+    Creates the pipeline of the render, simulate, post-process, and upload stages of a run
+    Return
+        pipeline (Pipeline): the pipeline
+    """
+    stages = [
+        Stage("render", render_run, int(os.getenv("PIPELINE_RENDER_WORKERS", 1))),
+        Stage("simulate", simulate_run,
+              int(os.getenv("PIPELINE_SIMULATE_WORKERS", 0)) or adapter.run_executor.max_runs),
+        Stage("post_process", post_process_run, int(os.getenv("PIPELINE_POST_PROCESS_WORKERS", 1))),
+        Stage("upload", upload_run, int(os.getenv("PIPELINE_UPLOAD_WORKERS", 1)))
+    ]
+    return Pipeline(stages, int(os.getenv("PIPELINE_QUEUE_DEPTH", 1)), on_complete=complete_run)
+
+
+def create_config_file():
+    """
+    Generates the configuration file of the template input file. The command-line interface of the template parser is
+    not used, as its arguments would be parsed from those of the Flask process e.g. the host of 'flask run -h'
+    Return
+        True: if the configuration file was written
+        False: otherwise
+    """
+    input_file = os.getenv("TEMPLATE_INPUT_FILE_NAME")
+    utils.validate_paths_exist(input_file)
+    config_params = template_parser.get_config_parameters(input_file)
+    return template_parser.write_config_file(config_params, template_parser.get_config_file_name())
 
 
 def main():
@@ -54,53 +344,50 @@ def main():
 
     logging.info('MOOSE Adapter started. Using input file %s and configuration file %s',
                  os.getenv('TEMPLATE_INPUT_FILE_NAME'), os.getenv('CONFIG_FILE_NAME'))
-    done = False
-    while not done:
-        if os.path.exists(os.getenv("QUEUE_FILE_NAME")) and adapter.new_data:
-            # Apply a lock
-            with adapter.lock_:
-                adapter.new_data = False
-                # Read master queue file
-                queue_df = pd.read_csv(os.getenv("QUEUE_FILE_NAME"))
-            # Only execute if queue reaches optimal length
-            if queue_df.shape[0] == int(os.getenv("QUEUE_LENGTH")):
-
-                # TODO: Change to customized name
-                query_file_name = None
-                import_file_name = None
-
-                #Set environment variables
-                os.environ["QUERY_FILE_NAME"] = query_file_name
-                os.environ["IMPORT_FILE_NAME"] = import_file_name
-
-                # Write csv
-                queue_df.to_csv(query_file_name, index=False)
-
-                # TODO: Update input file by calling edit_input_file.py
-
-                # Run MOOSE
-                start = time.time()
-                is_run = run_input_file()
-                end = time.time()
-                print(end - start)
-
-                if is_run:
-                    create_output_file()
-                    # Import the results to deep lynx
-                    print("Begin import to deep lynx")
-                    is_imported = import_to_deep_lynx(os.getenv("IMPORT_FILE_NAME"))
-                    print("Deep Lynx Import", is_imported)
-
-                # File cleanup
-                if is_run and is_imported:
-                    if os.path.exists(os.getenv("QUERY_FILE_NAME")):
-                        os.remove(os.getenv("QUERY_FILE_NAME"))
-                    if os.path.exists(os.getenv("IMPORT_FILE_NAME")):
-                        os.remove(os.getenv("IMPORT_FILE_NAME"))
-                    if os.path.exists("data/sphere_csv.csv"):
-                        os.remove("data/sphere_csv.csv")
-                    if os.path.exists("data/sphere_out.e"):
-                        os.remove("data/sphere_out.e")
+    # Generate the configuration file of the template input file
+    create_config_file()
+    config = edit_input_file.read_config()
+    sweep_mode = sweep.get_sweep_mode()
+    pipeline = create_pipeline()
+    pipeline.start()
+
+    while True:
+        # Wait for room in the pipeline, so new data is coalesced into the next snapshot while it is full
+        pipeline.wait_for_slot()
+
+        # Sleep until new data meets the run trigger
+        with adapter.lock_:
+            if not adapter.scheduler.wait():
+                break
+            # Copy the in-memory queue
+            queue_df = adapter.queue_buffer.to_dataframe()
+
+        # Skip the run if a parameter from the queue is missing or is not a value of its datatype
+        try:
+            json_data = edit_input_file.get_json_data(queue_df, config)
+        except ValueError as error:
+            logging.error('Skipped MOOSE run: %s', error)
+            continue
+
+        # Skip the run if the parameters from the queue did not change beyond their tolerances
+        if not adapter.change_detector.has_changed(json_data, config):
+            logging.info('Skipped MOOSE run: the parameters did not change beyond their tolerances')
+            continue
+
+        # Validate the parameters before the run is scheduled
+        if not edit_input_file.validate_changes_to_input_file(json_data):
+            logging.error('Skipped MOOSE run: the parameters from the queue are not valid')
+            continue
+        adapter.change_detector.update(json_data)
+
+        # Expand the run into the variants of a sweep
+        variants = sweep.create_variants(json_data, config, sweep_mode, int(os.getenv("SWEEP_LEVELS", 3)),
+                                         int(os.getenv("SWEEP_SAMPLES", 10)))
+        if len(variants) > 1:
+            logging.info('Sweep of %s variants scheduled', len(variants))
+
+        # Render, run, post-process, and upload the run in the pipeline, in its own work directory
+        pipeline.submit(create_run(queue_df, variants, json_data))
 
 
 if __name__ == '__main__':
@@ -0,0 +1,181 @@
+# Copyright 2021, Battelle Energy Alliance, LLC
+
+# Python Packages
+import os
+import csv
+import time
+import sys
+import signal
+import logging
+import threading
+import subprocess
+
+# Columns of the resource usage file
+USAGE_COLUMNS = ('finished', 'run_file', 'return_code', 'timed_out', 'wall_seconds', 'cpu_seconds', 'max_rss_bytes')
+# Sets the resource limits given as arguments and executes the rest of the arguments in the same process. A command
+# that cannot be executed exits with 127, as in a shell
+SET_LIMITS = '''
+import os, sys, resource
+memory_bytes, cpu_seconds = int(sys.argv[1]), int(sys.argv[2])
+if memory_bytes:
+    resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+if cpu_seconds:
+    resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds))
+try:
+    os.execvp(sys.argv[3], sys.argv[3:])
+except OSError as error:
+    sys.stderr.write('{0}: {1}\\n'.format(sys.argv[3], error))
+    sys.exit(127)
+'''
+
+
+def get_limited_command(command: list, memory_bytes: int = None, cpu_seconds: int = None):
+    """
+    Wraps a command so its resource limits are set before it is executed, and are inherited by the processes it
+    starts e.g. MPI ranks. The limits are set by a Python process that replaces itself with the command, instead of in
+    preexec_fn of subprocess.Popen, which is not safe with threads
+    Args
+        command (list): the command and its arguments
+        memory_bytes (integer): the maximum size of the address space of each process (optional)
+        cpu_seconds (integer): the maximum CPU time of each process, after which it receives SIGXCPU (optional)
+    Return
+        command (list): the command that sets the resource limits and executes the command
+    """
+    if not memory_bytes and not cpu_seconds:
+        return command
+    return [sys.executable, '-c', SET_LIMITS, str(memory_bytes or 0), str(cpu_seconds or 0)] + list(command)
+
+
+def kill_process_group(process: subprocess.Popen, exited: threading.Event, expired: threading.Event,
+                       grace_seconds: float):
+    """
+    Asks the process group of a process to terminate, and kills it if it is still running after a grace period
+    Args
+        process (Popen): the leader of the process group
+        exited (Event): set once the leader exited
+        expired (Event): set when the timeout expired
+        grace_seconds (float): the number of seconds between SIGTERM and SIGKILL
+    """
+    if exited.is_set():
+        return
+    expired.set()
+    try:
+        os.killpg(process.pid, signal.SIGTERM)
+    except ProcessLookupError:
+        return
+    if not exited.wait(grace_seconds):
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+
+def run_process(command: list,
+                cwd: str = None,
+                timeout: float = None,
+                memory_bytes: int = None,
+                cpu_seconds: int = None,
+                grace_seconds: float = 10):
+    """
+    Runs a command in its own process group with resource limits and a wall-clock timeout. On timeout the whole
+    process group is killed, including the MPI ranks of mpiexec
+    Args
+        command (list): the command and its arguments
+        cwd (string): the directory the command runs in (optional)
+        timeout (float): the maximum number of seconds the command may run (optional)
+        memory_bytes (integer): the maximum size of the address space of each process (optional)
+        cpu_seconds (integer): the maximum CPU time of each process (optional)
+        grace_seconds (float): the number of seconds between SIGTERM and SIGKILL on timeout
+    Return
+        return_code (integer): the return code of the command, negative if it was killed by a signal
+        usage (dictionary): the resource usage of the command and the processes it waited for
+    """
+    start = time.time()
+    process = subprocess.Popen(get_limited_command(command, memory_bytes, cpu_seconds), cwd=cwd, start_new_session=True)
+    exited = threading.Event()
+    expired = threading.Event()
+    timer = None
+    if timeout:
+        timer = threading.Timer(timeout, kill_process_group, args=(process, exited, expired, grace_seconds))
+        timer.daemon = True
+        timer.start()
+    try:
+        pid, status, rusage = os.wait4(process.pid, 0)
+    finally:
+        exited.set()
+        if timer is not None:
+            timer.cancel()
+    # Negative return codes are the signal that killed the process, as in subprocess
+    process.returncode = -os.WTERMSIG(status) if os.WIFSIGNALED(status) else os.WEXITSTATUS(status)
+    timed_out = expired.is_set()
+    if timed_out:
+        # Kill the processes of the group that outlived the leader
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+    usage = {
+        'return_code': process.returncode,
+        'timed_out': timed_out,
+        'wall_seconds': time.time() - start,
+        'cpu_seconds': rusage.ru_utime + rusage.ru_stime,
+        # ru_maxrss is in kilobytes on Linux
+        'max_rss_bytes': rusage.ru_maxrss * 1024
+    }
+    return process.returncode, usage
+
+
+class UsageRecorder:
+    """
+    Records the resource usage of each MOOSE process to size the node and tune the number of concurrent runs
+    """
+
+    def __init__(self, file_name: str = None):
+        """
+        Args
+            file_name (string): the csv file that a row of resource usage is appended to for each process (optional)
+        """
+        self.file_name = file_name
+        self.runs = 0
+        self.timeouts = 0
+        self.max_rss_bytes = 0
+        self.cpu_seconds = 0.0
+        self.wall_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, run_file: str, usage: dict):
+        """
+        Args
+            run_file (string): the input file of the process
+            usage (dictionary): the resource usage returned by run_process
+        """
+        logging.info('MOOSE run %s used %.1f wall seconds, %.1f CPU seconds, and %d bytes of memory', run_file,
+                     usage['wall_seconds'], usage['cpu_seconds'], usage['max_rss_bytes'])
+        with self._lock:
+            self.runs += 1
+            self.timeouts += int(usage['timed_out'])
+            self.max_rss_bytes = max(self.max_rss_bytes, usage['max_rss_bytes'])
+            self.cpu_seconds += usage['cpu_seconds']
+            self.wall_seconds += usage['wall_seconds']
+            if self.file_name:
+                is_new = not os.path.exists(self.file_name)
+                with open(self.file_name, 'a', newline='') as usage_file:
+                    writer = csv.DictWriter(usage_file, fieldnames=USAGE_COLUMNS)
+                    if is_new:
+                        writer.writeheader()
+                    writer.writerow(dict(usage, finished=time.time(), run_file=run_file))
+
+    def stats(self):
+        """
+        Return
+            stats (dictionary): the number of runs and timeouts, the peak memory of a run, and the total CPU and wall
+                seconds of the runs
+        """
+        with self._lock:
+            return {
+                'runs': self.runs,
+                'timeouts': self.timeouts,
+                'max_rss_bytes': self.max_rss_bytes,
+                'cpu_seconds': self.cpu_seconds,
+                'wall_seconds': self.wall_seconds
+            }
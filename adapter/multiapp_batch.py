@@ -0,0 +1,87 @@
+# Copyright 2021, Battelle Energy Alliance, LLC
+
+# Python Packages
+import os
+
+# MOOSE Modules
+import pyhit
+import moosetree
+
+# Name of the MultiApp block of a master input file
+MULTIAPP_NAME = 'variants'
+
+
+def create_batches(indices: list, max_apps: int = 0):
+    """
+    Splits the variants of a run into batches that each run as the sub-apps of a single MOOSE process
+    Args
+        indices (list): the indices of the variants to run
+        max_apps (integer): the maximum number of sub-apps of a batch, 0 for a single batch
+    Return
+        batches (list): an array of the indices of the variants of each batch
+    """
+    if max_apps <= 0:
+        max_apps = max(1, len(indices))
+    return [indices[start:start + max_apps] for start in range(0, len(indices), max_apps)]
+
+
+def get_output_file_base(run_file: str, work_directory: str):
+    """
+    Args
+        run_file (string): the input file of a sub-app
+        work_directory (string): the work directory of the master input file
+    Return
+        file_base (string): the output file base of the sub-app, the output file base MOOSE uses for the input file
+            when it runs on its own e.g. 'variant-0000/run_file_out'
+    """
+    base, extension = os.path.splitext(os.path.relpath(run_file, work_directory))
+    return base + '_out'
+
+
+def get_output_cli_args(run_file: str, work_directory: str):
+    """
+    Args
+        run_file (string): the input file of a sub-app
+        work_directory (string): the work directory of the master input file
+    Return
+        cli_args (list): the command line arguments of the sub-app that write its outputs next to its input file e.g.
+            ['Outputs/file_base=variant-0000/run_file_out', 'Outputs/out/file_base=variant-0000/output/run_out']. A
+            sub-block of [Outputs] with its own file_base overrides the file_base of [Outputs], so it is moved too
+    """
+    directory = os.path.relpath(os.path.dirname(run_file), work_directory)
+    cli_args = ['Outputs/file_base=' + get_output_file_base(run_file, work_directory)]
+    outputs = moosetree.find(pyhit.load(run_file), func=lambda node: node.fullpath == '/Outputs')
+    if outputs is None:
+        return cli_args
+    for output in outputs.children:
+        file_base = dict(output.params()).get('file_base')
+        if file_base is not None and not os.path.isabs(str(file_base)):
+            cli_args.append('Outputs/{0}/file_base={1}'.format(output.name, os.path.join(directory, str(file_base))))
+    return cli_args
+
+
+def write_master_input_file(master_file: str, run_files: list, work_directory: str):
+    """
+    Writes a master input file that solves each run file as a sub-app of a FullSolveMultiApp, so the batch pays the
+    startup cost of MOOSE once. The master input file has no variables of its own
+    Args
+        master_file (string): the master input file to write
+        run_files (list): the input file of each sub-app
+        work_directory (string): the directory MOOSE runs the master input file in
+    """
+    input_files = [os.path.relpath(run_file, work_directory) for run_file in run_files]
+    # Write the outputs of each sub-app next to its input file instead of prefixing them with the MultiApp name
+    cli_args = [' '.join(get_output_cli_args(run_file, work_directory)) for run_file in run_files]
+
+    root = pyhit.Node()
+    root.append('Problem', solve=False, kernel_coverage_check=False)
+    root.append('Mesh', type='GeneratedMesh', dim=1)
+    root.append('Executioner', type='Steady')
+    multiapps = root.append('MultiApps')
+    multiapps.append(MULTIAPP_NAME,
+                     type='FullSolveMultiApp',
+                     input_files=' '.join(input_files),
+                     positions=' '.join(['0 0 0'] * len(input_files)),
+                     cli_args=';'.join(cli_args),
+                     execute_on='initial')
+    pyhit.write(master_file, root)
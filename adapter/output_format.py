@@ -0,0 +1,164 @@
+# Copyright 2021, Battelle Energy Alliance, LLC
+
+# Python Packages
+import os
+import logging
+import pandas as pd
+
+# Optional Packages
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+# File extension of each output format
+OUTPUT_FORMATS = {'csv': '.csv', 'parquet': '.parquet', 'arrow': '.arrow'}
+
+
+def get_output_format():
+    """
+    Gets the output format selected by the OUTPUT_FORMAT environment variable. The columnar formats fall back to csv
+    when the pyarrow package is not installed
+    Return
+        output_format (string): 'csv', 'parquet', or 'arrow'
+    """
+    output_format = os.getenv("OUTPUT_FORMAT") or "csv"
+    if output_format not in OUTPUT_FORMATS:
+        error = 'Invalid OUTPUT_FORMAT: \'{0}\'. Use csv, parquet, or arrow'.format(output_format)
+        logging.error('{0}: {1}'.format('ValueError', error))
+        raise ValueError(error)
+    if output_format != 'csv' and pyarrow is None:
+        logging.warning('OUTPUT_FORMAT %s requires the pyarrow package, writing csv instead', output_format)
+        return 'csv'
+    return output_format
+
+
+def get_file_name(file_name: str, output_format: str):
+    """
+    Args
+        file_name (string): a file name e.g. 'import_file.csv'
+        output_format (string): the output format
+    Return
+        file_name (string): the file name with the extension of the output format e.g. 'import_file.parquet'
+    """
+    base, extension = os.path.splitext(file_name)
+    return base + OUTPUT_FORMATS[output_format]
+
+
+def get_output_format_of_file(file_name: str):
+    """
+    Args
+        file_name (string): a file written in an output format
+    Return
+        output_format (string): the output format of the file by its extension, csv for unknown extensions
+    """
+    extension = os.path.splitext(file_name)[1]
+    for output_format, output_extension in OUTPUT_FORMATS.items():
+        if extension == output_extension:
+            return output_format
+    return 'csv'
+
+
+class CsvWriter:
+    """
+    Appends chunks of rows to a csv file
+    """
+
+    def __init__(self, file_name: str):
+        self.file_name = file_name
+        self._file = open(file_name, 'w', newline='')
+        self._is_header = True
+
+    def write(self, chunk: pd.DataFrame):
+        chunk.to_csv(self._file, header=self._is_header, index=False)
+        self._is_header = False
+
+    def close(self):
+        self._file.close()
+
+
+class ArrowWriter:
+    """
+    Appends chunks of rows to a zstd compressed Parquet file or Arrow IPC file. The schema of the file is the schema
+    of the first chunk, and later chunks are cast to it
+    """
+
+    def __init__(self, file_name: str, output_format: str, schema=None, compression: str = 'zstd'):
+        """
+        Args
+            file_name (string): the file to write
+            output_format (string): 'parquet' or 'arrow'
+            schema (pyarrow.Schema): the schema of the file (defaults to the schema of the first chunk)
+            compression (string): the compression codec
+        """
+        self.file_name = file_name
+        self.output_format = output_format
+        self.schema = schema
+        self.compression = compression
+        self._writer = None
+        if schema is not None:
+            self._open()
+
+    def write(self, chunk: pd.DataFrame):
+        if self.schema is None:
+            self.schema = pyarrow.Schema.from_pandas(chunk, preserve_index=False)
+            self._open()
+        table = pyarrow.Table.from_pandas(chunk, schema=self.schema, preserve_index=False)
+        self._writer.write_table(table)
+
+    def close(self):
+        # Write a file without rows if no chunk was written
+        if self._writer is None:
+            self.schema = pyarrow.schema([])
+            self._open()
+        self._writer.close()
+
+    def _open(self):
+        if self.output_format == 'parquet':
+            self._writer = pyarrow.parquet.ParquetWriter(self.file_name, self.schema, compression=self.compression)
+        else:
+            options = pyarrow.ipc.IpcWriteOptions(compression=self.compression)
+            self._writer = pyarrow.ipc.new_file(self.file_name, self.schema, options=options)
+
+
+def create_writer(file_name: str, output_format: str = None, schema=None):
+    """
+    Args
+        file_name (string): the file to write
+        output_format (string): the output format (defaults to the output format of the file by its extension)
+        schema (pyarrow.Schema): the schema of a columnar file (optional)
+    Return
+        writer (CsvWriter or ArrowWriter): the writer of the file
+    """
+    output_format = output_format or get_output_format_of_file(file_name)
+    if output_format == 'csv':
+        return CsvWriter(file_name)
+    return ArrowWriter(file_name, output_format, schema)
+
+
+def read_chunks(file_name: str, chunk_size: int):
+    """
+    Reads a file written in an output format in chunks of rows
+    Args
+        file_name (string): the file to read
+        chunk_size (integer): the maximum number of rows read at once
+    Return
+        chunks (generator): DataFrames of the rows of the file
+    """
+    output_format = get_output_format_of_file(file_name)
+    if output_format == 'csv':
+        try:
+            yield from pd.read_csv(file_name, chunksize=chunk_size)
+        except pd.errors.EmptyDataError:
+            return
+    elif output_format == 'parquet':
+        for batch in pyarrow.parquet.ParquetFile(file_name).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        with pyarrow.ipc.open_file(file_name) as reader:
+            for index in range(reader.num_record_batches):
+                batch = reader.get_batch(index)
+                for start in range(0, batch.num_rows, chunk_size):
+                    yield batch.slice(start, chunk_size).to_pandas()
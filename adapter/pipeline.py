@@ -0,0 +1,133 @@
+# Copyright 2021, Battelle Energy Alliance, LLC
+
+# Python Packages
+import queue
+import logging
+import threading
+
+
+class Stage:
+    """
+    A step of the pipeline run by a number of worker threads that read from a bounded queue
+    """
+
+    def __init__(self, name: str, function, workers: int = 1):
+        """
+        Args
+            name (string): the name of the stage
+            function (callable): called with the item of each run, returns False to skip the later stages of the run
+            workers (integer): the number of worker threads of the stage
+        """
+        self.name = name
+        self.function = function
+        self.workers = max(1, workers)
+
+
+class Pipeline:
+    """
+    Passes runs through a sequence of stages that work concurrently, e.g. the upload of a run overlaps with the
+    simulation of the next run
+
+    Each stage reads from a bounded queue, and runs are handed to the next stage in the order they were submitted
+    even when a stage has several workers
+    """
+
+    def __init__(self, stages: list, queue_depth: int = 1, on_complete=None):
+        """
+        Args
+            stages (list): the stages of the pipeline, in order
+            queue_depth (integer): the maximum number of runs waiting in front of each stage
+            on_complete (callable): called with each item and whether every stage succeeded, in submission order
+        """
+        self.stages = stages
+        self.on_complete = on_complete
+        self._queues = [queue.Queue(maxsize=max(1, queue_depth)) for stage in stages]
+        # Runs finished by a stage but waiting for an earlier run, by stage index and sequence number
+        self._finished = [dict() for stage in stages]
+        self._next_sequence = [0 for stage in stages]
+        self._locks = [threading.Lock() for stage in stages]
+        self._sequence = 0
+        self._submit_lock = threading.Lock()
+        # Bounds the number of runs in the pipeline so new data is coalesced by the scheduler when it is full
+        self._slots = threading.BoundedSemaphore(
+            sum(stage.workers for stage in stages) + len(stages) * max(1, queue_depth))
+        self._threads = list()
+
+    def start(self):
+        """
+        Starts the worker threads of every stage
+        """
+        for index, stage in enumerate(self.stages):
+            for i in range(stage.workers):
+                thread = threading.Thread(target=self._work,
+                                          args=(index, ),
+                                          daemon=True,
+                                          name='{0}_stage_{1}'.format(stage.name, i))
+                self._threads.append(thread)
+                thread.start()
+
+    def wait_for_slot(self):
+        """
+        Blocks until a run can be submitted without waiting
+        """
+        self._slots.acquire()
+        self._slots.release()
+
+    def submit(self, item):
+        """
+        Adds a run to the first stage, blocking while the pipeline is full
+        Args
+            item (dictionary): the state of the run passed to every stage
+        """
+        self._slots.acquire()
+        with self._submit_lock:
+            sequence = self._sequence
+            self._sequence += 1
+            self._queues[0].put((sequence, item, True))
+
+    def _work(self, index: int):
+        """
+        Runs the function of a stage on each run of its queue
+        Args
+            index (integer): the index of the stage
+        """
+        stage = self.stages[index]
+        while True:
+            sequence, item, is_success = self._queues[index].get()
+            # Runs that failed an earlier stage are passed through to keep the order
+            if is_success:
+                try:
+                    is_success = stage.function(item) is not False
+                except Exception:
+                    logging.exception('Stage %s of the pipeline failed', stage.name)
+                    is_success = False
+            self._emit(index, sequence, item, is_success)
+
+    def _emit(self, index: int, sequence: int, item, is_success: bool):
+        """
+        Hands the finished runs of a stage to the next stage in submission order
+        Args
+            index (integer): the index of the stage
+            sequence (integer): the sequence number of the finished run
+            item (dictionary): the state of the finished run
+            is_success (boolean): whether every stage of the run succeeded so far
+        """
+        with self._locks[index]:
+            self._finished[index][sequence] = (item, is_success)
+            while self._next_sequence[index] in self._finished[index]:
+                next_sequence = self._next_sequence[index]
+                next_item, next_is_success = self._finished[index].pop(next_sequence)
+                self._next_sequence[index] += 1
+                if index + 1 < len(self.stages):
+                    self._queues[index + 1].put((next_sequence, next_item, next_is_success))
+                else:
+                    self._complete(next_item, next_is_success)
+
+    def _complete(self, item, is_success: bool):
+        try:
+            if self.on_complete is not None:
+                self.on_complete(item, is_success)
+        except Exception:
+            logging.exception('Completion of a pipeline run failed')
+        finally:
+            self._slots.release()
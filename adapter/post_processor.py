@@ -0,0 +1,251 @@
+# Copyright 2021, Battelle Energy Alliance, LLC
+
+# Python Packages
+import os
+import re
+import glob
+import json
+import logging
+import numpy as np
+import pandas as pd
+
+# Repository Modules
+from . import output_format
+
+# Optional Packages
+try:
+    import netCDF4
+except ImportError:
+    netCDF4 = None
+
+# Columns of the import file, one row per value of a variable
+OUTPUT_COLUMNS = ['source', 'variable', 'time_step', 'time', 'index', 'value']
+
+# Names of the Exodus II variables of each type of variable
+EXODUS_TYPES = {
+    'nodal': ('name_nod_var', 'vals_nod_var{0}'),
+    'elemental': ('name_elem_var', 'vals_elem_var{0}eb{1}'),
+    'global': ('name_glo_var', 'vals_glo_var')
+}
+
+
+def read_config(config_file: str = None):
+    """
+    Reads the declarative configuration of the outputs of a run that are written to the import file e.g.
+    {"exodus": [{"file": "run_file_out.e", "type": "nodal", "variables": ["u"], "time_steps": "last"}],
+     "csv": [{"file": "run_file_out_temp_line_*.csv", "columns": ["x", "temperature"], "time_steps": "all"}]}
+    Args
+        config_file (string): the json configuration file (defaults to POST_PROCESS_CONFIG_FILE_NAME)
+    Return
+        config (dictionary): the configuration, empty if no configuration file is set
+    """
+    config_file = config_file or os.getenv("POST_PROCESS_CONFIG_FILE_NAME")
+    if not config_file:
+        return dict()
+    with open(config_file, 'r') as json_file:
+        return json.load(json_file)
+
+
+def select_time_steps(number_of_time_steps: int, time_steps='all'):
+    """
+    Args
+        number_of_time_steps (integer): the number of time steps of an output
+        time_steps (string or list): 'all', 'last', or a list of time step indices, negative from the last time step
+    Return
+        time_steps (list): the selected time step indices
+    """
+    if time_steps == 'all':
+        return list(range(number_of_time_steps))
+    if time_steps == 'last':
+        time_steps = [-1]
+    return sorted(
+        set(index % number_of_time_steps for index in time_steps
+            if -number_of_time_steps <= index < number_of_time_steps))
+
+
+def read_exodus(file_name: str, source: dict, chunk_size: int):
+    """
+    Reads the variables of an Exodus II file one time step and chunk of nodes or elements at a time, so the memory
+    used does not depend on the size of the file
+    Args
+        file_name (string): the Exodus II file
+        source (dictionary): the configuration of the file with the 'type', 'variables', and 'time_steps' to read
+        chunk_size (integer): the maximum number of values read at once
+    Return
+        chunks (generator): DataFrames with the OUTPUT_COLUMNS
+    """
+    if netCDF4 is None:
+        error = 'Reading Exodus file {0} requires the netCDF4 package'.format(file_name)
+        logging.error('{0}: {1}'.format('ImportError', error))
+        raise ImportError(error)
+    variable_type = source.get('type', 'nodal')
+    name_variable, values_variable = EXODUS_TYPES[variable_type]
+    with netCDF4.Dataset(file_name, 'r') as dataset:
+        if name_variable not in dataset.variables:
+            return
+        # Read the values as they are stored instead of as masked arrays
+        dataset.set_auto_mask(False)
+        names = [str(name).strip() for name in netCDF4.chartostring(dataset.variables[name_variable][:])]
+        times = dataset.variables['time_whole']
+        selected = source.get('variables') or names
+        for time_step in select_time_steps(len(times), source.get('time_steps', 'all')):
+            time = float(times[time_step])
+            for name in selected:
+                if name not in names:
+                    logging.error('Variable %s not found in %s', name, file_name)
+                    continue
+                number = names.index(name)
+                if variable_type == 'global':
+                    value = dataset.variables[values_variable][time_step, number]
+                    yield create_chunk(source, file_name, name, time_step, time, np.zeros(1, dtype=int),
+                                       np.atleast_1d(value))
+                    continue
+                if variable_type == 'nodal':
+                    blocks = [values_variable.format(number + 1)]
+                else:
+                    blocks = [
+                        values_variable.format(number + 1, block + 1)
+                        for block in range(len(dataset.dimensions['num_el_blk']))
+                    ]
+                offset = 0
+                for block in blocks:
+                    if block not in dataset.variables:
+                        continue
+                    values = dataset.variables[block]
+                    for start in range(0, values.shape[1], chunk_size):
+                        chunk = values[time_step, start:start + chunk_size]
+                        yield create_chunk(source, file_name, name, time_step, time,
+                                           offset + start + np.arange(len(chunk)), chunk)
+                    offset += values.shape[1]
+
+
+def read_csv(file_names: list, source: dict, chunk_size: int):
+    """
+    Reads the columns of the csv files of a VectorPostprocessor in chunks of rows. The time step of a file is the
+    number at the end of its name e.g. 'run_file_out_temp_line_0002.csv'
+    Args
+        file_names (list): the csv files
+        source (dictionary): the configuration of the files with the 'columns' and 'time_steps' to read
+        chunk_size (integer): the maximum number of rows read at once
+    Return
+        chunks (generator): DataFrames with the OUTPUT_COLUMNS
+    """
+    time_steps = [get_time_step(file_name) for file_name in file_names]
+    indices = select_time_steps(len(file_names), source.get('time_steps', 'all'))
+    for index in indices:
+        file_name = file_names[index]
+        start = 0
+        for rows in pd.read_csv(file_name, usecols=source.get('columns'), chunksize=chunk_size):
+            for column in rows.columns:
+                yield create_chunk(source, file_name, column, time_steps[index], None, start + np.arange(rows.shape[0]),
+                                   rows[column].to_numpy())
+            start += rows.shape[0]
+
+
+def get_time_step(file_name: str):
+    match = re.search(r'_(\d+)\.csv$', file_name)
+    return int(match.group(1)) if match else None
+
+
+def get_source(source: dict, file_name: str):
+    """
+    Args
+        source (dictionary): the configuration of the output
+        file_name (string): a file that matches the output
+    Return
+        source (string): the name of the file, after the 'name' of the output if it has one e.g. 'adaptivity:out.e-s002'
+    """
+    if 'name' in source:
+        return '{0}:{1}'.format(source['name'], os.path.basename(file_name))
+    return os.path.basename(file_name)
+
+
+def create_chunk(source: dict, file_name: str, variable: str, time_step, time, index: np.ndarray, values: np.ndarray):
+    return pd.DataFrame(
+        {
+            'source': get_source(source, file_name),
+            'variable': variable,
+            'time_step': time_step,
+            'time': time,
+            'index': index,
+            'value': values
+        },
+        columns=OUTPUT_COLUMNS)
+
+
+def read_outputs(config: dict, work_directory: str, chunk_size: int):
+    """
+    Reads the outputs of a run selected by the configuration
+    Args
+        config (dictionary): the configuration returned by read_config
+        work_directory (string): the work directory of the run
+        chunk_size (integer): the maximum number of values read at once
+    Return
+        chunks (generator): DataFrames with the OUTPUT_COLUMNS
+    """
+    for source in config.get('exodus', list()):
+        file_names = sorted(glob.glob(os.path.join(work_directory, source['file'])))
+        if not file_names:
+            logging.warning('No MOOSE output matches %s in %s', source['file'], work_directory)
+        for file_name in file_names:
+            yield from read_exodus(file_name, source, chunk_size)
+    for source in config.get('csv', list()):
+        file_names = sorted(glob.glob(os.path.join(work_directory, source['file'])))
+        if not file_names:
+            logging.warning('No MOOSE output matches %s in %s', source['file'], work_directory)
+            continue
+        yield from read_csv(file_names, source, chunk_size)
+
+
+def get_output_schema():
+    """
+    Return
+        schema (pyarrow.Schema): the schema of the OUTPUT_COLUMNS in a columnar import file, None without pyarrow
+    """
+    pyarrow = output_format.pyarrow
+    if pyarrow is None:
+        return None
+    return pyarrow.schema([('source', pyarrow.string()), ('variable', pyarrow.string()), ('time_step', pyarrow.int64()),
+                           ('time', pyarrow.float64()), ('index', pyarrow.int64()), ('value', pyarrow.float64())])
+
+
+def write_output_file(chunks, import_file: str):
+    """
+    Writes chunks of results to the import file as they are read, in the output format of its extension
+    Args
+        chunks (iterable): DataFrames with the OUTPUT_COLUMNS
+        import_file (string): the import file e.g. 'import_file.csv' or 'import_file.parquet'
+    Return
+        rows (integer): the number of rows written
+    """
+    rows = 0
+    writer = output_format.create_writer(import_file, schema=get_output_schema())
+    try:
+        # Write the columns even if there are no results
+        writer.write(pd.DataFrame(columns=OUTPUT_COLUMNS))
+        for chunk in chunks:
+            writer.write(chunk)
+            rows += chunk.shape[0]
+    finally:
+        writer.close()
+    return rows
+
+
+def main(work_directory: str, import_file: str):
+    """
+    Writes the outputs of a run selected by POST_PROCESS_CONFIG_FILE_NAME to the import file
+    Args
+        work_directory (string): the work directory of the run
+        import_file (string): the import file
+    Return
+        rows (integer): the number of rows written, 0 if the configuration selected no results
+    """
+    config = read_config()
+    chunks = read_outputs(config, work_directory, int(os.getenv("POST_PROCESS_CHUNK_SIZE", 100000)))
+    rows = write_output_file(chunks, import_file)
+    if rows == 0:
+        logging.error('No MOOSE results were written to %s, check that %s selects the outputs of the input file',
+                      import_file, os.getenv("POST_PROCESS_CONFIG_FILE_NAME"))
+        return rows
+    logging.info('Wrote %s rows of MOOSE results to %s', rows, import_file)
+    return rows
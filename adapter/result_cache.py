@@ -0,0 +1,163 @@
+# Copyright 2021, Battelle Energy Alliance, LLC
+
+# Python Packages
+import os
+import uuid
+import shutil
+import hashlib
+import logging
+import threading
+import collections
+
+
+class ResultCache:
+    """
+    A content addressed cache of MOOSE output files on local disk e.g. the results of runs or generated meshes
+
+    Each entry is a directory named by the hash of the run inputs that holds a copy of the output files. The least
+    recently used entries are evicted once the cache exceeds its maximum size. The size and use order of the entries
+    are read from disk once, and are kept in memory afterwards
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        """
+        Args
+            directory (string): the directory of the cache entries
+            max_bytes (integer): the maximum total size of the cache entries
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # Size of each entry, least recently used first
+        self._entries = collections.OrderedDict()
+        self._total_bytes = 0
+        os.makedirs(self.directory, exist_ok=True)
+        self._load()
+
+    @staticmethod
+    def get_key(*file_names: str, executable: str = None):
+        """
+        Hashes the contents of the input files of a run and the identity of the MOOSE executable
+        Args
+            *file_names: the input files of the run e.g. the run file and the query file
+            executable (string): the path of the MOOSE executable, identified by its real path, size, and
+                modification time (optional)
+        Return
+            key (string): the hex digest of the inputs
+        """
+        digest = hashlib.sha256()
+        for file_name in file_names:
+            digest.update(os.path.basename(file_name).encode())
+            with open(file_name, 'rb') as input_file:
+                for block in iter(lambda: input_file.read(1 << 20), b''):
+                    digest.update(block)
+        if executable:
+            update_executable(digest, executable)
+        return digest.hexdigest()
+
+    def get(self, key: str, destinations: dict):
+        """
+        Copies the output files of a cache entry to their destinations
+        Args
+            key (string): the key of the run
+            destinations (dictionary): dictionary of output name and destination path e.g. {'import': 'import.csv'}
+        Return
+            True: on a cache hit
+            False: on a cache miss
+        """
+        entry = os.path.join(self.directory, key)
+        with self._lock:
+            if not all(os.path.exists(os.path.join(entry, name)) for name in destinations):
+                self.misses += 1
+                return False
+            for name, destination in destinations.items():
+                shutil.copyfile(os.path.join(entry, name), destination)
+            # Mark the entry as recently used, on disk so the use order is kept across restarts
+            os.utime(entry)
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            self.hits += 1
+        logging.info('Cache hit for %s in %s', key, self.directory)
+        return True
+
+    def put(self, key: str, sources: dict):
+        """
+        Copies the output files of a run into a cache entry
+        Args
+            key (string): the key of the run
+            sources (dictionary): dictionary of output name and source path e.g. {'import': 'import.csv'}
+        """
+        entry = os.path.join(self.directory, key)
+        # Write the entry to a temporary directory so a partial entry is never visible
+        temp_entry = os.path.join(self.directory, '.' + key + '.' + uuid.uuid4().hex)
+        os.makedirs(temp_entry)
+        for name, source in sources.items():
+            shutil.copyfile(source, os.path.join(temp_entry, name))
+        size = get_size(temp_entry)
+        with self._lock:
+            if os.path.exists(entry):
+                shutil.rmtree(entry)
+            self._total_bytes -= self._entries.pop(key, 0)
+            os.rename(temp_entry, entry)
+            self._entries[key] = size
+            self._total_bytes += size
+            self._evict()
+
+    def stats(self):
+        """
+        Return
+            stats (dictionary): the number of hits and misses, entries, and bytes of the cache
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries), 'bytes': self._total_bytes}
+
+    def _load(self):
+        """
+        Indexes the entries on disk by their modification time, and removes the temporary entries of interrupted puts
+        """
+        entries = list()
+        for name in os.listdir(self.directory):
+            entry = os.path.join(self.directory, name)
+            if not os.path.isdir(entry):
+                continue
+            if name.startswith('.'):
+                shutil.rmtree(entry, ignore_errors=True)
+                continue
+            entries.append((os.path.getmtime(entry), name, get_size(entry)))
+        for mtime, name, size in sorted(entries):
+            self._entries[name] = size
+            self._total_bytes += size
+
+    def _evict(self):
+        """
+        Removes the least recently used entries until the cache fits in its maximum size. The caller must hold the lock
+        """
+        while self._total_bytes > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            shutil.rmtree(os.path.join(self.directory, key), ignore_errors=True)
+            self._total_bytes -= size
+            logging.info('Evicted %s from %s', key, self.directory)
+
+
+def get_size(directory: str):
+    """
+    Args
+        directory (string): the directory of a cache entry
+    Return
+        size (integer): the total size of the files of the entry
+    """
+    return sum(os.path.getsize(os.path.join(directory, file_name)) for file_name in os.listdir(directory))
+
+
+def update_executable(digest, executable: str):
+    """
+    Adds the identity of an executable to a hash, its real path, size, and modification time
+    Args
+        digest (hash): the hash e.g. hashlib.sha256()
+        executable (string): the path of the executable
+    """
+    executable = os.path.realpath(os.path.expanduser(executable))
+    stat = os.stat(executable)
+    digest.update('{0}:{1}:{2}'.format(executable, stat.st_size, stat.st_mtime_ns).encode())
@@ -0,0 +1,147 @@
+# Copyright 2021, Battelle Energy Alliance, LLC
+
+# Python Packages
+import os
+import threading
+import numpy as np
+import pandas as pd
+
+
+class RingBuffer:
+    """
+    A fixed capacity First In First Out (FIFO) buffer of tabular data backed by one NumPy array per column
+
+    Each column array holds every row twice (at index i and i + capacity) so the rows currently in the buffer are
+    always one contiguous slice, which allows snapshots to be returned as views without copying
+    """
+
+    def __init__(self, capacity: int):
+        """
+        Args
+            capacity (integer): the maximum number of rows kept in the buffer
+        """
+        if capacity <= 0:
+            raise ValueError('Invalid capacity: {0}. The capacity of a RingBuffer must be positive'.format(capacity))
+        self.capacity = capacity
+        self.columns = list()
+        # Total number of rows ever appended to the buffer
+        self.total_rows = 0
+        self._data = dict()
+        self._head = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def is_full(self):
+        """
+        Return
+            True: when the buffer holds capacity rows
+        """
+        return self._size == self.capacity
+
+    def append(self, query_df: pd.DataFrame or pd.Series):
+        """
+        Appends rows to the end of the buffer, evicting the oldest rows once the buffer is full
+        Args
+            query_df (DataFrame or Series): the rows to append
+        """
+        if isinstance(query_df, pd.Series):
+            query_df = query_df.to_frame().T
+        rows = query_df.shape[0]
+        if rows == 0:
+            return
+        if not self.columns:
+            self._allocate(query_df)
+        missing = [column for column in self.columns if column not in query_df.columns]
+        if missing:
+            raise KeyError('Missing column(s) {0} in the data appended to the queue'.format(', '.join(missing)))
+
+        # Only the newest capacity rows can survive the append
+        skipped = max(0, rows - self.capacity)
+        query_df = query_df.iloc[skipped:]
+        positions = (self._head + self._size + np.arange(query_df.shape[0])) % self.capacity
+        for column in self.columns:
+            values = query_df[column].to_numpy()
+            self._ensure_dtype(column, values.dtype)
+            array = self._data[column]
+            array[positions] = values
+            array[positions + self.capacity] = values
+
+        # Move the head past the evicted rows
+        overflow = max(0, self._size + query_df.shape[0] - self.capacity)
+        self._head = (self._head + overflow) % self.capacity
+        self._size = min(self.capacity, self._size + query_df.shape[0])
+        self.total_rows += rows
+
+    def snapshot(self):
+        """
+        Returns read-only views of the rows in the buffer, oldest first. The views share memory with the buffer and
+        are only valid until the next append, so hold the queue lock while they are in use
+        Return
+            snapshot (dictionary): a dictionary of column name and NumPy view e.g. {column: ndarray}
+        """
+        snapshot = dict()
+        for column in self.columns:
+            view = self._data[column][self._head:self._head + self._size]
+            view.flags.writeable = False
+            snapshot[column] = view
+        return snapshot
+
+    def to_dataframe(self):
+        """
+        Copies the rows in the buffer, oldest first, into a new DataFrame
+        Return
+            queue_df (DataFrame): the rows in the buffer
+        """
+        return pd.DataFrame({column: view.copy() for column, view in self.snapshot().items()}, columns=self.columns)
+
+    def checkpoint(self, file_name: str, queue_df: pd.DataFrame = None):
+        """
+        Writes the buffer to a csv file. The file is replaced atomically so a crash never leaves a partial checkpoint
+        Args
+            file_name (string): the path of the checkpoint file
+            queue_df (DataFrame): a copy of the buffer taken under the queue lock (optional)
+        """
+        if queue_df is None:
+            queue_df = self.to_dataframe()
+        temp_file_name = '{0}.{1}.tmp'.format(file_name, threading.get_ident())
+        queue_df.to_csv(temp_file_name, index=False)
+        os.replace(temp_file_name, file_name)
+
+    @classmethod
+    def from_csv(cls, file_name: str, capacity: int):
+        """
+        Creates a buffer from a csv checkpoint, if one exists
+        Args
+            file_name (string): the path of the checkpoint file
+            capacity (integer): the maximum number of rows kept in the buffer
+        Return
+            buffer (RingBuffer): a buffer holding the newest capacity rows of the checkpoint
+        """
+        buffer = cls(capacity)
+        if file_name and os.path.exists(file_name):
+            buffer.append(pd.read_csv(file_name))
+        return buffer
+
+    def _allocate(self, query_df: pd.DataFrame):
+        """
+        Allocates one array per column using the columns and datatypes of the first rows appended
+        Args
+            query_df (DataFrame): the first rows appended to the buffer
+        """
+        self.columns = list(query_df.columns)
+        for column in self.columns:
+            dtype = query_df[column].to_numpy().dtype
+            self._data[column] = np.empty(2 * self.capacity, dtype=dtype)
+
+    def _ensure_dtype(self, column: str, dtype: np.dtype):
+        """
+        Upcasts the array of a column when appended values cannot be stored in it without loss
+        Args
+            column (string): the column name
+            dtype (dtype): the datatype of the appended values
+        """
+        array = self._data[column]
+        if not np.can_cast(dtype, array.dtype, casting='safe'):
+            self._data[column] = array.astype(np.result_type(array.dtype, dtype))
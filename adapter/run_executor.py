@@ -0,0 +1,105 @@
+# Copyright 2021, Battelle Energy Alliance, LLC
+
+# Python Packages
+import os
+import shutil
+import logging
+import tempfile
+import threading
+import concurrent.futures
+
+
+class RunExecutor:
+    """
+    Runs MOOSE jobs concurrently, each in its own work directory
+
+    Every job is a separate MOOSE process (or mpiexec process group), so the jobs are dispatched from a pool of
+    threads sized to the number of cores divided by the number of MPI ranks of a job
+    """
+
+    def __init__(self, work_directory: str, max_runs: int = None, mpi_ranks: int = 1, keep_work_directories=False):
+        """
+        Args
+            work_directory (string): the directory in which the work directory of each job is created
+            max_runs (integer): the maximum number of concurrent jobs (defaults to the number of cores / mpi_ranks)
+            mpi_ranks (integer): the number of MPI ranks of each job, 1 to run without mpiexec
+            keep_work_directories (boolean): whether to keep the work directory of a job after cleanup
+        """
+        self.work_directory = work_directory
+        self.mpi_ranks = max(1, mpi_ranks)
+        self.max_runs = max_runs or max(1, (os.cpu_count() or 1) // self.mpi_ranks)
+        self.keep_work_directories = keep_work_directories
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_runs,
+                                                               thread_name_prefix='moose_run')
+        # Bounds the number of submitted jobs so new data is coalesced by the scheduler while every slot is busy
+        self._slots = threading.BoundedSemaphore(self.max_runs)
+        self._active_runs = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.work_directory, exist_ok=True)
+
+    def create_work_directory(self):
+        """
+        Return
+            work_directory (string): a new, empty work directory for a job
+        """
+        return tempfile.mkdtemp(prefix='run-', dir=self.work_directory)
+
+    def submit(self, function, *args):
+        """
+        Runs a job in the pool, blocking until a slot is free
+        Args
+            function (callable): the job
+            *args: the arguments of the job
+        Return
+            future (Future): the result of the job
+        """
+        self._slots.acquire()
+        try:
+            return self._executor.submit(self._run, function, *args)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def run(self, function, *args):
+        """
+        Runs a job in the pool and waits for its result
+        Args
+            function (callable): the job
+            *args: the arguments of the job
+        Return
+            result: the result of the job, or False if it raised an exception
+        """
+        return self.submit(function, *args).result()
+
+    def cleanup(self, work_directory: str):
+        """
+        Removes the work directory of a job
+        Args
+            work_directory (string): the work directory of the job
+        """
+        if not self.keep_work_directories and os.path.isdir(work_directory):
+            shutil.rmtree(work_directory, ignore_errors=True)
+
+    def stats(self):
+        """
+        Return
+            stats (dictionary): the number of running jobs and the maximum number of concurrent jobs
+        """
+        with self._lock:
+            return {'active': self._active_runs, 'max': self.max_runs}
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+    def _run(self, function, *args):
+        with self._lock:
+            self._active_runs += 1
+        try:
+            return function(*args)
+        except Exception:
+            logging.exception('MOOSE job %s failed', getattr(function, '__name__', function))
+            return False
+        finally:
+            with self._lock:
+                self._active_runs -= 1
+            self._slots.release()
@@ -0,0 +1,72 @@
+# Copyright 2021, Battelle Energy Alliance, LLC
+
+# Python Packages
+import time
+import threading
+
+# Repository Modules
+from .trigger_policy import TriggerPolicy, FullQueuePolicy
+
+
+class Scheduler:
+    """
+    Wakes the MOOSE thread when new data added to the queue meets the run trigger policy
+
+    The scheduler shares the queue lock, so producers signal it while they append to the queue and the MOOSE thread
+    snapshots the queue in the same critical section in which it is woken
+    """
+
+    def __init__(self, lock: threading.Lock, is_full, policy: TriggerPolicy = None):
+        """
+        Args
+            lock (Lock): the queue lock
+            is_full (callable): returns whether the queue holds QUEUE_LENGTH rows
+            policy (TriggerPolicy): decides when to run MOOSE (defaults to every new data once the queue is full)
+        """
+        self.is_full = is_full
+        self.policy = policy or FullQueuePolicy()
+        self.pending_rows = 0
+        self._condition = threading.Condition(lock)
+        self._flush_requested = False
+        self._stopped = False
+
+    def notify(self, rows: int):
+        """
+        Records rows added to the queue and wakes the MOOSE thread. The caller must hold the queue lock
+        Args
+            rows (integer): the number of rows added to the queue
+        """
+        self.pending_rows += rows
+        self._condition.notify_all()
+
+    def flush(self):
+        """
+        Runs MOOSE on the queue regardless of the trigger policy. The caller must hold the queue lock
+        """
+        self._flush_requested = True
+        self._condition.notify_all()
+
+    def wait(self):
+        """
+        Blocks until the trigger policy is met, a flush is requested, or the scheduler is stopped. The caller must
+        hold the queue lock, which is released while waiting
+        Return
+            True: if MOOSE should run
+            False: if the scheduler was stopped
+        """
+        while not self._stopped:
+            now = time.monotonic()
+            if self._flush_requested or self.policy.is_triggered(self.pending_rows, self.is_full(), now):
+                self._flush_requested = False
+                self.pending_rows = 0
+                self.policy.on_run(now)
+                return True
+            self._condition.wait(self.policy.timeout(self.pending_rows, now))
+        return False
+
+    def stop(self):
+        """
+        Stops the scheduler and wakes the MOOSE thread. The caller must hold the queue lock
+        """
+        self._stopped = True
+        self._condition.notify_all()
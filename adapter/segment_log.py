@@ -0,0 +1,229 @@
+# Copyright 2021, Battelle Energy Alliance, LLC
+
+# Python Packages
+import os
+import io
+import glob
+import time
+import zlib
+import struct
+import logging
+import numpy as np
+import pandas as pd
+
+# Each frame is a header (magic, number of rows, payload length, crc32 of the payload) followed by the rows
+# serialized as a NumPy structured array and, for object columns, a structured array of their missing values
+FRAME_MAGIC = b'DLQF'
+FRAME_HEADER = struct.Struct('<4sIII')
+SEGMENT_PATTERN = 'segment-*.log'
+
+
+class SegmentLog:
+    """
+    A crash-safe, append-only log of the rows added to the queue
+
+    Rows are appended as checksummed frames to the newest segment file. Segments are rotated after a number of rows
+    and deleted once every row they hold has fallen out of the queue window
+    """
+
+    def __init__(self,
+                 directory: str,
+                 window: int,
+                 segment_rows: int = None,
+                 fsync_batch: int = 16,
+                 fsync_seconds: float = 1.0):
+        """
+        Args
+            directory (string): the directory of the segment files
+            window (integer): the number of newest rows that must be recoverable i.e. the queue length
+            segment_rows (integer): the number of rows after which a segment is rotated (defaults to window)
+            fsync_batch (integer): the number of frames written between calls to fsync
+            fsync_seconds (float): the maximum number of seconds between calls to fsync
+        """
+        self.directory = directory
+        self.window = window
+        self.segment_rows = segment_rows or window
+        self.fsync_batch = fsync_batch
+        self.fsync_seconds = fsync_seconds
+        # List of [sequence number, number of rows] of each segment, oldest first
+        self._segments = list()
+        self._file = None
+        self._unsynced_frames = 0
+        self._last_fsync = time.time()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def recover(self):
+        """
+        Reads the newest window rows from the segment files. Only the segments that hold those rows are read, and
+        only the newest segment, the one that may have been written during a crash, is truncated after its last
+        complete frame
+        Return
+            queue_df (DataFrame): the recovered rows, oldest first
+        """
+        sequences = sorted(self._sequence(path) for path in glob.glob(os.path.join(self.directory, SEGMENT_PATTERN)))
+        frames = list()
+        rows = 0
+        self._segments = list()
+        for sequence in reversed(sequences):
+            # Every row of the older segments has fallen out of the window
+            if rows >= self.window:
+                os.remove(self._path(sequence))
+                continue
+            segment_frames = self._read_segment(sequence, truncate=not self._segments)
+            segment_rows = sum(frame.shape[0] for frame in segment_frames)
+            self._segments.insert(0, [sequence, segment_rows])
+            frames = segment_frames + frames
+            rows += segment_rows
+        self._open_segment()
+        self.compact()
+        logging.info('Recovered %s queue rows from %s segment(s) in %s', rows, len(self._segments), self.directory)
+        if not frames:
+            return pd.DataFrame()
+        queue_df = pd.concat(frames, ignore_index=True)
+        return queue_df.iloc[max(0, queue_df.shape[0] - self.window):].reset_index(drop=True)
+
+    def append(self, query_df: pd.DataFrame):
+        """
+        Appends rows to the newest segment
+        Args
+            query_df (DataFrame): the rows to append
+        """
+        if query_df.shape[0] == 0:
+            return
+        if self._file is None:
+            self._open_segment()
+        payload = self._serialize(query_df)
+        self._file.write(FRAME_HEADER.pack(FRAME_MAGIC, query_df.shape[0], len(payload), zlib.crc32(payload)))
+        self._file.write(payload)
+        self._file.flush()
+        self._segments[-1][1] += query_df.shape[0]
+        self._unsynced_frames += 1
+        if self._unsynced_frames >= self.fsync_batch or time.time() - self._last_fsync >= self.fsync_seconds:
+            self.sync()
+        # Rotate and drop segments that have fallen out of the window
+        if self._segments[-1][1] >= self.segment_rows:
+            self.sync()
+            self._file.close()
+            self._open_segment(self._segments[-1][0] + 1)
+            self.compact()
+
+    def sync(self):
+        """
+        Flushes the newest segment to disk
+        """
+        if self._file is not None and self._unsynced_frames > 0:
+            os.fsync(self._file.fileno())
+        self._unsynced_frames = 0
+        self._last_fsync = time.time()
+
+    def compact(self):
+        """
+        Deletes the oldest segments when the newer segments hold at least window rows
+        """
+        while len(self._segments) > 1 and sum(rows for sequence, rows in self._segments[1:]) >= self.window:
+            sequence, rows = self._segments.pop(0)
+            os.remove(self._path(sequence))
+
+    def close(self):
+        """
+        Flushes and closes the newest segment
+        """
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+    def _open_segment(self, sequence: int = None):
+        """
+        Opens a segment for appending
+        Args
+            sequence (integer): the sequence number of a new segment, or None to reopen the newest segment
+        """
+        if sequence is None:
+            if self._segments:
+                sequence = self._segments[-1][0]
+            else:
+                sequence = 0
+        if not self._segments or self._segments[-1][0] != sequence:
+            self._segments.append([sequence, 0])
+        self._file = open(self._path(sequence), 'ab')
+
+    def _read_segment(self, sequence: int, truncate: bool = False):
+        """
+        Reads the complete frames of a segment
+        Args
+            sequence (integer): the sequence number of the segment
+            truncate (boolean): whether to truncate the segment after its last complete frame
+        Return
+            frames (list): a list of DataFrames, one per frame
+        """
+        path = self._path(sequence)
+        frames = list()
+        valid_length = 0
+        with open(path, 'rb') as segment:
+            while True:
+                header = segment.read(FRAME_HEADER.size)
+                if len(header) < FRAME_HEADER.size:
+                    break
+                magic, rows, length, crc = FRAME_HEADER.unpack(header)
+                payload = segment.read(length)
+                if magic != FRAME_MAGIC or len(payload) < length or zlib.crc32(payload) != crc:
+                    break
+                frames.append(self._deserialize(payload))
+                valid_length = segment.tell()
+        if os.path.getsize(path) != valid_length:
+            if truncate:
+                logging.warning('Truncating incomplete frame(s) at byte %s of queue segment %s', valid_length, path)
+                os.truncate(path, valid_length)
+            else:
+                logging.error('Ignoring corrupt frame(s) after byte %s of queue segment %s', valid_length, path)
+        return frames
+
+    def _path(self, sequence: int):
+        return os.path.join(self.directory, 'segment-{0:010d}.log'.format(sequence))
+
+    @staticmethod
+    def _sequence(path: str):
+        return int(os.path.basename(path)[len('segment-'):-len('.log')])
+
+    @staticmethod
+    def _serialize(query_df: pd.DataFrame):
+        """
+        Serializes rows as a NumPy structured array. Object columns (e.g. strings) are stored as unicode so the
+        payload never requires pickle, followed by a structured array of the missing values of those columns
+        Args
+            query_df (DataFrame): the rows to serialize
+        Return
+            payload (bytes): the serialized rows
+        """
+        columns = dict()
+        missing = dict()
+        for column in query_df.columns:
+            values = query_df[column].to_numpy()
+            if values.dtype.kind == 'O':
+                missing[str(column)] = pd.isnull(values)
+                values = values.astype(str)
+            columns[str(column)] = values
+        records = np.rec.fromarrays(list(columns.values()), names=list(columns.keys()))
+        buffer = io.BytesIO()
+        np.save(buffer, records, allow_pickle=False)
+        if missing:
+            np.save(buffer, np.rec.fromarrays(list(missing.values()), names=list(missing.keys())), allow_pickle=False)
+        return buffer.getvalue()
+
+    @staticmethod
+    def _deserialize(payload: bytes):
+        """
+        Args
+            payload (bytes): the rows serialized by _serialize
+        Return
+            query_df (DataFrame): the rows, with NaN for the missing values of object columns
+        """
+        buffer = io.BytesIO(payload)
+        query_df = pd.DataFrame(np.load(buffer, allow_pickle=False))
+        # Frames without object columns have no missing value mask
+        if buffer.tell() < len(payload):
+            missing = np.load(buffer, allow_pickle=False)
+            for column in missing.dtype.names:
+                query_df[column] = query_df[column].astype(object).where(~missing[column])
+        return query_df
@@ -0,0 +1,83 @@
+# Copyright 2021, Battelle Energy Alliance, LLC
+
+# Python Packages
+import os
+import json
+import logging
+import threading
+
+
+class StartupCache:
+    """
+    Persists the ids that the adapter resolves from Deep Lynx at startup e.g. the container and data source ids, so a
+    restart does not list every container and data source again
+    """
+
+    def __init__(self, file_name: str = None):
+        """
+        Args
+            file_name (string): the json file the ids are persisted to across restarts (optional)
+        """
+        self.file_name = file_name
+        self._values = dict()
+        self._lock = threading.Lock()
+        if self.file_name and os.path.exists(self.file_name):
+            self._load()
+
+    @staticmethod
+    def get_key(*names):
+        """
+        Args
+            names (list): the names that the cached value depends on e.g. the url, container name, and data source name
+        Return
+            key (string): the key of the cached value
+        """
+        return '|'.join(str(name) for name in names)
+
+    def get(self, key: str):
+        """
+        Args
+            key (string): the key of a cached value
+        Return
+            value: the cached value, or None
+        """
+        with self._lock:
+            return self._values.get(key)
+
+    def put(self, key: str, value):
+        """
+        Args
+            key (string): the key of the value
+            value: the json serializable value to cache
+        """
+        with self._lock:
+            self._values[key] = value
+            values = dict(self._values)
+        self._save(values)
+
+    def discard(self, key: str):
+        """
+        Forgets a cached value that is no longer valid
+        Args
+            key (string): the key of the value
+        """
+        with self._lock:
+            if self._values.pop(key, None) is None:
+                return
+            values = dict(self._values)
+        self._save(values)
+
+    def _save(self, values: dict):
+        if not self.file_name:
+            return
+        temp_file_name = '{0}.{1}.tmp'.format(self.file_name, threading.get_ident())
+        with open(temp_file_name, 'w') as cache_file:
+            json.dump(values, cache_file)
+        os.replace(temp_file_name, self.file_name)
+
+    def _load(self):
+        try:
+            with open(self.file_name) as cache_file:
+                self._values = json.load(cache_file)
+        except ValueError:
+            logging.error('Ignoring invalid startup cache file %s', self.file_name)
@@ -0,0 +1,131 @@
+# Copyright 2021, Battelle Energy Alliance, LLC
+
+# Python Packages
+import os
+import logging
+import numpy as np
+import pandas as pd
+
+# Repository Modules
+from .edit_input_file import CONFIG_DATATYPES
+from .change_detection import is_number, get_options
+from . import output_format
+
+# Sweep modes of the SWEEP_MODE environment variable
+SWEEP_MODES = ('none', 'grid', 'lhs', 'list')
+
+
+def get_sweep_mode():
+    """
+    Gets the sweep mode selected by the SWEEP_MODE environment variable
+    Return
+        mode (string): the sweep mode
+    """
+    mode = os.getenv("SWEEP_MODE", "none")
+    if mode in SWEEP_MODES:
+        return mode
+    error = 'Invalid SWEEP_MODE: \'{0}\'. Use none, grid, lhs, or list'.format(mode)
+    logging.error('{0}: {1}'.format('ValueError', error))
+    raise ValueError(error)
+
+
+def create_variants(json_data: list, config: dict, mode: str, levels: int = 3, samples: int = 10, seed=None):
+    """
+    Expands the parameters of a run into the parameters of the variants of a sweep. A parameter is swept when its
+    {{config}} tag has a 'delta' option, the half width of the range around its value, or an 'offsets' option, a
+    list of perturbations added to its value e.g. 'offsets=-10;0;10'
+    Args
+        json_data (list): an array of json objects of the parameters of the run
+        config (dictionary): the configuration parameters returned by edit_input_file.read_config
+        mode (string): 'grid' for levels evenly spaced values per parameter, 'lhs' for a Latin hypercube of samples
+            variants, 'list' for the n-th offset of every parameter in the n-th variant, or 'none'
+        levels (integer): the number of values of each parameter of a grid sweep
+        samples (integer): the number of variants of a Latin hypercube sweep
+        seed (integer): the seed of the Latin hypercube sampling (optional)
+    Return
+        variants (list): an array of json_data, one for each variant
+    """
+    option = 'offsets' if mode == 'list' else 'delta'
+    swept = [
+        index for index, json_object in enumerate(json_data)
+        if is_number(json_object['value']) and option in get_options(config, get_key(json_object))
+    ]
+    if mode == 'none' or not swept:
+        return [json_data]
+
+    base = np.array([json_data[index]['value'] for index in swept], dtype=float)
+    if mode == 'list':
+        offsets = [
+            np.array(get_options(config, get_key(json_data[index]))['offsets'].split(';'), dtype=float)
+            for index in swept
+        ]
+        if len(set(len(offset) for offset in offsets)) != 1:
+            error = 'Invalid offsets: every swept parameter must have the same number of offsets'
+            logging.error('{0}: {1}'.format('ValueError', error))
+            raise ValueError(error)
+        values = base + np.stack(offsets, axis=1)
+    else:
+        delta = np.array([float(get_options(config, get_key(json_data[index]))['delta']) for index in swept])
+        if mode == 'grid':
+            # Cartesian product of the values of every parameter, one variant per row
+            axes = [np.linspace(-1, 1, levels) if levels > 1 else np.zeros(1) for index in swept]
+            unit = np.stack([axis.ravel() for axis in np.meshgrid(*axes, indexing='ij')], axis=1)
+        else:
+            # One sample in each of the equally sized strata of every parameter, strata paired at random
+            rng = np.random.default_rng(seed)
+            strata = np.stack([rng.permutation(samples) for index in swept], axis=1)
+            unit = 2 * (strata + rng.random((samples, len(swept)))) / samples - 1
+        values = base + unit * delta
+
+    variants = list()
+    seen = set()
+    for row in values:
+        variant = [dict(json_object) for json_object in json_data]
+        for index, value in zip(swept, row):
+            datatype, options = config.get(get_key(json_data[index]), (None, dict()))
+            if datatype == 'int':
+                value = round(value)
+            variant[index]['value'] = CONFIG_DATATYPES.get(datatype, float)(value)
+        # Rounding may turn variants of integer parameters into duplicates
+        key = tuple(variant[index]['value'] for index in swept)
+        if key not in seen:
+            seen.add(key)
+            variants.append(variant)
+    return variants
+
+
+def aggregate_results(variants: list, import_file: str, chunk_size: int = 100000):
+    """
+    Combines the import files of the variants of a sweep into a single import file of the same output format, in
+    chunks of rows. Each row is labeled with the index of its variant and the values of the parameters of the variant
+    Args
+        variants (list): an array of dictionaries with the 'json_data' and 'import_file' of each variant
+        import_file (string): the combined import file
+        chunk_size (integer): the maximum number of rows read at once
+    """
+    writer = output_format.create_writer(import_file)
+    try:
+        for index, variant in enumerate(variants):
+            labels = {'variant': index}
+            for json_object in variant["json_data"]:
+                labels[get_column(json_object)] = json_object['value']
+            for result in output_format.read_chunks(variant["import_file"], chunk_size):
+                writer.write(result.assign(**labels))
+    finally:
+        writer.close()
+
+
+def get_key(json_object: dict):
+    return json_object['node'], json_object['parameter']
+
+
+def get_column(json_object: dict):
+    """
+    Args
+        json_object (dictionary): a json object of a parameter
+    Return
+        column (string): the queue column of the parameter e.g. '/BCs/left/value', or 'xmax' for a global variable
+    """
+    if json_object['node'] is None:
+        return json_object['parameter']
+    return json_object['node'] + '/' + json_object['parameter']
@@ -14,6 +14,9 @@ import settings
 import pyhit
 import moosetree
 
+# Options that may follow the {{config}} tag of a parameter e.g. '# {{config}} atol=0.5 rtol=0.01'
+CONFIG_OPTIONS = ('atol', 'rtol', 'delta', 'offsets')
+
 
 def get_parser_arguments():
     """
@@ -89,6 +92,7 @@ def get_params_of_node(node: moosetree.Node, root: moosetree.Node):
         comment = node.comment(param=node_key)
         if comment is not None:
             if '{{config}}' in comment:
+                datatype = None
                 if isinstance(node_value, str):
                     # If value is a global variable at top of input file, use the datatype of the parameter from configDict
                     # Purpose: type('${xmax}') = str but should be int
@@ -97,11 +101,13 @@ def get_params_of_node(node: moosetree.Node, root: moosetree.Node):
                         modified_value = modified_value.replace('}', '')
                         for root_key, root_value in root_parameters.items():
                             if root_key == modified_value:
-                                params_dict[node_key] = type(root_value).__name__
+                                datatype = type(root_value).__name__
                     else:
-                        params_dict[node_key] = type(node_value).__name__
+                        datatype = type(node_value).__name__
                 else:
-                    params_dict[node_key] = type(node_value).__name__
+                    datatype = type(node_value).__name__
+                if datatype is not None:
+                    params_dict[node_key] = format_config_value(datatype, get_config_options(comment))
 
     # Return sections and a dictionary of parameters
     if len(params_dict) != 0:
@@ -112,6 +118,54 @@ def get_params_of_node(node: moosetree.Node, root: moosetree.Node):
         return section, params_dict
 
 
+def get_config_options(comment: str):
+    """
+    Determine the options that follow the {{config}} tag of a parameter comment
+    Args
+        comment (string): the comment of a parameter e.g. '{{config}} atol=0.5 rtol=0.01'
+    Return
+        options (dictionary): dictionary of option name and value e.g. {'atol': '0.5', 'rtol': '0.01'}
+    """
+    options = dict()
+    # Only consider the text between {{config}} and the next tag e.g. {{change}}
+    text = comment.split('{{config}}', 1)[-1].split('{{', 1)[0]
+    for token in text.split():
+        key, separator, value = token.partition('=')
+        if separator and key in CONFIG_OPTIONS:
+            options[key] = value
+    return options
+
+
+def format_config_value(datatype: str, options: dict):
+    """
+    Formats the value of a parameter in the configuration file
+    Args
+        datatype (string): the datatype of the parameter
+        options (dictionary): dictionary of option name and value
+    Return
+        config_value (string): the datatype followed by the options e.g. 'int, atol=0.5, rtol=0.01'
+    """
+    return ', '.join([datatype] + ['{0}={1}'.format(key, value) for key, value in options.items()])
+
+
+def parse_config_value(config_value: str):
+    """
+    Parses the value of a parameter in the configuration file
+    Args
+        config_value (string): the datatype followed by the options e.g. 'int, atol=0.5, rtol=0.01'
+    Return
+        datatype (string): the datatype of the parameter
+        options (dictionary): dictionary of option name and value
+    """
+    datatype, *tokens = [token.strip() for token in config_value.split(',')]
+    options = dict()
+    for token in tokens:
+        key, separator, value = token.partition('=')
+        if separator:
+            options[key.strip()] = value.strip()
+    return datatype, options
+
+
 def get_config_parameters(input_file: str):
     """
     Determine the section and parameters for the configuration file
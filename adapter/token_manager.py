@@ -0,0 +1,166 @@
+# Copyright 2021, Battelle Energy Alliance, LLC
+
+# Python Packages
+import re
+import time
+import logging
+import threading
+import deep_lynx
+
+# Number of seconds of each unit of a token expiry e.g. '12h'
+EXPIRY_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def get_expiry_seconds(expiry: str):
+    """
+    Args
+        expiry (string): the expiry of a token e.g. '30m', '12h', or '7d'
+    Return
+        seconds (float): the number of seconds until the token expires
+    """
+    match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([smhd])\s*', expiry)
+    if match is None:
+        error = 'Invalid token expiry: \'{0}\'. Use a number followed by s, m, h, or d'.format(expiry)
+        logging.error('{0}: {1}'.format('ValueError', error))
+        raise ValueError(error)
+    return float(match.group(1)) * EXPIRY_UNITS[match.group(2)]
+
+
+class TokenManager:
+    """
+    Keeps the OAuth token of an api client valid
+
+    The token is refreshed in a background thread before it expires, and the Authorization header of the api client
+    is replaced in a single assignment, so requests use either the old or the new token. Requests that are rejected
+    with 401 call reauthenticate, and concurrent calls for the same stale token wait for a single new token
+    """
+
+    def __init__(self,
+                 api_client: deep_lynx.ApiClient,
+                 api_key: str,
+                 api_secret: str,
+                 expiry: str = '12h',
+                 refresh_fraction: float = 0.8,
+                 retry_seconds: float = 30):
+        """
+        Args
+            api_client (deep_lynx.ApiClient): the api client that sends the token
+            api_key (string): the Deep Lynx api key
+            api_secret (string): the Deep Lynx api secret
+            expiry (string): the lifetime of a token e.g. '12h'
+            refresh_fraction (float): the fraction of the lifetime of a token after which it is refreshed
+            retry_seconds (float): the maximum number of seconds between attempts to refresh a token after a failure
+        """
+        self.api_client = api_client
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.expiry = expiry
+        self.lifetime = get_expiry_seconds(expiry)
+        self.refresh_fraction = refresh_fraction
+        self.retry_seconds = retry_seconds
+        self.header = None
+        self.issued = 0.0
+        self.refreshes = 0
+        self.reauthentications = 0
+        self.failures = 0
+        self._auth_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._local = threading.local()
+        self._thread = None
+
+    def start(self):
+        """
+        Retrieves the first token, and starts refreshing it in the background
+        """
+        self.authenticate()
+        self._thread = threading.Thread(target=self._refresh, daemon=True, name="token_manager")
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+
+    def retrieve_token(self):
+        """
+        Return
+            token (string): a new OAuth token from Deep Lynx
+        """
+        auth_api = deep_lynx.AuthenticationApi(self.api_client)
+        return auth_api.retrieve_o_auth_token(x_api_key=self.api_key,
+                                              x_api_secret=self.api_secret,
+                                              x_api_expiry=self.expiry)
+
+    def authenticate(self):
+        """
+        Retrieves a new token and sets the Authorization header of the api client
+        Return
+            header (string): the new Authorization header
+        """
+        self._local.is_authenticating = True
+        try:
+            issued = time.monotonic()
+            token = self.retrieve_token()
+        finally:
+            self._local.is_authenticating = False
+        self.header = 'Bearer {}'.format(token)
+        self.issued = issued
+        self.api_client.set_default_header('Authorization', self.header)
+        self.refreshes += 1
+        logging.info('Retrieved a Deep Lynx token that expires in %s', self.expiry)
+        return self.header
+
+    def reauthenticate(self, stale_header: str):
+        """
+        Replaces a token that Deep Lynx rejected. Only the first of the concurrent calls for the same stale token
+        retrieves a new token, the others wait for it
+        Args
+            stale_header (string): the Authorization header of the rejected request
+        Return
+            header (string): the current Authorization header
+        """
+        with self._auth_lock:
+            if self.header != stale_header:
+                return self.header
+            logging.warning('Deep Lynx rejected the token, retrieving a new token')
+            self.reauthentications += 1
+            return self.authenticate()
+
+    def is_authenticating(self):
+        """
+        Return
+            True: if the current thread is retrieving a token, whose requests must not reauthenticate
+            False: otherwise
+        """
+        return getattr(self._local, 'is_authenticating', False)
+
+    def stats(self):
+        """
+        Return
+            stats (dictionary): the number of tokens retrieved, of tokens replaced after 401 responses, of failed
+                refreshes, and the number of seconds until the token expires
+        """
+        return {
+            'refreshes': self.refreshes,
+            'reauthentications': self.reauthentications,
+            'failures': self.failures,
+            'expires_in_seconds': max(0.0, self.issued + self.lifetime - time.monotonic())
+        }
+
+    def _refresh(self):
+        """
+        Refreshes the token after refresh_fraction of its lifetime, retrying failures until it expires
+        """
+        while not self._stopped.is_set():
+            refresh_at = self.issued + self.refresh_fraction * self.lifetime
+            if self._stopped.wait(max(0.0, refresh_at - time.monotonic())):
+                return
+            try:
+                with self._auth_lock:
+                    # The token may have been replaced while waiting
+                    if time.monotonic() >= self.issued + self.refresh_fraction * self.lifetime:
+                        self.authenticate()
+            except Exception:
+                self.failures += 1
+                logging.exception('Refreshing the Deep Lynx token failed')
+                # Retry sooner as the token gets closer to expiring
+                remaining = self.issued + self.lifetime - time.monotonic()
+                self._stopped.wait(min(self.retry_seconds, max(1.0, remaining / 4)))
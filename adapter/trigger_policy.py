@@ -0,0 +1,140 @@
+# Copyright 2021, Battelle Energy Alliance, LLC
+
+# Python Packages
+import os
+import logging
+
+
+class TriggerPolicy:
+    """
+    Decides when new data added to the queue runs MOOSE. A run can always be forced with an explicit flush
+    """
+
+    def is_triggered(self, pending_rows: int, is_full: bool, now: float):
+        """
+        Args
+            pending_rows (integer): the number of rows added to the queue since the last run
+            is_full (boolean): whether the queue holds QUEUE_LENGTH rows
+            now (float): the current monotonic time in seconds
+        Return
+            True: if MOOSE should run
+        """
+        return False
+
+    def timeout(self, pending_rows: int, now: float):
+        """
+        Args
+            pending_rows (integer): the number of rows added to the queue since the last run
+            now (float): the current monotonic time in seconds
+        Return
+            timeout (float): the number of seconds until the policy may trigger without new data, or None
+        """
+        return None
+
+    def on_run(self, now: float):
+        """
+        Records that MOOSE was run
+        Args
+            now (float): the current monotonic time in seconds
+        """
+        pass
+
+
+class FullQueuePolicy(TriggerPolicy):
+    """
+    Runs MOOSE for every new data once the queue is full
+    """
+
+    def is_triggered(self, pending_rows: int, is_full: bool, now: float):
+        return pending_rows > 0 and is_full
+
+
+class EveryKRowsPolicy(TriggerPolicy):
+    """
+    Runs MOOSE once every K rows added to a full queue
+    """
+
+    def __init__(self, rows: int):
+        """
+        Args
+            rows (integer): the number of new rows that runs MOOSE
+        """
+        self.rows = rows
+
+    def is_triggered(self, pending_rows: int, is_full: bool, now: float):
+        return pending_rows >= self.rows and is_full
+
+
+class TimeWindowPolicy(TriggerPolicy):
+    """
+    Runs MOOSE at most once every T seconds, coalescing all data added to a full queue within the window into one run
+    """
+
+    def __init__(self, seconds: float):
+        """
+        Args
+            seconds (float): the minimum number of seconds between runs
+        """
+        self.seconds = seconds
+        self.last_run = None
+
+    def is_triggered(self, pending_rows: int, is_full: bool, now: float):
+        return pending_rows > 0 and is_full and (self.last_run is None or now - self.last_run >= self.seconds)
+
+    def timeout(self, pending_rows: int, now: float):
+        if pending_rows > 0 and self.last_run is not None:
+            return max(0, self.seconds - (now - self.last_run))
+        return None
+
+    def on_run(self, now: float):
+        self.last_run = now
+
+
+class FlushPolicy(TriggerPolicy):
+    """
+    Runs MOOSE only on an explicit flush
+    """
+    pass
+
+
+def get_trigger_policy():
+    """
+    Creates the trigger policy selected by the RUN_TRIGGER_POLICY environment variable
+    Return
+        policy (TriggerPolicy): the trigger policy
+    """
+    name = os.getenv("RUN_TRIGGER_POLICY", "full_queue")
+    if name == "full_queue":
+        return FullQueuePolicy()
+    elif name == "every_k_rows":
+        return EveryKRowsPolicy(get_setting("RUN_TRIGGER_ROWS", int, name))
+    elif name == "time_window":
+        return TimeWindowPolicy(get_setting("RUN_TRIGGER_SECONDS", float, name))
+    elif name == "flush":
+        return FlushPolicy()
+    error = 'Invalid RUN_TRIGGER_POLICY: \'{0}\'. Use full_queue, every_k_rows, time_window, or flush'.format(name)
+    logging.error('{0}: {1}'.format('ValueError', error))
+    raise ValueError(error)
+
+
+def get_setting(variable: str, datatype: type, name: str):
+    """
+    Args
+        variable (string): the environment variable of a setting of the trigger policy
+        datatype (type): the datatype of the setting e.g. int
+        name (string): the name of the trigger policy
+    Return
+        value (datatype): the value of the setting
+    """
+    value = os.getenv(variable)
+    if value is None:
+        error = 'Missing {0}. The {1} trigger policy requires {0}'.format(variable, name)
+        logging.error('{0}: {1}'.format('ValueError', error))
+        raise ValueError(error)
+    try:
+        return datatype(value)
+    except ValueError:
+        error = 'Invalid {0}: \'{1}\'. The {2} trigger policy requires {0} to be a {3}'.format(
+            variable, value, name, datatype.__name__)
+        logging.error('{0}: {1}'.format('ValueError', error))
+        raise ValueError(error)
@@ -0,0 +1,167 @@
+# Copyright 2021, Battelle Energy Alliance, LLC
+
+# Python Packages
+import os
+import time
+import uuid
+import shutil
+import hashlib
+import logging
+import threading
+
+# MOOSE Modules
+import pyhit
+import moosetree
+
+# Name of the checkpoint copied into the work directory of a run that is warm-started
+RESTART_DIRECTORY_NAME = 'restart_cp'
+
+
+class CheckpointStore:
+    """
+    A store of the MOOSE checkpoints of previous runs on local disk
+
+    Each checkpoint is a directory named by the key of its template and mesh followed by the time it was stored. A
+    run is warm-started from the newest checkpoint with the same key, and the oldest checkpoints are removed once the
+    store holds more than its maximum number of checkpoints
+    """
+
+    def __init__(self, directory: str, max_checkpoints: int):
+        """
+        Args
+            directory (string): the directory of the checkpoints
+            max_checkpoints (integer): the maximum number of checkpoints kept in the store
+        """
+        self.directory = directory
+        self.max_checkpoints = max_checkpoints
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def get_key(template_file: str, mesh_key: str = None):
+        """
+        Hashes the template input file and the mesh of a run, the checkpoints of runs with the same key are compatible
+        Args
+            template_file (string): the template input file of the run
+            mesh_key (string): the key of the mesh of the run returned by mesh_reuse.get_mesh_key (optional)
+        Return
+            key (string): the hex digest of the template input file and the mesh
+        """
+        digest = hashlib.sha256()
+        with open(template_file, 'rb') as input_file:
+            digest.update(input_file.read())
+        digest.update(str(mesh_key).encode())
+        return digest.hexdigest()
+
+    def get(self, key: str, destination: str):
+        """
+        Copies the newest checkpoint with a key to a destination
+        Args
+            key (string): the key of the run
+            destination (string): the directory to copy the checkpoint to
+        Return
+            True: if a checkpoint was copied
+            False: if the store has no checkpoint with the key
+        """
+        with self._lock:
+            checkpoints = sorted(self._list(key))
+            if not checkpoints:
+                self.misses += 1
+                return False
+            shutil.copytree(checkpoints[-1][1], destination)
+            self.hits += 1
+        logging.info('Warm-start from checkpoint %s', os.path.basename(checkpoints[-1][1]))
+        return True
+
+    def put(self, key: str, source: str):
+        """
+        Copies the checkpoint directory of a run into the store
+        Args
+            key (string): the key of the run
+            source (string): the checkpoint directory written by MOOSE e.g. 'run_file_out_cp'
+        """
+        checkpoint = os.path.join(self.directory, '{0}-{1:020d}'.format(key, time.time_ns()))
+        # Copy the checkpoint to a temporary directory so a partial checkpoint is never visible
+        temp_checkpoint = os.path.join(self.directory, '.' + key + '.' + uuid.uuid4().hex)
+        shutil.copytree(source, temp_checkpoint)
+        with self._lock:
+            os.rename(temp_checkpoint, checkpoint)
+            self._prune()
+
+    def stats(self):
+        """
+        Return
+            stats (dictionary): the number of runs that were and were not warm-started
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses}
+
+    def _list(self, key: str = None):
+        """
+        Args
+            key (string): the key of the checkpoints, None for every checkpoint
+        Return
+            checkpoints (list): an array of the (time stored, path) of each checkpoint
+        """
+        checkpoints = list()
+        for name in os.listdir(self.directory):
+            checkpoint_key, separator, stored = name.rpartition('-')
+            if name.startswith('.') or not separator or (key is not None and checkpoint_key != key):
+                continue
+            checkpoints.append((int(stored), os.path.join(self.directory, name)))
+        return checkpoints
+
+    def _prune(self):
+        """
+        Removes the oldest checkpoints until the store holds its maximum number of checkpoints
+        """
+        checkpoints = sorted(self._list())
+        for stored, checkpoint in checkpoints[:max(0, len(checkpoints) - self.max_checkpoints)]:
+            shutil.rmtree(checkpoint, ignore_errors=True)
+
+
+def find_checkpoint_directory(work_directory: str):
+    """
+    Args
+        work_directory (string): the work directory of a run
+    Return
+        checkpoint_directory (string): the newest checkpoint directory written by MOOSE e.g. 'run_file_out_cp', or None
+    """
+    checkpoint_directories = [
+        os.path.join(work_directory, name) for name in os.listdir(work_directory)
+        if name.endswith('_cp') and name != RESTART_DIRECTORY_NAME and os.path.isdir(os.path.join(work_directory, name))
+    ]
+    if not checkpoint_directories:
+        return None
+    return max(checkpoint_directories, key=os.path.getmtime)
+
+
+def get_block(root: moosetree.Node, name: str):
+    """
+    Args
+        root (Node): the root node of an input file
+        name (string): the name of a top level block e.g. 'Outputs'
+    Return
+        block (Node): the block, which is added to the input file if it does not exist
+    """
+    block = moosetree.find(root, func=lambda node: node.fullpath == '/' + name)
+    if block is None:
+        block = root.append(name)
+    return block
+
+
+def enable_checkpoint(run_file: str, restart_file_base: str = None):
+    """
+    Enables the checkpoint output of an input file, and optionally starts the run from a previous checkpoint
+    Args
+        run_file (string): the input file
+        restart_file_base (string): the absolute path of the checkpoint to restart from e.g. 'restart_cp/LATEST'
+            (optional)
+    """
+    root = pyhit.load(run_file)
+    get_block(root, 'Outputs')['checkpoint'] = True
+    if restart_file_base is not None:
+        get_block(root, 'Problem')['restart_file_base'] = restart_file_base
+    pyhit.write(run_file, root)
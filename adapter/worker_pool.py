@@ -0,0 +1,93 @@
+# Copyright 2021, Battelle Energy Alliance, LLC
+
+# Python Packages
+import queue
+import logging
+import threading
+
+
+class WorkerPool:
+    """
+    A fixed number of worker threads that run jobs from a bounded queue
+    """
+
+    def __init__(self, size: int, queue_depth: int, name: str = 'worker'):
+        """
+        Args
+            size (integer): the number of worker threads
+            queue_depth (integer): the maximum number of jobs waiting for a worker
+            name (string): the prefix of the worker thread names
+        """
+        self.size = size
+        self.name = name
+        self._jobs = queue.Queue(maxsize=queue_depth)
+        self._workers = list()
+        self._running = False
+
+    def start(self):
+        """
+        Starts the worker threads
+        """
+        self._running = True
+        for i in range(self.size):
+            worker = threading.Thread(target=self._work, daemon=True, name=self.name + '_' + str(i))
+            self._workers.append(worker)
+            worker.start()
+
+    def submit(self, function, *args):
+        """
+        Adds a job to the queue without blocking
+        Args
+            function (callable): the function to run
+            *args: the arguments of the function
+        Return
+            True: if the job was queued
+            False: if the pool is not running or the queue is full
+        """
+        if not self._running:
+            return False
+        try:
+            self._jobs.put_nowait((function, args))
+        except queue.Full:
+            logging.warning('Worker pool %s is saturated with %s queued jobs', self.name, self._jobs.qsize())
+            return False
+        return True
+
+    def is_running(self):
+        return self._running
+
+    def pending(self):
+        """
+        Return
+            pending (integer): the number of jobs waiting for a worker
+        """
+        return self._jobs.qsize()
+
+    def shutdown(self, wait: bool = True):
+        """
+        Stops the worker threads once the queued jobs are done
+        Args
+            wait (boolean): whether to wait for the worker threads to exit
+        """
+        self._running = False
+        for worker in self._workers:
+            self._jobs.put((None, None))
+        if wait:
+            for worker in self._workers:
+                worker.join()
+        self._workers = list()
+
+    def _work(self):
+        """
+        Runs jobs until a stop job is received
+        """
+        while True:
+            function, args = self._jobs.get()
+            try:
+                if function is None:
+                    return
+                function(*args)
+            except Exception:
+                logging.exception('Job %s failed in worker pool %s', getattr(function, '__name__', function), self.name)
+            finally:
+                self._jobs.task_done()
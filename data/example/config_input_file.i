@@ -85,6 +85,8 @@ xmax = 3 # {{config}}
 []
 
 [Outputs]
+  exodus = true
+  csv = true
   [out]
     type = JSON
     postprocessors_as_reporters = true
@@ -0,0 +1,112 @@
+# Copyright 2021, Battelle Energy Alliance, LLC
+
+# Python Packages
+import pytest
+import os
+import logging
+
+# Repository Modules
+import adapter
+from adapter import moose_adapter
+from adapter.change_detection import ChangeDetector
+
+
+class TestChangeDetection:
+
+    log_path = 'test.log'
+    # Setup logging
+    # Remove log file if it exists
+    if os.path.exists(log_path):
+        os.remove(log_path)
+
+    logging.basicConfig(format='%(asctime)s %(levelname)s %(message)s', filename=log_path, level=logging.INFO)
+    logger = logging.getLogger('moose-adapter')
+
+    CONFIG = {
+        (None, 'xmax'): ('int', dict()),
+        ('/BCs/left', 'value'): ('float', {
+            'atol': '0.5'
+        }),
+        ('/BCs/right', 'value'): ('float', {
+            'rtol': '0.01'
+        })
+    }
+
+    def get_json_data(self, xmax, left, right):
+        return [{
+            "node": None,
+            "parameter": "xmax",
+            "value": xmax
+        }, {
+            "node": "/BCs/left",
+            "parameter": "value",
+            "value": left
+        }, {
+            "node": "/BCs/right",
+            "parameter": "value",
+            "value": right
+        }]
+
+    def test_valid_first_run(self):
+        """
+        Assert that the first run is always executed
+        Test Case (has_changed): No previous run
+        """
+        detector = ChangeDetector()
+        assert detector.has_changed(self.get_json_data(3, 300.0, 100.0), self.CONFIG) == True
+
+    def test_valid_within_tolerance(self):
+        """
+        Assert that a run within the absolute and relative tolerances is skipped and counted
+        Test Case (has_changed): Changes below atol and rtol
+        """
+        detector = ChangeDetector()
+        detector.update(self.get_json_data(3, 300.0, 100.0))
+        assert detector.has_changed(self.get_json_data(3, 300.4, 100.9), self.CONFIG) == False
+        assert detector.stats() == {'skipped': 1}
+
+    def test_valid_outside_tolerance(self):
+        """
+        Assert that a run outside of a tolerance is executed
+        Test Case (has_changed): Changes above atol, above rtol, and of a parameter without tolerances
+        """
+        detector = ChangeDetector()
+        detector.update(self.get_json_data(3, 300.0, 100.0))
+        assert detector.has_changed(self.get_json_data(3, 300.6, 100.0), self.CONFIG) == True
+        assert detector.has_changed(self.get_json_data(3, 300.0, 101.1), self.CONFIG) == True
+        assert detector.has_changed(self.get_json_data(4, 300.0, 100.0), self.CONFIG) == True
+        assert detector.stats() == {'skipped': 0}
+
+    def test_valid_rollback(self):
+        """
+        Assert that the parameters of a failed run are compared against the last successful run
+        Test Case (complete): A successful run, then a failed run, then a failed run followed by a scheduled run
+        """
+        detector = ChangeDetector()
+        detector.update(self.get_json_data(3, 300.0, 100.0))
+        detector.complete(self.get_json_data(3, 300.0, 100.0), True)
+        detector.update(self.get_json_data(3, 310.0, 100.0))
+        detector.complete(self.get_json_data(3, 310.0, 100.0), False)
+        assert detector.has_changed(self.get_json_data(3, 310.0, 100.0), self.CONFIG) == True
+        assert detector.has_changed(self.get_json_data(3, 300.0, 100.0), self.CONFIG) == False
+
+        # A run scheduled after the failed run is not rolled back
+        detector.update(self.get_json_data(3, 320.0, 100.0))
+        detector.update(self.get_json_data(3, 330.0, 100.0))
+        detector.complete(self.get_json_data(3, 320.0, 100.0), False)
+        assert detector.has_changed(self.get_json_data(3, 330.0, 100.0), self.CONFIG) == False
+
+    def test_valid_retry_after_failed_run(self, monkeypatch, tmp_path):
+        """
+        Assert that a trigger with the parameters of a failed run still runs
+        Test Case (complete_run): A failed run followed by a trigger with identical parameters
+        """
+        monkeypatch.setattr(adapter, 'change_detector', ChangeDetector())
+        json_data = self.get_json_data(3, 300.0, 100.0)
+        assert adapter.change_detector.has_changed(json_data, self.CONFIG) == True
+        adapter.change_detector.update(json_data)
+        assert adapter.change_detector.has_changed(json_data, self.CONFIG) == False
+
+        run = {"json_data": json_data, "work_directory": str(tmp_path)}
+        moose_adapter.complete_run(run, False)
+        assert adapter.change_detector.has_changed(self.get_json_data(3, 300.0, 100.0), self.CONFIG) == True
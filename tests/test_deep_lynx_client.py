@@ -0,0 +1,71 @@
+# Copyright 2021, Battelle Energy Alliance, LLC
+
+# Python Packages
+import pytest
+import os
+import time
+import logging
+import threading
+
+# Repository Modules
+from adapter.deep_lynx_client import create_api_client
+
+
+class RecordingRestClient:
+    """ Stands in for the urllib3 rest client of the api client, and records the number of concurrent requests """
+
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def GET(self, url, **kwargs):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.05)
+        with self._lock:
+            self.in_flight -= 1
+        return url
+
+
+class TestDeepLynxClient:
+
+    log_path = 'test.log'
+    # Setup logging
+    # Remove log file if it exists
+    if os.path.exists(log_path):
+        os.remove(log_path)
+
+    logging.basicConfig(format='%(asctime)s %(levelname)s %(message)s', filename=log_path, level=logging.INFO)
+    logger = logging.getLogger('moose-adapter')
+
+    def test_valid_connection_pool(self):
+        """
+        Assert that the connection pool keeps as many connections alive as requests can be in flight
+        Test Case (create_api_client): 4 requests in flight with the default and 8 explicit connections
+        """
+        api_client = create_api_client('http://localhost:8090', max_requests=4)
+        assert api_client.configuration.connection_pool_maxsize == 4
+        assert api_client.rest_client.pool_manager.connection_pool_kw['maxsize'] == 4
+        api_client = create_api_client('http://localhost:8090', max_requests=4, max_connections=8)
+        assert api_client.rest_client.pool_manager.connection_pool_kw['maxsize'] == 8
+
+    def test_valid_max_requests(self):
+        """
+        Assert that no more than max_requests requests are in flight at once
+        Test Case (request): 12 concurrent requests with a maximum of 3 requests in flight
+        """
+        api_client = create_api_client('http://localhost:8090', max_requests=3)
+        api_client.rest_client = RecordingRestClient()
+        threads = [
+            threading.Thread(target=api_client.request, args=('GET', 'http://localhost:8090/containers'))
+            for _ in range(12)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert api_client.rest_client.max_in_flight == 3
+        assert api_client.stats() == {'requests': 12, 'in_flight': 0, 'max_requests': 3}
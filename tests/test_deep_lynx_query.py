@@ -0,0 +1,194 @@
+# Copyright 2021, Battelle Energy Alliance, LLC
+
+# Python Packages
+import pytest
+import io
+import os
+import logging
+import deep_lynx
+import numpy as np
+import pandas as pd
+
+# Repository Modules
+import adapter
+from adapter import deep_lynx_query
+from adapter.deep_lynx_query import read_query_file, select_query_columns
+from adapter.ring_buffer import RingBuffer
+from adapter.segment_log import SegmentLog
+
+
+class StreamingResponse(io.BytesIO):
+    """ Stands in for the urllib3 response of a download that is not preloaded """
+
+    released = False
+
+    def release_conn(self):
+        StreamingResponse.released = True
+
+
+class FakeDataSourcesApi:
+    """ Stands in for the data sources api of Deep Lynx """
+
+    def __init__(self, api_client):
+        pass
+
+    def download_file(self, container_id, file_id, **kwargs):
+        assert kwargs['_preload_content'] is False
+        return StreamingResponse(TestDeepLynxQuery.content)
+
+
+class FakeScheduler:
+    """ Stands in for the scheduler of the MOOSE thread """
+
+    def __init__(self):
+        self.rows = 0
+
+    def notify(self, rows):
+        self.rows += rows
+
+
+class TestDeepLynxQuery:
+
+    log_path = 'test.log'
+    # Setup logging
+    # Remove log file if it exists
+    if os.path.exists(log_path):
+        os.remove(log_path)
+
+    logging.basicConfig(format='%(asctime)s %(levelname)s %(message)s', filename=log_path, level=logging.INFO)
+    logger = logging.getLogger('moose-adapter')
+
+    content = ''.join(['time,/BCs/left/value,xmax,comment\n'] +
+                      ['{0},{1},{2},row {0}\n'.format(row, row / 10, row % 3) for row in range(25)]).encode()
+
+    def test_valid_typed_columns(self, monkeypatch):
+        """
+        Assert that the declared dtypes are used and only the declared and template columns are kept
+        Test Case (read_query_file): a schema of 2 columns and 1 template column of a file with 4 columns
+        """
+        monkeypatch.setenv('QUEUE_LENGTH', '100')
+        schema = {'time': 'int32', '/BCs/left/value': 'float32'}
+        query_df, rows = read_query_file(io.BytesIO(self.content), schema=schema, columns=['xmax'])
+
+        assert rows == 25
+        assert sorted(query_df.columns) == ['/BCs/left/value', 'time', 'xmax']
+        assert query_df['time'].dtype == np.int32
+        assert query_df['/BCs/left/value'].dtype == np.float32
+
+    def test_valid_newest_rows(self, monkeypatch):
+        """
+        Assert that only the newest QUEUE_LENGTH rows of a file are kept when it is parsed in chunks
+        Test Case (read_query_file): a file of 25 rows parsed 4 rows at a time with a QUEUE_LENGTH of 10
+        """
+        monkeypatch.setenv('QUEUE_LENGTH', '10')
+        monkeypatch.setenv('QUERY_CHUNK_SIZE', '4')
+        query_df, rows = read_query_file(io.BytesIO(self.content), schema=dict())
+
+        assert rows == 25
+        assert list(query_df['time']) == list(range(15, 25))
+        assert list(query_df.columns) == ['time', '/BCs/left/value', 'xmax', 'comment']
+
+    def test_valid_download(self, monkeypatch):
+        """
+        Assert that a file is streamed from Deep Lynx and its connection is released
+        Test Case (read_file): QUERY_RETRIEVAL_MODE=download
+        """
+        monkeypatch.setattr(deep_lynx, 'DataSourcesApi', FakeDataSourcesApi)
+        monkeypatch.setenv('QUERY_RETRIEVAL_MODE', 'download')
+        monkeypatch.setenv('QUEUE_LENGTH', '10')
+        monkeypatch.setenv('CONTAINER_ID', '1')
+        monkeypatch.setenv('DATA_SOURCE_ID', '2')
+        monkeypatch.delenv('QUERY_SCHEMA_FILE_NAME', raising=False)
+        query_df, rows = deep_lynx_query.read_file('3')
+
+        assert rows == 25
+        assert query_df.shape == (10, 4)
+        assert StreamingResponse.released
+
+    def test_valid_restored_columns(self, monkeypatch):
+        """
+        Assert that files read with a schema can be appended to a queue restored from before the schema was set
+        Test Case (select_query_columns): A restored queue of 4 columns, and a schema of 2 of them and 1 new column
+        """
+        monkeypatch.setenv('QUEUE_LENGTH', '100')
+        restored, rows = read_query_file(io.BytesIO(self.content), schema=dict())
+        schema = {'time': 'int32', '/BCs/left/value': 'float32', '/BCs/right/value': 'float64'}
+        content = b'time,/BCs/left/value,/BCs/right/value,xmax\n25,2.5,100.0,1\n'
+        query_df, rows = read_query_file(io.BytesIO(content), schema=schema, columns=['xmax'])
+
+        queue_buffer = RingBuffer(100)
+        queue_buffer.append(select_query_columns(restored, schema=schema, columns=['xmax']))
+        queue_buffer.append(query_df)
+        queue_df = queue_buffer.to_dataframe()
+        assert sorted(queue_df.columns) == ['/BCs/left/value', '/BCs/right/value', 'time', 'xmax']
+        assert queue_df.shape[0] == 26
+        assert queue_df['time'].dtype == np.int32
+        assert queue_df['/BCs/right/value'].isnull().sum() == 25
+        assert select_query_columns(restored, schema=dict()) is restored
+
+    def fake_read_file(self, file_id):
+        if file_id == 'raises':
+            raise ValueError('invalid file')
+        if file_id == 'missing':
+            return None, 0
+        return pd.DataFrame({'file': [file_id, file_id]}), 2
+
+    def test_valid_file_ids(self):
+        """
+        Assert that the file ids of single events, batches of events, and lists of file ids are found in order
+        Test Case (get_file_ids): 4 payloads, 1 of which has an event without a file id
+        """
+        assert adapter.get_file_ids({'query': {'fileID': 1}}) == ['1']
+        assert adapter.get_file_ids({'query': {'fileID': [1, 2]}}) == ['1', '2']
+        assert adapter.get_file_ids([{'query': {'fileID': 3}}, {'query': {}}, {'query': {'fileID': [4]}}]) == ['3', '4']
+        assert adapter.get_file_ids({'received': True}) == list()
+
+    def test_valid_partial_batch(self, monkeypatch):
+        """
+        Assert that the files of a batch that are read are queued when other files of the batch fail
+        Test Case (query_deep_lynx_batch): 4 files, 1 of which raises and 1 of which cannot be retrieved
+        """
+        queued = list()
+        monkeypatch.setattr(deep_lynx_query, 'read_file', self.fake_read_file)
+        monkeypatch.setattr(deep_lynx_query, 'queue', lambda query_df, rows: queued.append((query_df, rows)))
+        failed_file_ids = deep_lynx_query.query_deep_lynx_batch(['1', 'raises', 'missing', '2'])
+
+        assert failed_file_ids == ['raises', 'missing']
+        assert len(queued) == 1
+        assert list(queued[0][0]['file']) == ['1', '1', '2', '2']
+        assert queued[0][1] == 4
+
+    def test_valid_process_event(self, monkeypatch):
+        """
+        Assert that a single file is queued on its own and that a batch of files is queued in a single append
+        Test Case (process_event): 1 file, then a batch of 3 files
+        """
+        queued = list()
+        monkeypatch.setattr(deep_lynx_query, 'read_file', self.fake_read_file)
+        monkeypatch.setattr(deep_lynx_query, 'queue', lambda query_df, rows: queued.append((query_df, rows)))
+        adapter.process_event(['1'])
+        adapter.process_event(['2', '3', '4'])
+
+        assert [rows for query_df, rows in queued] == [2, 6]
+        assert list(queued[1][0]['file']) == ['2', '2', '3', '3', '4', '4']
+
+    def test_invalid_queue_columns(self, monkeypatch, tmp_path):
+        """
+        Assert that rows missing a column of the queue are neither queued nor written to the queue log
+        Test Case (queue): 1 file with every column, then 1 file missing a column
+        """
+        monkeypatch.setattr(adapter, 'queue_buffer', RingBuffer(10))
+        monkeypatch.setattr(adapter, 'queue_log', SegmentLog(str(tmp_path), 10))
+        monkeypatch.setattr(adapter, 'scheduler', FakeScheduler())
+        monkeypatch.delenv('QUEUE_CHECKPOINT_SECONDS', raising=False)
+        adapter.queue_log.recover()
+        deep_lynx_query.queue(pd.DataFrame({'time': [1, 2], 'xmax': [3, 4]}))
+        with pytest.raises(KeyError):
+            deep_lynx_query.queue(pd.DataFrame({'time': [3], 'comment': ['no xmax']}))
+        adapter.queue_log.close()
+
+        assert list(adapter.queue_buffer.to_dataframe()['time']) == [1, 2]
+        assert adapter.scheduler.rows == 2
+        queue_df = SegmentLog(str(tmp_path), 10).recover()
+        assert list(queue_df.columns) == ['time', 'xmax']
+        assert list(queue_df['time']) == [1, 2]
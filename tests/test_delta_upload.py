@@ -0,0 +1,155 @@
+# Copyright 2021, Battelle Energy Alliance, LLC
+
+# Python Packages
+import pytest
+import os
+import json
+import logging
+import deep_lynx
+import pandas as pd
+
+# Repository Modules
+from adapter.deep_lynx_import import import_to_deep_lynx
+from adapter.delta_upload import DeltaUploader, get_delta, read_results, CHANGE_COLUMN
+
+
+class FakeDataSourcesApi:
+    """ Stands in for the data sources api of Deep Lynx, which responds with the next of its responses """
+
+    responses = list()
+
+    def __init__(self, api_client):
+        pass
+
+    def upload_file(self, container_id, data_source_id, file=None, metadata=None, async_req=None):
+        return FakeDataSourcesApi.responses.pop(0)
+
+
+class TestDeltaUpload:
+
+    log_path = 'test.log'
+    # Setup logging
+    # Remove log file if it exists
+    if os.path.exists(log_path):
+        os.remove(log_path)
+
+    logging.basicConfig(format='%(asctime)s %(levelname)s %(message)s', filename=log_path, level=logging.INFO)
+    logger = logging.getLogger('moose-adapter')
+
+    def create_results(self, values):
+        return pd.DataFrame({
+            'source': 'run_file_out.e',
+            'variable': 'u',
+            'time_step': 1,
+            'time': 1.0,
+            'index': range(len(values)),
+            'value': values
+        })
+
+    def test_valid_delta(self):
+        """
+        Assert that only rows that changed beyond the tolerance, new rows, and removed rows are in the delta
+        Test Case (get_delta): 1 row within the tolerance, 1 changed row, 1 new row, and 1 removed row
+        """
+        baseline = self.create_results([1.0, 2.0, 3.0])
+        results = self.create_results([1.0001, 2.5, 3.0, 4.0]).iloc[[0, 1, 3]].reset_index(drop=True)
+        delta, new_baseline = get_delta(results, baseline, ['source', 'variable', 'time_step', 'index'], 0.001, 0.0)
+
+        upserted = delta[delta[CHANGE_COLUMN] == 'upsert']
+        deleted = delta[delta[CHANGE_COLUMN] == 'delete']
+        assert list(upserted['index']) == [1, 3]
+        assert list(upserted['value']) == [2.5, 4.0]
+        assert list(deleted['index']) == [2]
+        # The row within the tolerance keeps the value last uploaded
+        assert sorted(zip(new_baseline['index'], new_baseline['value'])) == [(0, 1.0), (1, 2.5), (3, 4.0)]
+
+    def test_valid_duplicate_keys(self, tmp_path):
+        """
+        Assert that results whose key columns are not unique are uploaded in full instead of failing
+        Test Case (get_delta, upload): A baseline and results with 2 rows of the same key
+        """
+        baseline = self.create_results([1.0, 2.0]).assign(index=0)
+        delta, new_baseline = get_delta(baseline, baseline, ['source', 'variable', 'time_step', 'index'], 0.0, 0.0)
+        assert list(delta[CHANGE_COLUMN]) == ['upsert', 'upsert']
+        assert new_baseline.shape[0] == 2
+
+        manifests = list()
+
+        def upload(import_file, upload_files):
+            with open(upload_files[1], 'r') as manifest_file:
+                manifests.append(json.load(manifest_file))
+            return True
+
+        uploader = DeltaUploader(os.path.join(tmp_path, 'baseline'))
+        import_file = os.path.join(tmp_path, 'import_file.csv')
+        baseline.to_csv(import_file, index=False)
+        assert uploader.upload(import_file, upload)
+        assert uploader.upload(import_file, upload)
+        assert [manifest['is_delta'] for manifest in manifests] == [False, False]
+        assert manifests[1]['upserted'] == 2
+
+    def test_valid_upload(self, tmp_path):
+        """
+        Assert that the first upload has every row, and that unchanged results are not uploaded again
+        Test Case (upload): 3 uploads, the second with the same results and the third with 1 changed row
+        """
+        uploads = list()
+
+        def upload(import_file, upload_files):
+            with open(upload_files[1], 'r') as manifest_file:
+                uploads.append((read_results(upload_files[0]), json.load(manifest_file)))
+            return True
+
+        uploader = DeltaUploader(os.path.join(tmp_path, 'baseline'), rtol=0.01)
+        import_file = os.path.join(tmp_path, 'import_file.csv')
+        self.create_results([1.0, 2.0, 3.0]).to_csv(import_file, index=False)
+        assert uploader.upload(import_file, upload)
+        assert uploader.upload(import_file, upload)
+        self.create_results([1.0, 2.0, 3.5]).to_csv(import_file, index=False)
+        assert uploader.upload(import_file, upload)
+
+        assert len(uploads) == 2
+        assert not uploads[0][1]['is_delta'] and uploads[0][1]['upserted'] == 3
+        assert uploads[1][1]['is_delta'] and uploads[1][1]['upserted'] == 1 and uploads[1][1]['deleted'] == 0
+        assert list(uploads[1][0]['value']) == [3.5]
+        assert uploader.stats() == {'uploaded_rows': 4, 'skipped_rows': 5}
+
+    def test_invalid_upload(self, tmp_path):
+        """
+        Assert that the baseline is not updated when the upload fails
+        Test Case (upload): 1 failed upload followed by 1 upload
+        """
+        uploads = list()
+        uploader = DeltaUploader(os.path.join(tmp_path, 'baseline'))
+        import_file = os.path.join(tmp_path, 'import_file.csv')
+        self.create_results([1.0, 2.0]).to_csv(import_file, index=False)
+
+        assert not uploader.upload(import_file, lambda import_file, upload_files: False)
+        assert uploader.upload(import_file, lambda import_file, upload_files: uploads.append(upload_files) or True)
+        assert len(uploads) == 1
+        assert os.path.exists(uploader.get_baseline_file(import_file))
+
+    def test_invalid_import(self, tmp_path, monkeypatch):
+        """
+        Assert that the baseline is not updated when Deep Lynx does not import the changed rows
+        Test Case (import_to_deep_lynx, upload): 1 import, then 1 changed row that responds with an error and 1 that
+            responds without a value
+        """
+        monkeypatch.setattr(deep_lynx, 'DataSourcesApi', FakeDataSourcesApi)
+        imported = {'isError': False, 'value': [{'id': '1'}]}
+        failed = {'isError': True}
+        empty = {'isError': False, 'value': []}
+        monkeypatch.setattr(FakeDataSourcesApi, 'responses', [imported, failed, empty])
+        monkeypatch.setenv('CONTAINER_ID', '1')
+        monkeypatch.setenv('DATA_SOURCE_ID', '2')
+        monkeypatch.setenv('IMPORT_FILE_WAIT_SECONDS', '1')
+        uploader = DeltaUploader(os.path.join(tmp_path, 'baseline'))
+        import_file = os.path.join(tmp_path, 'import_file.csv')
+        self.create_results([1.0, 2.0]).to_csv(import_file, index=False)
+        assert uploader.upload(import_file, import_to_deep_lynx)
+
+        self.create_results([1.0, 2.5]).to_csv(import_file, index=False)
+        assert not uploader.upload(import_file, import_to_deep_lynx)
+        assert not uploader.upload(import_file, import_to_deep_lynx)
+        assert list(read_results(uploader.get_baseline_file(import_file))['value']) == [1.0, 2.0]
+        assert uploader.stats()['uploaded_rows'] == 2
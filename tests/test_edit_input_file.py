@@ -4,6 +4,7 @@
 import pytest
 import os
 import logging
+import pandas as pd
 
 # Repository Modules
 from adapter import edit_input_file
@@ -57,6 +58,30 @@ class TestEditInputFile:
             not_exist = json_data[i].get('city', 'not exist')
             assert not_exist == 'not exist'
 
+    def test_valid_queue_values(self):
+        """
+        Assert that the values of the newest row of the queue are converted to the datatypes of their parameters
+        Test Case (get_json_data): Integer, float, and boolean values read from a csv file as strings and floats
+        """
+        config = {(None, 'xmax'): ('int', dict()), ('/A', 'value'): ('float', dict()), (None, 'flag'): ('bool', dict())}
+        queue_df = pd.DataFrame({'xmax': [1.0, 3.0], '/A/value': ['1', '2.5'], 'flag': ['True', 'False']})
+        json_data = edit_input_file.get_json_data(queue_df, config)
+        assert [json_object['value'] for json_object in json_data] == [3, 2.5, False]
+        assert isinstance(json_data[0]['value'], int)
+
+    @pytest.mark.parametrize('column, value', [('xmax', float('nan')), ('xmax', 2.5), ('/A/value', 'high'),
+                                               ('flag', 'maybe')])
+    def test_invalid_queue_values(self, column, value):
+        """
+        Assert that a missing value or a value that is not of the datatype of its parameter raises a ValueError
+        Test Case (get_json_data): A missing integer, a fractional integer, a non-numeric float, and an invalid boolean
+        """
+        config = {(None, 'xmax'): ('int', dict()), ('/A', 'value'): ('float', dict()), (None, 'flag'): ('bool', dict())}
+        row = {'xmax': 3, '/A/value': 2.5, 'flag': True}
+        row[column] = value
+        with pytest.raises(ValueError):
+            edit_input_file.get_json_data(pd.DataFrame([row]), config)
+
     def test_invalid_node(self):
         """
         Assert that an incorrect json object is provided 
@@ -0,0 +1,71 @@
+# Copyright 2021, Battelle Energy Alliance, LLC
+
+# Python Packages
+import pytest
+import os
+import time
+import logging
+import threading
+
+# Repository Modules
+from adapter import file_watcher
+from adapter.file_watcher import wait_for_file
+
+
+class TestFileWatcher:
+
+    log_path = 'test.log'
+    # Setup logging
+    # Remove log file if it exists
+    if os.path.exists(log_path):
+        os.remove(log_path)
+
+    logging.basicConfig(format='%(asctime)s %(levelname)s %(message)s', filename=log_path, level=logging.INFO)
+    logger = logging.getLogger('moose-adapter')
+
+    def write_later(self, file_name, seconds):
+        timer = threading.Timer(seconds, lambda: open(file_name, 'w').close())
+        timer.start()
+        return timer
+
+    @pytest.fixture(params=['inotify', 'poll'])
+    def watcher(self, request, monkeypatch):
+        if request.param == 'inotify':
+            pytest.importorskip('inotify_simple')
+        else:
+            monkeypatch.setattr(file_watcher, 'inotify_simple', None)
+        return request.param
+
+    def test_valid_file_created(self, tmp_path, watcher):
+        """
+        Assert that a file is found soon after it is created, long before the timeout
+        Test Case (wait_for_file): a file created after 0.2 seconds with a timeout of 30 seconds
+        """
+        file_name = os.path.join(tmp_path, 'import_file.csv')
+        timer = self.write_later(file_name, 0.2)
+        start = time.monotonic()
+        assert wait_for_file(file_name, 30, max_interval=0.1)
+        assert time.monotonic() - start < 5
+        timer.join()
+
+    def test_invalid_file_timeout(self, tmp_path, watcher):
+        """
+        Assert that a file that is never created is not found after the timeout
+        Test Case (wait_for_file): no file with a timeout of 0.3 seconds
+        """
+        start = time.monotonic()
+        assert not wait_for_file(os.path.join(tmp_path, 'import_file.csv'), 0.3, max_interval=0.1)
+        assert time.monotonic() - start >= 0.3
+
+    def test_invalid_file_done(self, tmp_path, watcher):
+        """
+        Assert that a file is not waited for once its producer finished without creating it
+        Test Case (wait_for_file): no file and a producer that finished after 0.2 seconds with a timeout of 30 seconds
+        """
+        done = threading.Event()
+        timer = threading.Timer(0.2, done.set)
+        timer.start()
+        start = time.monotonic()
+        assert not wait_for_file(os.path.join(tmp_path, 'import_file.csv'), 30, done=done, max_interval=0.1)
+        assert time.monotonic() - start < 5
+        timer.join()
@@ -0,0 +1,132 @@
+# Copyright 2021, Battelle Energy Alliance, LLC
+
+# Python Packages
+import pytest
+import os
+import time
+import logging
+import pandas as pd
+
+# Repository Modules
+import adapter
+from adapter import deep_lynx_query
+from adapter.idempotency_cache import IdempotencyCache
+
+
+class TestIdempotencyCache:
+
+    log_path = 'test.log'
+    # Setup logging
+    # Remove log file if it exists
+    if os.path.exists(log_path):
+        os.remove(log_path)
+
+    logging.basicConfig(format='%(asctime)s %(levelname)s %(message)s', filename=log_path, level=logging.INFO)
+    logger = logging.getLogger('moose-adapter')
+
+    EVENT_CACHE_FILE_NAME = os.path.join('tests', 'test_files', 'test_event_cache.json')
+
+    def test_valid_duplicate(self):
+        """
+        Assert that a key seen before is reported as a duplicate and counted
+        Test Case (check_and_add): Repeated key
+        """
+        cache = IdempotencyCache(10, 60)
+        assert cache.check_and_add('1') == False
+        assert cache.check_and_add('1') == True
+        assert cache.check_and_add('2') == False
+        assert cache.stats() == {'size': 2, 'hits': 1, 'misses': 2}
+
+    def test_valid_eviction(self):
+        """
+        Assert that the least recently used key is evicted once the cache is full
+        Test Case (check_and_add): Keys added past the capacity
+        """
+        cache = IdempotencyCache(2, 60)
+        cache.check_and_add('1')
+        cache.check_and_add('2')
+        cache.check_and_add('1')
+        cache.check_and_add('3')
+        assert cache.check_and_add('1') == True
+        assert cache.check_and_add('2') == False
+
+    def test_valid_expiry(self):
+        """
+        Assert that a key is no longer a duplicate after its time to live
+        Test Case (check_and_add): Expired key
+        """
+        cache = IdempotencyCache(10, 0.01)
+        cache.check_and_add('1')
+        time.sleep(0.02)
+        assert cache.check_and_add('1') == False
+
+    def test_valid_discard(self):
+        """
+        Assert that a discarded key is not a duplicate
+        Test Case (discard): Key of an event that could not be scheduled
+        """
+        cache = IdempotencyCache(10, 60)
+        cache.check_and_add('1')
+        cache.discard('1')
+        assert cache.check_and_add('1') == False
+
+    def test_valid_persistence(self):
+        """
+        Assert that keys are restored from the json file
+        Test Case (check_and_add, _load): Restart of the adapter
+        """
+        cache = IdempotencyCache(10, 60, file_name=self.EVENT_CACHE_FILE_NAME, save_seconds=0)
+        cache.check_and_add('1')
+        restored = IdempotencyCache(10, 60, file_name=self.EVENT_CACHE_FILE_NAME)
+        is_duplicate = restored.check_and_add('1')
+        os.remove(self.EVENT_CACHE_FILE_NAME)
+        assert is_duplicate == True
+
+    def test_valid_persisted_discard(self):
+        """
+        Assert that a discarded key is not restored from the json file
+        Test Case (discard, _load): Restart of the adapter within save_seconds of the discard
+        """
+        cache = IdempotencyCache(10, 60, file_name=self.EVENT_CACHE_FILE_NAME, save_seconds=0)
+        cache.check_and_add('1')
+        cache.check_and_add('2')
+        cache.save_seconds = 60
+        cache.discard('1')
+        restored = IdempotencyCache(10, 60, file_name=self.EVENT_CACHE_FILE_NAME)
+        is_duplicate = [restored.check_and_add('1'), restored.check_and_add('2')]
+        os.remove(self.EVENT_CACHE_FILE_NAME)
+        assert is_duplicate == [False, True]
+
+    def test_valid_retry_after_failure(self, monkeypatch):
+        """
+        Assert that a redelivered event is processed when the first delivery failed after it was received
+        Test Case (process_event): A file that cannot be read, then the same file once it can be read
+        """
+        queued = list()
+        readable = list()
+
+        def read_file(file_id):
+            if file_id not in readable:
+                raise ValueError('file is not available')
+            return pd.DataFrame({'file': [file_id]}), 1
+
+        monkeypatch.setattr(adapter, 'event_cache', IdempotencyCache(10, 60))
+        monkeypatch.setattr(deep_lynx_query, 'read_file', read_file)
+        monkeypatch.setattr(deep_lynx_query, 'queue', lambda query_df, rows: queued.append(rows))
+
+        assert adapter.event_cache.check_and_add('1') == False
+        with pytest.raises(ValueError):
+            adapter.process_event(['1'])
+        assert adapter.event_cache.check_and_add('1') == False
+        readable.append('1')
+        adapter.process_event(['1'])
+        assert adapter.event_cache.check_and_add('1') == True
+
+        # Only the file of a batch that failed is processed again
+        adapter.event_cache.check_and_add('2')
+        adapter.event_cache.check_and_add('3')
+        readable.append('2')
+        adapter.process_event(['2', '3'])
+        assert adapter.event_cache.check_and_add('2') == True
+        assert adapter.event_cache.check_and_add('3') == False
+        assert queued == [1, 1]
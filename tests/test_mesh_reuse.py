@@ -0,0 +1,81 @@
+# Copyright 2021, Battelle Energy Alliance, LLC
+
+# Python Packages
+import pytest
+import os
+import logging
+
+# Repository Modules
+from adapter.mesh_reuse import get_mesh_key, get_mesh_node, use_mesh_file
+
+# MOOSE Modules
+import pyhit
+import moosetree
+
+
+class TestMeshReuse:
+
+    log_path = 'test.log'
+    # Setup logging
+    # Remove log file if it exists
+    if os.path.exists(log_path):
+        os.remove(log_path)
+
+    logging.basicConfig(format='%(asctime)s %(levelname)s %(message)s', filename=log_path, level=logging.INFO)
+    logger = logging.getLogger('moose-adapter')
+
+    INPUT_FILE = '\n'.join([
+        'xmax = {xmax}', '[Mesh]', '  uniform_refine = 1', '  final_generator = gen', '  [gen]',
+        '    type = GeneratedMeshGenerator', '    dim = 1', '    nx = {nx}', '    xmax = ${{xmax}}', '  []', '[]',
+        '[BCs]', '  [left]', '    type = DirichletBC', '    variable = u', '    boundary = left', '    value = {left}',
+        '  []', '[]', ''
+    ])
+
+    def write_input_file(self, tmp_path, name, xmax=3, nx=100, left=300):
+        run_file = os.path.join(tmp_path, name)
+        with open(run_file, 'w') as input_file:
+            input_file.write(self.INPUT_FILE.format(xmax=xmax, nx=nx, left=left))
+        return run_file
+
+    def test_valid_mesh_key(self, tmp_path):
+        """
+        Assert that only changes to the mesh parameters change the key of the mesh
+        Test Case (get_mesh_key): Changes to a boundary condition, a mesh parameter, and a global variable of the mesh
+        """
+        key = get_mesh_key(self.write_input_file(tmp_path, 'base.i'))
+        assert get_mesh_key(self.write_input_file(tmp_path, 'left.i', left=400)) == key
+        assert get_mesh_key(self.write_input_file(tmp_path, 'nx.i', nx=200)) != key
+        assert get_mesh_key(self.write_input_file(tmp_path, 'xmax.i', xmax=4)) != key
+
+    def test_valid_use_mesh_file(self, tmp_path):
+        """
+        Assert that the mesh generators are replaced by a FileMeshGenerator and the other parameters and blocks are
+        unchanged
+        Test Case (use_mesh_file): Input file with a GeneratedMeshGenerator, uniform_refine, and final_generator
+        """
+        run_file = self.write_input_file(tmp_path, 'run.i')
+        use_mesh_file(run_file, 'mesh.e')
+        root = pyhit.load(run_file)
+        mesh = get_mesh_node(root)
+        assert dict(mesh.params()) == {'uniform_refine': 1}
+        assert [child.name for child in mesh.children] == ['file']
+        assert mesh.children[0]['type'] == 'FileMeshGenerator'
+        assert mesh.children[0]['file'] == 'mesh.e'
+        assert moosetree.find(root, func=lambda node: node.fullpath == '/BCs/left')['value'] == 300
+
+    def test_valid_use_mesh_file_legacy(self, tmp_path):
+        """
+        Assert that the generation parameters of a mesh of the legacy syntax are removed and the others are kept
+        Test Case (use_mesh_file): Input file with a GeneratedMesh, second_order, parallel_type, and a Partitioner
+        """
+        run_file = os.path.join(tmp_path, 'run.i')
+        with open(run_file, 'w') as input_file:
+            input_file.write('\n'.join([
+                '[Mesh]', '  type = GeneratedMesh', '  dim = 1', '  nx = 100', '  second_order = true',
+                '  parallel_type = replicated', '  [Partitioner]', '    type = LibmeshPartitioner', '  []', '[]', ''
+            ]))
+        use_mesh_file(run_file, 'mesh.e')
+        mesh = get_mesh_node(pyhit.load(run_file))
+        assert dict(mesh.params()) == {'second_order': True, 'parallel_type': 'replicated'}
+        assert [child.name for child in mesh.children] == ['Partitioner', 'file']
+        assert mesh.children[1]['type'] == 'FileMeshGenerator'
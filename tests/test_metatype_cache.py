@@ -0,0 +1,191 @@
+# Copyright 2021, Battelle Energy Alliance, LLC
+
+# Python Packages
+import pytest
+import os
+import logging
+import threading
+import deep_lynx
+from types import SimpleNamespace
+
+# Repository Modules
+import adapter
+from adapter.metatype_cache import MetatypeRegistry, get_key_schema, is_local, validate_nodes
+from adapter.deep_lynx_import import validate_payload
+
+
+def create_key(property_name, data_type, required=False, options=None, regex=None, min=None, max=None):
+    return SimpleNamespace(property_name=property_name,
+                           data_type=data_type,
+                           required=required,
+                           options=options,
+                           validation=deep_lynx.KeyValidation(regex=regex, min=min, max=max))
+
+
+class FakeMetatypesApi:
+    """ Stands in for the metatypes api of Deep Lynx with a Sensor metatype """
+
+    list_calls = 0
+    validate_calls = 0
+
+    def __init__(self, api_client):
+        pass
+
+    def list_metatypes(self, container_id, name=None, load_keys=None):
+        FakeMetatypesApi.list_calls += 1
+        keys = [
+            create_key('id', 'string', required=True, regex='^S-'),
+            create_key('temperature', 'float', required=True, min=0, max=1000),
+            create_key('count', 'number'),
+            create_key('active', 'boolean'),
+            create_key('state', 'enumeration', options=['on', 'off']),
+            create_key('installed', 'date')
+        ]
+        metatypes = [
+            SimpleNamespace(name='Sensor Array', id='2', keys=list()),
+            SimpleNamespace(name='Sensor', id='1', keys=keys)
+        ]
+        return SimpleNamespace(is_error=False, value=[metatype for metatype in metatypes if name in metatype.name])
+
+    def validate_metatype_properties(self, container_id, metatype_id, body=None):
+        FakeMetatypesApi.validate_calls += 1
+        return SimpleNamespace(is_error=False, value=None)
+
+
+class FlakyMetatypesApi(FakeMetatypesApi):
+    """ Stands in for the metatypes api of Deep Lynx that fails before it responds, and blocks for a Slow metatype """
+
+    failures = list()
+    release = threading.Event()
+
+    def list_metatypes(self, container_id, name=None, load_keys=None):
+        if name == 'Slow':
+            FlakyMetatypesApi.release.wait(5)
+        if FlakyMetatypesApi.failures:
+            FakeMetatypesApi.list_calls += 1
+            failure = FlakyMetatypesApi.failures.pop(0)
+            if failure == 'raise':
+                raise deep_lynx.rest.ApiException(status=503, reason='Service Unavailable')
+            return SimpleNamespace(is_error=True, value=None)
+        return super().list_metatypes(container_id, name=name, load_keys=load_keys)
+
+
+class TestMetatypeCache:
+
+    log_path = 'test.log'
+    # Setup logging
+    # Remove log file if it exists
+    if os.path.exists(log_path):
+        os.remove(log_path)
+
+    logging.basicConfig(format='%(asctime)s %(levelname)s %(message)s', filename=log_path, level=logging.INFO)
+    logger = logging.getLogger('moose-adapter')
+
+    def create_node(self, index):
+        return {
+            'id': 'S-{0}'.format(index),
+            'temperature': 300.0 + index % 100,
+            'count': index,
+            'active': True,
+            'state': 'on',
+            'installed': '2021-11-16T00:00:00Z'
+        }
+
+    def test_valid_schema_cache(self, monkeypatch):
+        """
+        Assert that the schema of a metatype is loaded once until its ttl expires
+        Test Case (get): 3 uses of a metatype with a ttl of 1 hour, and 1 use after it is invalidated
+        """
+        monkeypatch.setattr(deep_lynx, 'MetatypesApi', FakeMetatypesApi)
+        FakeMetatypesApi.list_calls = 0
+        registry = MetatypeRegistry(None, '1', ttl_seconds=3600)
+        for _ in range(3):
+            schema = registry.get('Sensor')
+        assert schema['id'] == '1'
+        assert FakeMetatypesApi.list_calls == 1
+        registry.invalidate('Sensor')
+        registry.get('Sensor')
+        assert FakeMetatypesApi.list_calls == 2
+        assert registry.stats() == {'size': 1, 'hits': 2, 'misses': 2}
+
+    def test_invalid_nodes(self, monkeypatch):
+        """
+        Assert that the invalid properties of a batch of nodes are found
+        Test Case (validate_nodes): 1 valid node and 6 nodes with 1 invalid property each
+        """
+        monkeypatch.setattr(deep_lynx, 'MetatypesApi', FakeMetatypesApi)
+        schema = MetatypeRegistry(None, '1').get('Sensor')
+        nodes = [self.create_node(index) for index in range(7)]
+        nodes[1]['id'] = 'T-1'
+        nodes[2]['temperature'] = 1001.0
+        del nodes[3]['temperature']
+        nodes[4]['count'] = 1.5
+        nodes[5]['state'] = 'broken'
+        nodes[6]['installed'] = 'yesterday'
+        errors = validate_nodes('Sensor', schema, nodes)
+
+        assert len(errors) == 6
+        assert [error.split(' ')[2] for error in errors] == ['1', '2', '3', '4', '5', '6']
+
+    def test_valid_remote_types(self, monkeypatch):
+        """
+        Assert that a metatype with a key that cannot be validated locally, e.g. a file, is validated by Deep Lynx
+        Test Case (is_local): The Sensor metatype, with and without a file key
+        """
+        monkeypatch.setattr(deep_lynx, 'MetatypesApi', FakeMetatypesApi)
+        schema = MetatypeRegistry(None, '1').get('Sensor')
+        assert is_local(schema)
+        schema['keys']['report'] = get_key_schema(create_key('report', 'file'))
+        assert not is_local(schema)
+
+    def test_valid_payload(self, monkeypatch):
+        """
+        Assert that a large payload is validated locally with a single request to Deep Lynx
+        Test Case (validate_payload): 10000 nodes of 1 metatype
+        """
+        monkeypatch.setattr(deep_lynx, 'MetatypesApi', FakeMetatypesApi)
+        monkeypatch.setattr(adapter, 'metatype_registry', MetatypeRegistry(None, '1'))
+        monkeypatch.setenv('CONTAINER_ID', '1')
+        monkeypatch.setenv('DATA_SOURCE_ID', '2')
+        FakeMetatypesApi.list_calls = 0
+        FakeMetatypesApi.validate_calls = 0
+
+        assert validate_payload({'Sensor': [self.create_node(index) for index in range(10000)]})
+        assert not validate_payload({'Sensor': [{'id': 'S-1'}]})
+        assert FakeMetatypesApi.list_calls == 1
+        assert FakeMetatypesApi.validate_calls == 0
+
+    def test_invalid_load(self, monkeypatch):
+        """
+        Assert that a schema that could not be loaded is not cached
+        Test Case (get): A failed response, an exception, and a metatype that does not exist, then a loaded schema
+        """
+        monkeypatch.setattr(deep_lynx, 'MetatypesApi', FlakyMetatypesApi)
+        monkeypatch.setattr(FlakyMetatypesApi, 'failures', ['error', 'raise'])
+        FakeMetatypesApi.list_calls = 0
+        registry = MetatypeRegistry(None, '1')
+        assert registry.get('Sensor') is None
+        assert registry.get('Sensor') is None
+        assert registry.get('Pump') is None
+        assert registry.get('Pump') is None
+        assert registry.get('Sensor')['id'] == '1'
+        assert registry.get('Sensor')['id'] == '1'
+        assert FakeMetatypesApi.list_calls == 5
+        assert registry.stats()['size'] == 1
+
+    def test_valid_concurrent_load(self, monkeypatch):
+        """
+        Assert that a slow request for the schema of a metatype does not block the schemas of other metatypes
+        Test Case (get): A Slow metatype that is loading while the Sensor metatype is requested
+        """
+        monkeypatch.setattr(deep_lynx, 'MetatypesApi', FlakyMetatypesApi)
+        monkeypatch.setattr(FlakyMetatypesApi, 'release', threading.Event())
+        registry = MetatypeRegistry(None, '1')
+        thread = threading.Thread(target=registry.get, args=('Slow', ))
+        thread.start()
+        while registry.stats()['misses'] == 0:
+            pass
+        assert registry.get('Sensor')['id'] == '1'
+        assert thread.is_alive()
+        FlakyMetatypesApi.release.set()
+        thread.join(5)
@@ -3,10 +3,12 @@
 # Python Packages
 import pytest
 import os
+import sys
 import logging
+import configparser
 
 # Repository Modules
-from adapter import moose_adapter
+from adapter import moose_adapter, template_parser
 import settings
 
 
@@ -52,4 +54,19 @@ class TestMOOSEAdapter:
         # Invalid moose executable path
         os.environ['MOOSE_OPT_PATH'] = os.path.join('~', 'projects', 'moose', 'moose_test-opt')
         with pytest.raises(FileNotFoundError):
-            moose_adapter.run_input_file()
\ No newline at end of file
+            moose_adapter.run_input_file()
+
+    def test_valid_create_config_file(self, monkeypatch, tmp_path):
+        """
+        Validate that the configuration file is generated without parsing the arguments of the Flask process
+        Test Case (create_config_file): Flask started with the host option -h
+        """
+        config_file = os.path.join(tmp_path, 'config_file.cfg')
+        monkeypatch.setattr(sys, 'argv', ['flask', 'run', '-h', '0.0.0.0'])
+        monkeypatch.setattr(template_parser, 'get_config_parameters', lambda input_file: {'Mesh': {'xmax': 'float'}})
+        monkeypatch.setenv('TEMPLATE_INPUT_FILE_NAME', self.TEMPLATE_INPUT_FILE_NAME)
+        monkeypatch.setenv('CONFIG_FILE_NAME', config_file)
+        assert moose_adapter.create_config_file() == True
+        config = configparser.ConfigParser()
+        config.read(config_file)
+        assert config['Mesh']['xmax'] == 'float'
@@ -0,0 +1,90 @@
+# Copyright 2021, Battelle Energy Alliance, LLC
+
+# Python Packages
+import pytest
+import os
+import sys
+import time
+import logging
+import pandas as pd
+
+# Repository Modules
+from adapter.moose_process import run_process, UsageRecorder
+
+
+class TestMOOSEProcess:
+
+    log_path = 'test.log'
+    # Setup logging
+    # Remove log file if it exists
+    if os.path.exists(log_path):
+        os.remove(log_path)
+
+    logging.basicConfig(format='%(asctime)s %(levelname)s %(message)s', filename=log_path, level=logging.INFO)
+    logger = logging.getLogger('moose-adapter')
+
+    def test_valid_run_process(self):
+        """
+        Assert that the return code and resource usage of a process are returned
+        Test Case (run_process): Process that allocates memory and exits
+        """
+        return_code, usage = run_process([sys.executable, '-c', 'x = bytearray(64 * 1024 * 1024)'], timeout=60)
+        assert return_code == 0
+        assert usage['timed_out'] == False
+        assert usage['max_rss_bytes'] >= 64 * 1024 * 1024
+        assert usage['cpu_seconds'] > 0
+
+    def test_invalid_timeout(self):
+        """
+        Assert that a process and the processes it started are killed once the timeout expires
+        Test Case (run_process): Process that starts a child and sleeps beyond the timeout
+        """
+        script = ('import subprocess, sys, time; '
+                  'subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"]); '
+                  'time.sleep(60)')
+        start = time.time()
+        return_code, usage = run_process([sys.executable, '-c', script], timeout=0.5, grace_seconds=1)
+        assert time.time() - start < 10
+        assert usage['timed_out'] == True
+        assert return_code < 0
+
+    def test_invalid_memory_limit(self):
+        """
+        Assert that a process fails when it exceeds its memory limit
+        Test Case (run_process): Process that allocates more than the memory limit
+        """
+        return_code, usage = run_process([sys.executable, '-c', 'x = bytearray(1024 * 1024 * 1024)'],
+                                         memory_bytes=512 * 1024 * 1024)
+        assert return_code != 0
+        assert usage['timed_out'] == False
+
+    def test_valid_inherited_limits(self):
+        """
+        Assert that the resource limits are set before the command starts, so the processes it starts inherit them
+        Test Case (run_process): Process that starts a child at once, which checks its CPU time limit
+        """
+        check = 'import resource, sys; sys.exit(0 if resource.getrlimit(resource.RLIMIT_CPU)[0] == 30 else 1)'
+        script = 'import subprocess, sys; sys.exit(subprocess.call([sys.executable, "-c", {0!r}]))'.format(check)
+        return_code, usage = run_process([sys.executable, '-c', script], cpu_seconds=30)
+        assert return_code == 0
+        return_code, usage = run_process(['moose-missing-opt'], cpu_seconds=30)
+        assert return_code == 127
+
+    def test_valid_usage_recorder(self, tmp_path):
+        """
+        Assert that the resource usage of each run is aggregated and appended to the usage file
+        Test Case (record, stats): 2 runs, 1 of which timed out
+        """
+        file_name = os.path.join(tmp_path, 'usage.csv')
+        recorder = UsageRecorder(file_name)
+        usage = {'return_code': 0, 'timed_out': False, 'wall_seconds': 2.0, 'cpu_seconds': 1.5, 'max_rss_bytes': 100}
+        recorder.record('run_file.i', usage)
+        recorder.record('run_file.i', dict(usage, return_code=-15, timed_out=True, max_rss_bytes=200))
+        assert recorder.stats() == {
+            'runs': 2,
+            'timeouts': 1,
+            'max_rss_bytes': 200,
+            'cpu_seconds': 3.0,
+            'wall_seconds': 4.0
+        }
+        assert list(pd.read_csv(file_name)['max_rss_bytes']) == [100, 200]
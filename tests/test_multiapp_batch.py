@@ -0,0 +1,88 @@
+# Copyright 2021, Battelle Energy Alliance, LLC
+
+# Python Packages
+import pytest
+import os
+import logging
+
+# Repository Modules
+from adapter.multiapp_batch import create_batches, get_output_file_base, get_output_cli_args, write_master_input_file
+from adapter.multiapp_batch import MULTIAPP_NAME
+
+# MOOSE Modules
+import pyhit
+import moosetree
+
+
+class TestMultiAppBatch:
+
+    log_path = 'test.log'
+    # Setup logging
+    # Remove log file if it exists
+    if os.path.exists(log_path):
+        os.remove(log_path)
+
+    logging.basicConfig(format='%(asctime)s %(levelname)s %(message)s', filename=log_path, level=logging.INFO)
+    logger = logging.getLogger('moose-adapter')
+
+    INPUT_FILE = '\n'.join([
+        '[Outputs]', '  exodus = true', '  [out]', '    type = JSON', '    file_base = output/run_out', '  []',
+        '  [csv]', '    type = CSV', '  []', '[]', ''
+    ])
+
+    def write_run_files(self, tmp_path, count):
+        run_files = list()
+        for index in range(count):
+            run_file = os.path.join(tmp_path, 'variant-{:04d}'.format(index), 'run_file.i')
+            os.makedirs(os.path.dirname(run_file))
+            with open(run_file, 'w') as input_file:
+                input_file.write(self.INPUT_FILE)
+            run_files.append(run_file)
+        return run_files
+
+    def test_valid_create_batches(self):
+        """
+        Assert that the variants are split into batches of at most max_apps sub-apps
+        Test Case (create_batches): 5 variants with a maximum of 2 sub-apps, and without a maximum
+        """
+        assert create_batches([0, 1, 2, 3, 4], 2) == [[0, 1], [2, 3], [4]]
+        assert create_batches([0, 1, 2, 3, 4], 0) == [[0, 1, 2, 3, 4]]
+        assert create_batches([], 0) == []
+
+    def test_valid_output_file_base(self):
+        """
+        Assert that the outputs of a sub-app are written next to its input file
+        Test Case (get_output_file_base): Run file in a variant directory
+        """
+        run_file = os.path.join('runs', 'run-1', 'variant-0003', 'run_file.i')
+        assert get_output_file_base(run_file, os.path.join('runs',
+                                                           'run-1')) == os.path.join('variant-0003', 'run_file_out')
+
+    def test_valid_write_master_input_file(self, tmp_path):
+        """
+        Assert that the master input file solves each run file as a sub-app
+        Test Case (write_master_input_file): 2 run files
+        """
+        run_files = self.write_run_files(tmp_path, 2)
+        master_file = os.path.join(tmp_path, 'batch-0000.i')
+        write_master_input_file(master_file, run_files, str(tmp_path))
+        root = pyhit.load(master_file)
+        multiapp = moosetree.find(root, func=lambda node: node.fullpath == '/MultiApps/' + MULTIAPP_NAME)
+        assert multiapp['type'] == 'FullSolveMultiApp'
+        assert multiapp['input_files'].split() == [
+            os.path.join('variant-0000', 'run_file.i'),
+            os.path.join('variant-0001', 'run_file.i')
+        ]
+        assert len(multiapp['positions'].split()) == 6
+        assert len(multiapp['cli_args'].split(';')) == 2
+
+    def test_valid_output_cli_args(self, tmp_path):
+        """
+        Assert that the outputs of a sub-app with a file_base of its own are written next to its input file
+        Test Case (get_output_cli_args): [Outputs] with a JSON output that sets its own file_base, and a CSV output
+        """
+        run_file = self.write_run_files(tmp_path, 1)[0]
+        assert get_output_cli_args(run_file, str(tmp_path)) == [
+            'Outputs/file_base=' + os.path.join('variant-0000', 'run_file_out'),
+            'Outputs/out/file_base=' + os.path.join('variant-0000', 'output', 'run_out')
+        ]
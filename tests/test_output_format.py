@@ -0,0 +1,77 @@
+# Copyright 2021, Battelle Energy Alliance, LLC
+
+# Python Packages
+import pytest
+import os
+import logging
+import numpy as np
+import pandas as pd
+
+# Repository Modules
+from adapter import output_format
+from adapter.output_format import create_writer, read_chunks, get_file_name, get_output_format
+
+
+class TestOutputFormat:
+
+    log_path = 'test.log'
+    # Setup logging
+    # Remove log file if it exists
+    if os.path.exists(log_path):
+        os.remove(log_path)
+
+    logging.basicConfig(format='%(asctime)s %(levelname)s %(message)s', filename=log_path, level=logging.INFO)
+    logger = logging.getLogger('moose-adapter')
+
+    def write_and_read(self, file_name):
+        writer = create_writer(file_name)
+        for start in range(0, 25, 10):
+            index = np.arange(start, min(start + 10, 25))
+            writer.write(pd.DataFrame({'variable': 'u', 'index': index, 'value': index * 0.5}))
+        writer.close()
+        chunks = list(read_chunks(file_name, 7))
+        assert max(chunk.shape[0] for chunk in chunks) <= 7
+        return pd.concat(chunks, ignore_index=True)
+
+    def test_valid_file_name(self):
+        """
+        Assert that the import file has the extension of the output format
+        Test Case (get_file_name): csv, parquet, and arrow
+        """
+        assert get_file_name('import_file.csv', 'csv') == 'import_file.csv'
+        assert get_file_name('import_file.csv', 'parquet') == 'import_file.parquet'
+        assert get_file_name(os.path.join('data', 'import_file.csv'),
+                             'arrow') == os.path.join('data', 'import_file.arrow')
+
+    def test_invalid_output_format(self):
+        """
+        Assert that an unknown output format raises an error
+        Test Case (get_output_format): OUTPUT_FORMAT=xlsx
+        """
+        os.environ['OUTPUT_FORMAT'] = 'xlsx'
+        try:
+            with pytest.raises(ValueError):
+                get_output_format()
+        finally:
+            del os.environ['OUTPUT_FORMAT']
+
+    def test_valid_csv_fallback(self, monkeypatch):
+        """
+        Assert that the columnar formats fall back to csv without pyarrow
+        Test Case (get_output_format): OUTPUT_FORMAT=parquet without pyarrow
+        """
+        monkeypatch.setattr(output_format, 'pyarrow', None)
+        monkeypatch.setenv('OUTPUT_FORMAT', 'parquet')
+        assert get_output_format() == 'csv'
+
+    @pytest.mark.parametrize('extension', ['.csv', '.parquet', '.arrow'])
+    def test_valid_write_and_read(self, tmp_path, extension):
+        """
+        Assert that chunks written in an output format are read back in chunks
+        Test Case (create_writer, read_chunks): 25 rows written in chunks of 10 and read in chunks of 7
+        """
+        if extension != '.csv':
+            pytest.importorskip('pyarrow')
+        results = self.write_and_read(os.path.join(tmp_path, 'import_file' + extension))
+        assert list(results['index']) == list(range(25))
+        assert list(results['value']) == [index * 0.5 for index in range(25)]
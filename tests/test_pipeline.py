@@ -0,0 +1,72 @@
+# Copyright 2021, Battelle Energy Alliance, LLC
+
+# Python Packages
+import pytest
+import os
+import time
+import random
+import logging
+import threading
+
+# Repository Modules
+from adapter.pipeline import Pipeline, Stage
+
+
+class TestPipeline:
+
+    log_path = 'test.log'
+    # Setup logging
+    # Remove log file if it exists
+    if os.path.exists(log_path):
+        os.remove(log_path)
+
+    logging.basicConfig(format='%(asctime)s %(levelname)s %(message)s', filename=log_path, level=logging.INFO)
+    logger = logging.getLogger('moose-adapter')
+
+    def run_pipeline(self, stages: list, runs: int):
+        completed = list()
+        done = threading.Event()
+
+        def on_complete(item, is_success):
+            completed.append((item['id'], is_success))
+            if len(completed) == runs:
+                done.set()
+
+        pipeline = Pipeline(stages, 1, on_complete=on_complete)
+        pipeline.start()
+        for i in range(runs):
+            pipeline.submit({'id': i, 'stages': list()})
+        done.wait(10)
+        return completed
+
+    def test_valid_order(self):
+        """
+        Assert that runs complete in submission order when stages have several workers
+        Test Case (submit, _emit): Stages with random durations
+        """
+
+        def work(item):
+            time.sleep(random.random() * 0.01)
+            item['stages'].append('work')
+
+        completed = self.run_pipeline([Stage('a', work, 4), Stage('b', work, 3), Stage('c', work, 1)], 20)
+        assert completed == [(i, True) for i in range(20)]
+
+    def test_valid_failed_stage(self):
+        """
+        Assert that a failed run skips the later stages but keeps its place in the order
+        Test Case (_work): A stage returns False or raises an exception
+        """
+        uploaded = list()
+
+        def simulate(item):
+            if item['id'] == 1:
+                raise RuntimeError('diverged')
+            return item['id'] != 2
+
+        def upload(item):
+            uploaded.append(item['id'])
+
+        completed = self.run_pipeline([Stage('simulate', simulate, 2), Stage('upload', upload, 1)], 4)
+        assert completed == [(0, True), (1, False), (2, False), (3, True)]
+        assert uploaded == [0, 3]
@@ -0,0 +1,162 @@
+# Copyright 2021, Battelle Energy Alliance, LLC
+
+# Python Packages
+import pytest
+import os
+import json
+import logging
+import numpy as np
+import pandas as pd
+
+# Repository Modules
+from adapter import post_processor
+from adapter.post_processor import select_time_steps, read_outputs, write_output_file, OUTPUT_COLUMNS
+
+
+class TestPostProcessor:
+
+    log_path = 'test.log'
+    # Setup logging
+    # Remove log file if it exists
+    if os.path.exists(log_path):
+        os.remove(log_path)
+
+    logging.basicConfig(format='%(asctime)s %(levelname)s %(message)s', filename=log_path, level=logging.INFO)
+    logger = logging.getLogger('moose-adapter')
+
+    def write_vector_postprocessor(self, work_directory, time_steps, rows):
+        for time_step in range(time_steps):
+            pd.DataFrame({
+                'id': np.arange(rows),
+                'x': np.linspace(0, 1, rows),
+                'temperature': np.full(rows, 300.0 + time_step)
+            }).to_csv(os.path.join(work_directory, 'run_file_out_temp_line_{:04d}.csv'.format(time_step)), index=False)
+
+    def to_chars(self, name):
+        return np.array([list(name.ljust(33, '\0'))], dtype='S1')
+
+    def test_valid_select_time_steps(self):
+        """
+        Assert that time steps are selected by 'all', 'last', and by index
+        Test Case (select_time_steps): 5 time steps
+        """
+        assert select_time_steps(5, 'all') == [0, 1, 2, 3, 4]
+        assert select_time_steps(5, 'last') == [4]
+        assert select_time_steps(5, [0, -1, -2, 7]) == [0, 3, 4]
+        assert select_time_steps(0, 'last') == []
+
+    def test_valid_csv(self, tmp_path):
+        """
+        Assert that the selected columns and time steps of a VectorPostprocessor are written to the import file
+        Test Case (read_outputs, write_output_file): 3 time steps of 25 rows read in chunks of 10 rows
+        """
+        self.write_vector_postprocessor(str(tmp_path), 3, 25)
+        config = {'csv': [{'file': 'run_file_out_temp_line_*.csv', 'columns': ['temperature'], 'time_steps': 'last'}]}
+        chunks = list(read_outputs(config, str(tmp_path), 10))
+        assert max(chunk.shape[0] for chunk in chunks) == 10
+
+        import_file = os.path.join(tmp_path, 'import_file.csv')
+        assert write_output_file(iter(chunks), import_file) == 25
+        results = pd.read_csv(import_file)
+        assert list(results.columns) == OUTPUT_COLUMNS
+        assert set(results['source']) == {'run_file_out_temp_line_0002.csv'}
+        assert set(results['variable']) == {'temperature'}
+        assert set(results['time_step']) == {2}
+        assert list(results['index']) == list(range(25))
+        assert (results['value'] == 302.0).all()
+
+    def test_valid_source(self, tmp_path):
+        """
+        Assert that the rows of each file that matches an output are labelled with the name of the file
+        Test Case (read_outputs): 2 time steps of an output without a name and of an output with a name
+        """
+        self.write_vector_postprocessor(str(tmp_path), 2, 5)
+        config = {
+            'csv': [{
+                'file': 'run_file_out_temp_line_*.csv'
+            }, {
+                'file': 'run_file_out_temp_line_*.csv',
+                'name': 'temp_line'
+            }]
+        }
+        results = pd.concat(read_outputs(config, str(tmp_path), 10), ignore_index=True)
+        assert list(results.drop_duplicates('source')['source']) == [
+            'run_file_out_temp_line_0000.csv', 'run_file_out_temp_line_0001.csv',
+            'temp_line:run_file_out_temp_line_0000.csv', 'temp_line:run_file_out_temp_line_0001.csv'
+        ]
+
+    def test_valid_empty_config(self, tmp_path):
+        """
+        Assert that an import file with only a header is written without a configuration
+        Test Case (read_outputs, write_output_file): Empty configuration
+        """
+        import_file = os.path.join(tmp_path, 'import_file.csv')
+        assert write_output_file(read_outputs(dict(), str(tmp_path), 10), import_file) == 0
+        assert list(pd.read_csv(import_file).columns) == OUTPUT_COLUMNS
+
+    def test_invalid_missing_outputs(self, tmp_path, monkeypatch, caplog):
+        """
+        Assert that outputs that match no files are reported and that no rows are written
+        Test Case (read_outputs, main): A configuration of Exodus and csv outputs that the run did not write
+        """
+        config_file = os.path.join(tmp_path, 'post_process.json')
+        config = {'exodus': [{'file': 'run_file_out.e'}], 'csv': [{'file': 'run_file_out_temp_line_*.csv'}]}
+        with open(config_file, 'w') as json_file:
+            json.dump(config, json_file)
+        monkeypatch.setenv('POST_PROCESS_CONFIG_FILE_NAME', config_file)
+
+        with caplog.at_level(logging.WARNING):
+            assert post_processor.main(str(tmp_path), os.path.join(tmp_path, 'import_file.csv')) == 0
+        assert 'No MOOSE output matches run_file_out.e' in caplog.text
+        assert 'No MOOSE output matches run_file_out_temp_line_*.csv' in caplog.text
+        assert 'No MOOSE results were written' in caplog.text
+
+    def test_valid_example_config(self):
+        """
+        Assert that the example configuration selects outputs that the example template input file writes
+        Test Case (read_config): data/example/post_process.json and data/example/config_input_file.i
+        """
+        config = post_processor.read_config(os.path.join('data', 'example', 'post_process.json'))
+        with open(os.path.join('data', 'example', 'config_input_file.i')) as input_file:
+            outputs = input_file.read().split('[Outputs]')[1]
+        assert [source['file'] for source in config['exodus']] == ['run_file_out.e']
+        assert 'exodus = true' in outputs
+        assert [source['file'] for source in config['csv']] == ['run_file_out_temp_line_*.csv']
+        assert 'csv = true' in outputs
+
+    def test_valid_exodus(self, tmp_path):
+        """
+        Assert that the nodal and global variables of an Exodus file are read in chunks
+        Test Case (read_outputs): Exodus file with 2 time steps, 25 nodes, a nodal and a global variable
+        """
+        netCDF4 = pytest.importorskip('netCDF4')
+        file_name = os.path.join(tmp_path, 'run_file_out.e')
+        with netCDF4.Dataset(file_name, 'w') as dataset:
+            dataset.createDimension('time_step', None)
+            dataset.createDimension('num_nodes', 25)
+            dataset.createDimension('num_nod_var', 1)
+            dataset.createDimension('num_glo_var', 1)
+            dataset.createDimension('len_name', 33)
+            dataset.createVariable('time_whole', 'f8', ('time_step', ))[:] = [0.0, 1.0]
+            dataset.createVariable('name_nod_var', 'S1', ('num_nod_var', 'len_name'))[:] = self.to_chars('u')
+            dataset.createVariable('name_glo_var', 'S1', ('num_glo_var', 'len_name'))[:] = self.to_chars('average')
+            dataset.createVariable('vals_nod_var1', 'f8', ('time_step', 'num_nodes'))[:] = np.arange(50).reshape(2, 25)
+            dataset.createVariable('vals_glo_var', 'f8', ('time_step', 'num_glo_var'))[:] = [[1.5], [2.5]]
+
+        config = {
+            'exodus': [{
+                'file': 'run_file_out.e',
+                'type': 'nodal',
+                'time_steps': 'last'
+            }, {
+                'file': 'run_file_out.e',
+                'type': 'global',
+                'variables': ['average']
+            }]
+        }
+        chunks = list(read_outputs(config, str(tmp_path), 10))
+        results = pd.concat(chunks, ignore_index=True)
+        nodal = results[results['variable'] == 'u']
+        assert list(nodal['value']) == list(range(25, 50))
+        assert set(nodal['time']) == {1.0}
+        assert list(results[results['variable'] == 'average']['value']) == [1.5, 2.5]
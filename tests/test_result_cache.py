@@ -0,0 +1,88 @@
+# Copyright 2021, Battelle Energy Alliance, LLC
+
+# Python Packages
+import pytest
+import os
+import logging
+
+# Repository Modules
+from adapter.result_cache import ResultCache
+
+
+class TestResultCache:
+
+    log_path = 'test.log'
+    # Setup logging
+    # Remove log file if it exists
+    if os.path.exists(log_path):
+        os.remove(log_path)
+
+    logging.basicConfig(format='%(asctime)s %(levelname)s %(message)s', filename=log_path, level=logging.INFO)
+    logger = logging.getLogger('moose-adapter')
+
+    def write_file(self, file_name, content):
+        os.makedirs(os.path.dirname(file_name), exist_ok=True)
+        with open(file_name, 'w') as output_file:
+            output_file.write(content)
+        return file_name
+
+    def put(self, cache, tmp_path, key, size=10):
+        source = self.write_file(os.path.join(tmp_path, 'outputs', key + '.csv'), key[0] * size)
+        cache.put(key, {'import.csv': source})
+
+    def test_valid_identical_inputs(self, tmp_path):
+        """
+        Assert that runs with identical inputs share a key and a cache entry, and that other inputs miss
+        Test Case (get_key, get, put): 2 runs with identical run files in different work directories, and 1 changed run
+        """
+        cache = ResultCache(os.path.join(tmp_path, 'cache'), 1000)
+        first = self.write_file(os.path.join(tmp_path, 'run-1', 'run_file.i'), '[Mesh]\n  xmax = 3\n[]\n')
+        second = self.write_file(os.path.join(tmp_path, 'run-2', 'run_file.i'), '[Mesh]\n  xmax = 3\n[]\n')
+        changed = self.write_file(os.path.join(tmp_path, 'run-3', 'run_file.i'), '[Mesh]\n  xmax = 4\n[]\n')
+        key = ResultCache.get_key(first)
+        assert ResultCache.get_key(second) == key
+        assert ResultCache.get_key(changed) != key
+
+        destination = os.path.join(tmp_path, 'run-2', 'import.csv')
+        assert cache.get(key, {'import.csv': destination}) == False
+        cache.put(key, {'import.csv': self.write_file(os.path.join(tmp_path, 'run-1', 'import.csv'), 'time\n1\n')})
+        assert cache.get(key, {'import.csv': destination}) == True
+        assert cache.get(ResultCache.get_key(changed), {'import.csv': destination}) == False
+        with open(destination) as import_file:
+            assert import_file.read() == 'time\n1\n'
+        assert cache.stats() == {'hits': 1, 'misses': 2, 'size': 1, 'bytes': 7}
+
+    def test_valid_eviction_order(self, tmp_path):
+        """
+        Assert that the least recently used entry is evicted first
+        Test Case (put, _evict): 3 entries of 10 bytes in a cache of 30 bytes, the oldest of which is used again
+        """
+        cache = ResultCache(os.path.join(tmp_path, 'cache'), 30)
+        for key in ['a', 'b', 'c']:
+            self.put(cache, tmp_path, key)
+        assert cache.get('a', {'import.csv': os.path.join(tmp_path, 'import.csv')}) == True
+        self.put(cache, tmp_path, 'd')
+
+        assert sorted(os.listdir(os.path.join(tmp_path, 'cache'))) == ['a', 'c', 'd']
+        assert cache.get('b', {'import.csv': os.path.join(tmp_path, 'import.csv')}) == False
+
+    def test_valid_size_limit(self, tmp_path):
+        """
+        Assert that the cache stays within its maximum size, including the entries on disk before a restart
+        Test Case (put, _load): 5 entries of 10 bytes in a cache of 25 bytes, restarted after 3 entries
+        """
+        directory = os.path.join(tmp_path, 'cache')
+        cache = ResultCache(directory, 25)
+        for key in ['a', 'b', 'c']:
+            self.put(cache, tmp_path, key)
+        assert cache.stats()['bytes'] == 20
+        # A temporary entry of an interrupted put is removed on restart
+        os.makedirs(os.path.join(directory, '.e.interrupted'))
+
+        cache = ResultCache(directory, 25)
+        assert cache.stats()['size'] == 2
+        self.put(cache, tmp_path, 'd')
+        self.put(cache, tmp_path, 'e', size=20)
+
+        assert os.listdir(directory) == ['e']
+        assert cache.stats()['bytes'] == 20
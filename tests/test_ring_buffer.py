@@ -0,0 +1,99 @@
+# Copyright 2021, Battelle Energy Alliance, LLC
+
+# Python Packages
+import pytest
+import os
+import logging
+import numpy as np
+import pandas as pd
+
+# Repository Modules
+from adapter.ring_buffer import RingBuffer
+
+
+class TestRingBuffer:
+
+    log_path = 'test.log'
+    # Setup logging
+    # Remove log file if it exists
+    if os.path.exists(log_path):
+        os.remove(log_path)
+
+    logging.basicConfig(format='%(asctime)s %(levelname)s %(message)s', filename=log_path, level=logging.INFO)
+    logger = logging.getLogger('moose-adapter')
+
+    QUEUE_FILE_NAME = os.path.join('tests', 'test_files', 'test_queue.csv')
+
+    def test_valid_append(self):
+        """
+        Assert that rows are kept in First In First Out (FIFO) order
+        Test Case (append): Rows appended below the capacity
+        """
+        buffer = RingBuffer(5)
+        buffer.append(pd.DataFrame({'time': [1, 2], 'value': [1.5, 2.5]}))
+        buffer.append(pd.DataFrame({'time': [3], 'value': [3.5]}))
+        queue_df = buffer.to_dataframe()
+        assert len(buffer) == 3
+        assert buffer.is_full() == False
+        assert list(queue_df['time']) == [1, 2, 3]
+        assert list(queue_df['value']) == [1.5, 2.5, 3.5]
+
+    def test_valid_eviction(self):
+        """
+        Assert that the oldest rows are evicted once the buffer is full
+        Test Case (append): Rows appended past the capacity, including a single append larger than the capacity
+        """
+        buffer = RingBuffer(3)
+        for i in range(5):
+            buffer.append(pd.DataFrame({'time': [i]}))
+        assert buffer.is_full() == True
+        assert list(buffer.to_dataframe()['time']) == [2, 3, 4]
+        buffer.append(pd.DataFrame({'time': range(10, 17)}))
+        assert list(buffer.to_dataframe()['time']) == [14, 15, 16]
+        assert buffer.total_rows == 12
+
+    def test_valid_snapshot_view(self):
+        """
+        Assert that a snapshot is a read-only view of the buffer rather than a copy
+        Test Case (snapshot): Snapshot of a buffer that has wrapped around
+        """
+        buffer = RingBuffer(4)
+        buffer.append(pd.DataFrame({'time': range(6)}))
+        snapshot = buffer.snapshot()
+        assert list(snapshot['time']) == [2, 3, 4, 5]
+        assert snapshot['time'].base is not None
+        with pytest.raises(ValueError):
+            snapshot['time'][0] = 0
+
+    def test_valid_upcast(self):
+        """
+        Assert that a column is upcast when appended values do not fit its datatype
+        Test Case (append): Float values appended to an integer column
+        """
+        buffer = RingBuffer(3)
+        buffer.append(pd.DataFrame({'value': [1, 2]}))
+        buffer.append(pd.DataFrame({'value': [2.5]}))
+        assert np.allclose(buffer.to_dataframe()['value'], [1, 2, 2.5])
+
+    def test_invalid_append(self):
+        """
+        Assert that rows missing a column of the buffer are rejected
+        Test Case (append): Missing column
+        """
+        buffer = RingBuffer(3)
+        buffer.append(pd.DataFrame({'time': [1], 'value': [1.0]}))
+        with pytest.raises(KeyError):
+            buffer.append(pd.DataFrame({'time': [2]}))
+
+    def test_valid_checkpoint(self):
+        """
+        Assert that a checkpoint restores the buffer
+        Test Case (checkpoint, from_csv): Round trip through a csv checkpoint
+        """
+        buffer = RingBuffer(3)
+        buffer.append(pd.DataFrame({'time': range(4), 'value': [0.5, 1.5, 2.5, 3.5]}))
+        buffer.checkpoint(self.QUEUE_FILE_NAME)
+        restored = RingBuffer.from_csv(self.QUEUE_FILE_NAME, 2)
+        os.remove(self.QUEUE_FILE_NAME)
+        assert list(restored.to_dataframe()['time']) == [2, 3]
+        assert list(restored.to_dataframe()['value']) == [2.5, 3.5]
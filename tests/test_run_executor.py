@@ -0,0 +1,77 @@
+# Copyright 2021, Battelle Energy Alliance, LLC
+
+# Python Packages
+import pytest
+import os
+import time
+import logging
+import threading
+
+# Repository Modules
+from adapter.run_executor import RunExecutor
+
+
+class TestRunExecutor:
+
+    log_path = 'test.log'
+    # Setup logging
+    # Remove log file if it exists
+    if os.path.exists(log_path):
+        os.remove(log_path)
+
+    logging.basicConfig(format='%(asctime)s %(levelname)s %(message)s', filename=log_path, level=logging.INFO)
+    logger = logging.getLogger('moose-adapter')
+
+    def test_valid_max_runs(self, tmp_path):
+        """
+        Assert that at most max_runs jobs run at once and that submit blocks while every slot is busy
+        Test Case (submit): 8 jobs on 2 slots
+        """
+        executor = RunExecutor(str(tmp_path), max_runs=2)
+        lock = threading.Lock()
+        running = [0, 0]
+
+        def job(index):
+            with lock:
+                running[0] += 1
+                running[1] = max(running[1], running[0])
+            time.sleep(0.02)
+            with lock:
+                running[0] -= 1
+            return index
+
+        futures = [executor.submit(job, index) for index in range(8)]
+        assert [future.result() for future in futures] == list(range(8))
+        assert running[1] == 2
+        assert executor.stats() == {'active': 0, 'max': 2}
+        executor.shutdown()
+
+    def test_valid_released_slot(self, tmp_path):
+        """
+        Assert that a job that raises returns False and releases its slot
+        Test Case (run, _run): 2 failed jobs on 1 slot, followed by a successful job
+        """
+        executor = RunExecutor(str(tmp_path), max_runs=1)
+
+        def fail():
+            raise RuntimeError('MOOSE crashed')
+
+        assert executor.run(fail) == False
+        assert executor.run(fail) == False
+        future = executor.submit(lambda: True)
+        assert future.result(5) == True
+        executor.shutdown()
+
+    def test_valid_work_directories(self, tmp_path):
+        """
+        Assert that each job gets its own work directory, which is removed by cleanup
+        Test Case (create_work_directory, cleanup): 2 work directories
+        """
+        executor = RunExecutor(str(tmp_path), max_runs=1)
+        first = executor.create_work_directory()
+        second = executor.create_work_directory()
+        assert first != second
+        executor.cleanup(first)
+        assert not os.path.exists(first)
+        assert os.path.isdir(second)
+        executor.shutdown()
@@ -0,0 +1,115 @@
+# Copyright 2021, Battelle Energy Alliance, LLC
+
+# Python Packages
+import pytest
+import os
+import logging
+import threading
+
+# Repository Modules
+from adapter.scheduler import Scheduler
+from adapter import trigger_policy
+
+
+class TestScheduler:
+
+    log_path = 'test.log'
+    # Setup logging
+    # Remove log file if it exists
+    if os.path.exists(log_path):
+        os.remove(log_path)
+
+    logging.basicConfig(format='%(asctime)s %(levelname)s %(message)s', filename=log_path, level=logging.INFO)
+    logger = logging.getLogger('moose-adapter')
+
+    def test_valid_full_queue_policy(self):
+        """
+        Assert that the full queue policy runs MOOSE for new data once the queue is full
+        Test Case (FullQueuePolicy): Default trigger policy
+        """
+        policy = trigger_policy.FullQueuePolicy()
+        assert policy.is_triggered(1, False, 0) == False
+        assert policy.is_triggered(0, True, 0) == False
+        assert policy.is_triggered(1, True, 0) == True
+
+    def test_valid_every_k_rows_policy(self):
+        """
+        Assert that the every K rows policy waits for K new rows
+        Test Case (EveryKRowsPolicy): Trigger after 10 rows
+        """
+        policy = trigger_policy.EveryKRowsPolicy(10)
+        assert policy.is_triggered(9, True, 0) == False
+        assert policy.is_triggered(10, True, 0) == True
+
+    def test_valid_time_window_policy(self):
+        """
+        Assert that the time window policy runs at most once per window and reports when the window ends
+        Test Case (TimeWindowPolicy): Trigger at most once every 5 seconds
+        """
+        policy = trigger_policy.TimeWindowPolicy(5)
+        assert policy.is_triggered(1, True, 100) == True
+        policy.on_run(100)
+        assert policy.is_triggered(1, True, 102) == False
+        assert policy.timeout(1, 102) == 3
+        assert policy.is_triggered(1, True, 105) == True
+
+    def test_invalid_trigger_policy(self, monkeypatch):
+        """
+        Assert that an unknown trigger policy raises an error
+        Test Case (get_trigger_policy): Invalid RUN_TRIGGER_POLICY
+        """
+        monkeypatch.setenv('RUN_TRIGGER_POLICY', 'never')
+        with pytest.raises(ValueError):
+            trigger_policy.get_trigger_policy()
+
+    @pytest.mark.parametrize('name,variable', [('every_k_rows', 'RUN_TRIGGER_ROWS'),
+                                               ('time_window', 'RUN_TRIGGER_SECONDS')])
+    def test_invalid_trigger_setting(self, monkeypatch, name, variable):
+        """
+        Assert that a trigger policy without its setting raises an error that names the setting
+        Test Case (get_trigger_policy): Unset and invalid RUN_TRIGGER_ROWS and RUN_TRIGGER_SECONDS
+        """
+        monkeypatch.setenv('RUN_TRIGGER_POLICY', name)
+        monkeypatch.delenv(variable, raising=False)
+        with pytest.raises(ValueError, match=variable):
+            trigger_policy.get_trigger_policy()
+        monkeypatch.setenv(variable, 'often')
+        with pytest.raises(ValueError, match=variable):
+            trigger_policy.get_trigger_policy()
+
+    def test_valid_notify(self):
+        """
+        Assert that a waiting thread is woken once the trigger policy is met
+        Test Case (notify, wait): Producer and MOOSE threads
+        """
+        lock = threading.Lock()
+        scheduler = Scheduler(lock, lambda: True, trigger_policy.EveryKRowsPolicy(2))
+        results = list()
+
+        def consumer():
+            with lock:
+                results.append(scheduler.wait())
+
+        thread = threading.Thread(target=consumer)
+        thread.start()
+        with lock:
+            scheduler.notify(1)
+        with lock:
+            scheduler.notify(1)
+        thread.join(5)
+        assert results == [True]
+        assert scheduler.pending_rows == 0
+
+    def test_valid_flush_and_stop(self):
+        """
+        Assert that a flush runs MOOSE regardless of the trigger policy and that stop ends the wait
+        Test Case (flush, stop): Flush trigger policy
+        """
+        lock = threading.Lock()
+        scheduler = Scheduler(lock, lambda: False, trigger_policy.FlushPolicy())
+        with lock:
+            scheduler.notify(100)
+            scheduler.flush()
+            assert scheduler.wait() == True
+            scheduler.stop()
+            assert scheduler.wait() == False
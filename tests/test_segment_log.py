@@ -0,0 +1,102 @@
+# Copyright 2021, Battelle Energy Alliance, LLC
+
+# Python Packages
+import pytest
+import os
+import glob
+import shutil
+import logging
+import numpy as np
+import pandas as pd
+
+# Repository Modules
+from adapter.segment_log import SegmentLog
+
+
+class TestSegmentLog:
+
+    log_path = 'test.log'
+    # Setup logging
+    # Remove log file if it exists
+    if os.path.exists(log_path):
+        os.remove(log_path)
+
+    logging.basicConfig(format='%(asctime)s %(levelname)s %(message)s', filename=log_path, level=logging.INFO)
+    logger = logging.getLogger('moose-adapter')
+
+    QUEUE_SEGMENT_DIR = os.path.join('tests', 'test_files', 'segments')
+
+    def setup_method(self):
+        shutil.rmtree(self.QUEUE_SEGMENT_DIR, ignore_errors=True)
+
+    def teardown_method(self):
+        shutil.rmtree(self.QUEUE_SEGMENT_DIR, ignore_errors=True)
+
+    def test_valid_recover(self):
+        """
+        Assert that the newest window rows are recovered in order
+        Test Case (append, recover): Rows appended across several segments
+        """
+        segment_log = SegmentLog(self.QUEUE_SEGMENT_DIR, 4, segment_rows=2)
+        segment_log.recover()
+        for i in range(7):
+            segment_log.append(pd.DataFrame({'time': [i], 'name': ['sensor' + str(i)]}))
+        segment_log.close()
+
+        queue_df = SegmentLog(self.QUEUE_SEGMENT_DIR, 4, segment_rows=2).recover()
+        assert list(queue_df['time']) == [3, 4, 5, 6]
+        assert list(queue_df['name']) == ['sensor3', 'sensor4', 'sensor5', 'sensor6']
+
+    def test_valid_compaction(self):
+        """
+        Assert that segments outside of the window are deleted
+        Test Case (compact): Segment rotation after many appends
+        """
+        segment_log = SegmentLog(self.QUEUE_SEGMENT_DIR, 4, segment_rows=2)
+        segment_log.recover()
+        for i in range(20):
+            segment_log.append(pd.DataFrame({'time': [i]}))
+        segment_log.close()
+        assert len(glob.glob(os.path.join(self.QUEUE_SEGMENT_DIR, 'segment-*.log'))) <= 3
+
+    def test_valid_torn_write(self):
+        """
+        Assert that an incomplete frame at the end of the newest segment is truncated on recovery
+        Test Case (recover): Crash during a write
+        """
+        segment_log = SegmentLog(self.QUEUE_SEGMENT_DIR, 10)
+        segment_log.recover()
+        segment_log.append(pd.DataFrame({'time': [1, 2]}))
+        segment_log.append(pd.DataFrame({'time': [3]}))
+        segment_log.close()
+        path = glob.glob(os.path.join(self.QUEUE_SEGMENT_DIR, 'segment-*.log'))[0]
+        os.truncate(path, os.path.getsize(path) - 3)
+
+        segment_log = SegmentLog(self.QUEUE_SEGMENT_DIR, 10)
+        queue_df = segment_log.recover()
+        assert list(queue_df['time']) == [1, 2]
+        # Appends continue after the last complete frame
+        segment_log.append(pd.DataFrame({'time': [4]}))
+        segment_log.close()
+        queue_df = SegmentLog(self.QUEUE_SEGMENT_DIR, 10).recover()
+        assert list(queue_df['time']) == [1, 2, 4]
+
+    def test_valid_missing_values(self):
+        """
+        Assert that missing values of object columns are recovered as missing, not as the strings 'nan' or 'None'
+        Test Case (_serialize, _deserialize): Rows with a missing string value, a None value, and a NaN number
+        """
+        segment_log = SegmentLog(self.QUEUE_SEGMENT_DIR, 10)
+        segment_log.recover()
+        segment_log.append(pd.DataFrame({
+            'time': [1, 2, 3],
+            'name': ['sensor1', np.nan, None],
+            'u': [0.5, np.nan, 1.5]
+        }))
+        segment_log.close()
+
+        queue_df = SegmentLog(self.QUEUE_SEGMENT_DIR, 10).recover()
+        assert list(queue_df['time']) == [1, 2, 3]
+        assert queue_df['name'][0] == 'sensor1'
+        assert list(queue_df['name'].isnull()) == [False, True, True]
+        assert list(queue_df['u'].isnull()) == [False, True, False]
@@ -0,0 +1,104 @@
+# Copyright 2021, Battelle Energy Alliance, LLC
+
+# Python Packages
+import pytest
+import os
+import logging
+import threading
+import deep_lynx
+from types import SimpleNamespace
+
+# Repository Modules
+import adapter
+from adapter.startup_cache import StartupCache
+
+
+class FakeDataSourcesApi:
+    """ Stands in for the data sources api of Deep Lynx with 3 data sources """
+
+    def __init__(self, api_client):
+        pass
+
+    def list_data_sources(self, container_id):
+        value = [SimpleNamespace(name=name, id=name + '-id', container_id=container_id) for name in 'ABC']
+        return SimpleNamespace(is_error=False, value=value)
+
+
+class FakeEventsApi:
+    """ Stands in for the events api of Deep Lynx with an existing event action on data source A """
+
+    list_calls = 0
+    created = list()
+    lock = threading.Lock()
+
+    def __init__(self, api_client):
+        pass
+
+    def list_event_actions(self):
+        with FakeEventsApi.lock:
+            FakeEventsApi.list_calls += 1
+        action = SimpleNamespace(destination='http://localhost:8050/moose',
+                                 event_type='file_created',
+                                 data_source_id='A-id')
+        return SimpleNamespace(value=[action])
+
+    def create_event_action(self, event_action):
+        with FakeEventsApi.lock:
+            FakeEventsApi.created.append(event_action.data_source_id)
+        return SimpleNamespace(is_error=False, error=None)
+
+
+class TestStartupCache:
+
+    log_path = 'test.log'
+    # Setup logging
+    # Remove log file if it exists
+    if os.path.exists(log_path):
+        os.remove(log_path)
+
+    logging.basicConfig(format='%(asctime)s %(levelname)s %(message)s', filename=log_path, level=logging.INFO)
+    logger = logging.getLogger('moose-adapter')
+
+    def test_valid_restart(self, tmp_path):
+        """
+        Assert that cached ids are read after a restart, and that discarded ids are not
+        Test Case (put, discard): 2 cached keys, 1 of which is discarded before the restart
+        """
+        file_name = os.path.join(tmp_path, 'deep_lynx_ids.json')
+        cache = StartupCache(file_name)
+        key = StartupCache.get_key('http://127.0.0.1:8090', 'DIAMOND', 'MOOSEAdapter')
+        cache.put(key, {'container_id': '1', 'data_source_id': '2'})
+        cache.put('stale', {'container_id': '3', 'data_source_id': '4'})
+        cache.discard('stale')
+
+        cache = StartupCache(file_name)
+        assert cache.get(key) == {'container_id': '1', 'data_source_id': '2'}
+        assert cache.get('stale') is None
+
+    def test_invalid_file(self, tmp_path):
+        """
+        Assert that an invalid cache file is ignored
+        Test Case (StartupCache): a cache file that is not json
+        """
+        file_name = os.path.join(tmp_path, 'deep_lynx_ids.json')
+        with open(file_name, 'w') as cache_file:
+            cache_file.write('{')
+        assert StartupCache(file_name).get('key') is None
+
+    def test_valid_register_for_event(self, monkeypatch):
+        """
+        Assert that event actions are listed once and only the missing event actions are created
+        Test Case (register_for_event): 3 data sources, 1 of which has an event action
+        """
+        monkeypatch.setattr(deep_lynx, 'DataSourcesApi', FakeDataSourcesApi)
+        monkeypatch.setattr(deep_lynx, 'EventsApi', FakeEventsApi)
+        monkeypatch.setenv('DATA_SOURCES', '["A", "B", "C"]')
+        monkeypatch.setenv('FLASK_RUN_HOST', 'localhost')
+        monkeypatch.setenv('FLASK_RUN_PORT', '8050')
+        monkeypatch.setenv('CONTAINER_ID', '1')
+        monkeypatch.setenv('DATA_SOURCE_ID', '2')
+        monkeypatch.setenv('REGISTER_WAIT_SECONDS', '0')
+
+        assert adapter.register_for_event(None, iterations=1)
+        assert FakeEventsApi.list_calls == 1
+        assert sorted(FakeEventsApi.created) == ['B-id', 'C-id']
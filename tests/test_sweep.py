@@ -0,0 +1,118 @@
+# Copyright 2021, Battelle Energy Alliance, LLC
+
+# Python Packages
+import pytest
+import os
+import logging
+import numpy as np
+import pandas as pd
+
+# Repository Modules
+from adapter.sweep import create_variants, aggregate_results
+
+
+class TestSweep:
+
+    log_path = 'test.log'
+    # Setup logging
+    # Remove log file if it exists
+    if os.path.exists(log_path):
+        os.remove(log_path)
+
+    logging.basicConfig(format='%(asctime)s %(levelname)s %(message)s', filename=log_path, level=logging.INFO)
+    logger = logging.getLogger('moose-adapter')
+
+    CONFIG = {
+        (None, 'xmax'): ('int', {
+            'delta': '1',
+            'offsets': '-1;0;1'
+        }),
+        ('/BCs/left', 'value'): ('float', {
+            'delta': '10',
+            'offsets': '0;5;10'
+        }),
+        ('/BCs/right', 'value'): ('float', dict())
+    }
+
+    def get_json_data(self):
+        return [{
+            "node": None,
+            "parameter": "xmax",
+            "value": 4
+        }, {
+            "node": "/BCs/left",
+            "parameter": "value",
+            "value": 300.0
+        }, {
+            "node": "/BCs/right",
+            "parameter": "value",
+            "value": 100.0
+        }]
+
+    def get_values(self, variants):
+        return [tuple(json_object['value'] for json_object in variant) for variant in variants]
+
+    def test_valid_none(self):
+        """
+        Assert that a run without a sweep has a single variant
+        Test Case (create_variants): Sweep mode none
+        """
+        json_data = self.get_json_data()
+        assert create_variants(json_data, self.CONFIG, 'none') == [json_data]
+
+    def test_valid_grid(self):
+        """
+        Assert that a grid sweep runs every combination of the values of the swept parameters
+        Test Case (create_variants): Grid of 3 levels over 2 parameters
+        """
+        values = self.get_values(create_variants(self.get_json_data(), self.CONFIG, 'grid', levels=3))
+        assert len(values) == 9
+        assert set(values) == {(xmax, left, 100.0) for xmax in (3, 4, 5) for left in (290.0, 300.0, 310.0)}
+        assert all(isinstance(xmax, int) for xmax, left, right in values)
+
+    def test_valid_lhs(self):
+        """
+        Assert that a Latin hypercube sweep samples each stratum of every parameter once
+        Test Case (create_variants): 20 samples of a float parameter
+        """
+        config = {('/BCs/left', 'value'): ('float', {'delta': '10'})}
+        json_data = self.get_json_data()[1:2]
+        values = np.array(self.get_values(create_variants(json_data, config, 'lhs', samples=20, seed=0))).ravel()
+        assert len(values) == 20
+        strata = np.floor((values - 290.0) / 1.0).astype(int)
+        assert sorted(strata) == list(range(20))
+
+    def test_valid_list(self):
+        """
+        Assert that a list sweep adds the n-th offset of every parameter in the n-th variant
+        Test Case (create_variants): 3 offsets of 2 parameters
+        """
+        values = self.get_values(create_variants(self.get_json_data(), self.CONFIG, 'list'))
+        assert values == [(3, 300.0, 100.0), (4, 305.0, 100.0), (5, 310.0, 100.0)]
+
+    def test_invalid_list(self):
+        """
+        Assert that a list sweep raises an error when the parameters have a different number of offsets
+        Test Case (create_variants): 3 and 2 offsets
+        """
+        config = dict(self.CONFIG)
+        config[('/BCs/left', 'value')] = ('float', {'offsets': '0;5'})
+        with pytest.raises(ValueError):
+            create_variants(self.get_json_data(), config, 'list')
+
+    def test_valid_aggregate_results(self, tmp_path):
+        """
+        Assert that the results of the variants are combined into a single file labeled by variant
+        Test Case (aggregate_results): 2 variants
+        """
+        variants = list()
+        for index, json_data in enumerate(create_variants(self.get_json_data(), self.CONFIG, 'list')[:2]):
+            import_file = os.path.join(tmp_path, 'import_{0}.csv'.format(index))
+            pd.DataFrame({'temperature': [1.0 + index, 2.0 + index]}).to_csv(import_file, index=False)
+            variants.append({'json_data': json_data, 'import_file': import_file})
+        import_file = os.path.join(tmp_path, 'import.csv')
+        aggregate_results(variants, import_file)
+        results = pd.read_csv(import_file)
+        assert list(results['variant']) == [0, 0, 1, 1]
+        assert list(results['temperature']) == [1.0, 2.0, 2.0, 3.0]
+        assert list(results['/BCs/left/value']) == [300.0, 300.0, 305.0, 305.0]
@@ -222,3 +222,15 @@ class TestEditInputFile:
         configFilePath = os.path.join('tests', 'test_files', 'test01.cfg')
         template_parser.write_config_file(config_params, configFilePath)
         assert os.path.isfile(configFilePath) == True
+
+    def test_valid_config_options(self):
+        """
+        Assert that the options of a {{config}} tag are parsed and round trip through the configuration file format
+        Test Case (get_config_options, format_config_value, parse_config_value): Tolerances of a parameter
+        """
+        options = template_parser.get_config_options('{{config}} atol=0.5 rtol=0.01 {{change}} Changed value=1')
+        assert options == {'atol': '0.5', 'rtol': '0.01'}
+        config_value = template_parser.format_config_value('int', options)
+        assert config_value == 'int, atol=0.5, rtol=0.01'
+        assert template_parser.parse_config_value(config_value) == ('int', options)
+        assert template_parser.parse_config_value('int') == ('int', dict())
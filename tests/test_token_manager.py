@@ -0,0 +1,106 @@
+# Copyright 2021, Battelle Energy Alliance, LLC
+
+# Python Packages
+import pytest
+import os
+import time
+import logging
+import threading
+import deep_lynx
+
+# Repository Modules
+from adapter.deep_lynx_client import create_api_client
+from adapter.token_manager import TokenManager, get_expiry_seconds
+
+
+class CountingTokenManager(TokenManager):
+    """ Retrieves numbered tokens instead of tokens from Deep Lynx """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.tokens = 0
+
+    def retrieve_token(self):
+        time.sleep(0.05)
+        self.tokens += 1
+        return 'token-{0}'.format(self.tokens)
+
+
+class AuthorizingRestClient:
+    """ Stands in for the urllib3 rest client of the api client, and rejects requests with a revoked token """
+
+    def __init__(self, revoked_header):
+        self.revoked_header = revoked_header
+        self.rejected = 0
+
+    def GET(self, url, headers=None, **kwargs):
+        if headers.get('Authorization') == self.revoked_header:
+            self.rejected += 1
+            raise deep_lynx.rest.ApiException(status=401, reason='Unauthorized')
+        return headers['Authorization']
+
+
+class TestTokenManager:
+
+    log_path = 'test.log'
+    # Setup logging
+    # Remove log file if it exists
+    if os.path.exists(log_path):
+        os.remove(log_path)
+
+    logging.basicConfig(format='%(asctime)s %(levelname)s %(message)s', filename=log_path, level=logging.INFO)
+    logger = logging.getLogger('moose-adapter')
+
+    def test_valid_expiry_seconds(self):
+        """
+        Assert that token expiries are converted to seconds
+        Test Case (get_expiry_seconds): 4 units and 1 invalid expiry
+        """
+        assert get_expiry_seconds('30s') == 30
+        assert get_expiry_seconds('15m') == 900
+        assert get_expiry_seconds('12h') == 43200
+        assert get_expiry_seconds('1d') == 86400
+        with pytest.raises(ValueError):
+            get_expiry_seconds('12 hours')
+
+    def test_valid_background_refresh(self):
+        """
+        Assert that the token is refreshed before it expires
+        Test Case (start): a token that expires in 1 second and is refreshed after half its lifetime
+        """
+        api_client = create_api_client('http://localhost:8090')
+        token_manager = CountingTokenManager(api_client, 'key', 'secret', expiry='1s', refresh_fraction=0.5)
+        token_manager.start()
+        time.sleep(1.3)
+        token_manager.stop()
+
+        assert token_manager.tokens >= 2
+        assert api_client.default_headers['Authorization'] == token_manager.header
+
+    def test_valid_coalesced_reauthentication(self):
+        """
+        Assert that concurrent requests rejected with 401 retrieve a single new token and succeed when retried
+        Test Case (request): 8 concurrent requests with a stale token
+        """
+        api_client = create_api_client('http://localhost:8090')
+        token_manager = CountingTokenManager(api_client, 'key', 'secret')
+        token_manager.authenticate()
+        api_client.token_manager = token_manager
+        # Deep Lynx no longer accepts the first token
+        api_client.rest_client = AuthorizingRestClient('Bearer token-1')
+        stale_headers = {'Authorization': 'Bearer token-1'}
+
+        results = list()
+        threads = [
+            threading.Thread(target=lambda: results.append(
+                api_client.request('GET', 'http://localhost:8090/containers', headers=stale_headers))) for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == ['Bearer token-2'] * 8
+        assert token_manager.tokens == 2
+        assert token_manager.stats()['reauthentications'] == 1
+        assert api_client.rest_client.rejected == 8
@@ -0,0 +1,66 @@
+# Copyright 2021, Battelle Energy Alliance, LLC
+
+# Python Packages
+import pytest
+import os
+import logging
+
+# Repository Modules
+from adapter.warm_start import CheckpointStore, find_checkpoint_directory, RESTART_DIRECTORY_NAME
+
+
+class TestWarmStart:
+
+    log_path = 'test.log'
+    # Setup logging
+    # Remove log file if it exists
+    if os.path.exists(log_path):
+        os.remove(log_path)
+
+    logging.basicConfig(format='%(asctime)s %(levelname)s %(message)s', filename=log_path, level=logging.INFO)
+    logger = logging.getLogger('moose-adapter')
+
+    def write_checkpoint(self, work_directory, number):
+        checkpoint_directory = os.path.join(work_directory, 'run_file_out_cp')
+        os.makedirs(checkpoint_directory, exist_ok=True)
+        with open(os.path.join(checkpoint_directory, '{:04d}.xdr'.format(number)), 'w') as checkpoint_file:
+            checkpoint_file.write(str(number))
+        return checkpoint_directory
+
+    def test_valid_newest_checkpoint(self, tmp_path):
+        """
+        Assert that a run is warm-started from the newest checkpoint with its key only
+        Test Case (get, put): 2 checkpoints of a key and 1 checkpoint of another key
+        """
+        store = CheckpointStore(os.path.join(tmp_path, 'store'), 10)
+        store.put('a', self.write_checkpoint(os.path.join(tmp_path, 'run-1'), 1))
+        store.put('a', self.write_checkpoint(os.path.join(tmp_path, 'run-2'), 2))
+        store.put('b', self.write_checkpoint(os.path.join(tmp_path, 'run-3'), 3))
+
+        destination = os.path.join(tmp_path, 'run-4', RESTART_DIRECTORY_NAME)
+        assert store.get('a', destination) == True
+        assert os.listdir(destination) == ['0002.xdr']
+        assert store.get('c', os.path.join(tmp_path, 'run-5', RESTART_DIRECTORY_NAME)) == False
+        assert store.stats() == {'hits': 1, 'misses': 1}
+
+    def test_valid_retention(self, tmp_path):
+        """
+        Assert that the oldest checkpoints are removed once the store exceeds its maximum number of checkpoints
+        Test Case (_prune): 5 checkpoints in a store of 2
+        """
+        store = CheckpointStore(os.path.join(tmp_path, 'store'), 2)
+        for number in range(5):
+            store.put('a', self.write_checkpoint(os.path.join(tmp_path, 'run-{0}'.format(number)), number))
+        checkpoints = sorted(os.listdir(store.directory))
+        assert len(checkpoints) == 2
+        assert os.listdir(os.path.join(store.directory, checkpoints[-1])) == ['0004.xdr']
+
+    def test_valid_find_checkpoint_directory(self, tmp_path):
+        """
+        Assert that the checkpoint written by a run is found, but not the checkpoint it was started from
+        Test Case (find_checkpoint_directory): Work directory with and without a checkpoint
+        """
+        os.makedirs(os.path.join(tmp_path, RESTART_DIRECTORY_NAME))
+        assert find_checkpoint_directory(str(tmp_path)) is None
+        checkpoint_directory = self.write_checkpoint(str(tmp_path), 1)
+        assert find_checkpoint_directory(str(tmp_path)) == checkpoint_directory
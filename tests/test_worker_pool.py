@@ -0,0 +1,81 @@
+# Copyright 2021, Battelle Energy Alliance, LLC
+
+# Python Packages
+import pytest
+import os
+import logging
+import threading
+
+# Repository Modules
+from adapter.worker_pool import WorkerPool
+
+
+class TestWorkerPool:
+
+    log_path = 'test.log'
+    # Setup logging
+    # Remove log file if it exists
+    if os.path.exists(log_path):
+        os.remove(log_path)
+
+    logging.basicConfig(format='%(asctime)s %(levelname)s %(message)s', filename=log_path, level=logging.INFO)
+    logger = logging.getLogger('moose-adapter')
+
+    def test_invalid_full_queue(self):
+        """
+        Assert that a job is rejected once every worker is busy and the queue is full
+        Test Case (submit): 1 busy worker and a queue depth of 2
+        """
+        pool = WorkerPool(1, 2)
+        pool.start()
+        started = threading.Event()
+        release = threading.Event()
+
+        def block():
+            started.set()
+            release.wait(5)
+
+        assert pool.submit(block) == True
+        assert started.wait(5)
+        assert pool.submit(block) == True
+        assert pool.submit(block) == True
+        assert pool.submit(block) == False
+        assert pool.pending() == 2
+        release.set()
+        pool.shutdown()
+
+    def test_valid_drain(self):
+        """
+        Assert that the workers run every queued job, including jobs after a job that raised
+        Test Case (submit, _work): 20 jobs on 4 workers, 1 of which raises
+        """
+        pool = WorkerPool(4, 20)
+        pool.start()
+        results = list()
+        lock = threading.Lock()
+
+        def add(value):
+            if value == 0:
+                raise ValueError('invalid value')
+            with lock:
+                results.append(value)
+
+        for value in range(20):
+            assert pool.submit(add, value) == True
+        pool.shutdown()
+        assert sorted(results) == list(range(1, 20))
+        assert pool.pending() == 0
+
+    def test_valid_shutdown(self):
+        """
+        Assert that shutdown stops the workers and that jobs are rejected afterwards
+        Test Case (shutdown): Pool with 2 workers
+        """
+        pool = WorkerPool(2, 4)
+        assert pool.submit(print) == False
+        pool.start()
+        workers = list(pool._workers)
+        pool.shutdown()
+        assert pool.is_running() == False
+        assert pool.submit(print) == False
+        assert not any(worker.is_alive() for worker in workers)